@@ -1,17 +1,28 @@
+import asyncio
 import os
+from functools import partial
 
-from homeassistant_api import Client
-from luma.core.interface.serial import i2c
-from luma.oled.device import sh1106
-
-from smart_espresso.analog_sensor.mcp3008_analog_sensor import MCP3008ADC
-from smart_espresso.analog_sensor.ads1115_analog_sensor import ADS1115ADC
+from smart_espresso.analog_sensor.adc_registry import ADCRegistry
+from smart_espresso.analog_sensor.calibration import CalibrationStore, ZeroCalibrator
 from smart_espresso.analog_sensor.pressure_analog_sensor import PressureAnalogSensor
+from smart_espresso.analog_sensor.pulse_flow_sensor import PulseFlowSensor
+from smart_espresso.i2c_bus import I2CBus
+from smart_espresso.metrics import MetricsServer, registry
+from smart_espresso.sampler_process import SamplerProcess
+from smart_espresso.shot import ShotRecorder
+from smart_espresso.shot_log import ShotLogWriter
 from smart_espresso.smart_espresso import SmartEspresso
 from smart_espresso.utils import strtobool
 
+# Hardware and integration backends (ADC drivers, homeassistant_api, luma)
+# are imported where they are used, so only the configured ones are loaded
+# and the first sample isn't held up by the rest. See scripts/bench_startup.py.
+
+# How SmartEspresso runs: "loop" (single serial loop), "scheduled" (one thread
+# per sample/publish/render task) or "async" (asyncio tasks, concurrent HA pushes)
+RUN_MODE = os.environ.get("RUN_MODE", "loop")
+
 HA_ENABLE = strtobool(os.environ.get("HA_ENABLE") or False)
-client_ha = None
 if HA_ENABLE:
     HA_URL = os.environ.get("HA_URL")  # e.g. http://192.168.0.123:8123
     HA_TOKEN = os.environ.get("HA_TOKEN")
@@ -19,18 +30,60 @@ if HA_ENABLE:
     if not HA_URL or not HA_TOKEN:
         raise ValueError("HA_URL and HA_TOKEN are required")
 
-    # Initialize HomeAssistant Client before you use it.
-    print("Connecting to Home Assistant")
-    client_ha = Client(f"{HA_URL}/api", HA_TOKEN, verify_ssl=HA_VERIFY_SSL)
-
+# Publish through an MQTT broker with HA discovery instead of the REST API
+MQTT_HOST = os.environ.get("MQTT_HOST")
+if MQTT_HOST and HA_ENABLE:
+    raise ValueError("Set either MQTT_HOST or HA_ENABLE, not both")
 
 # NB ssd1306 devices are monochromatic; a pixel is enabled with
 #    white and disabled with black.
 # NB the ssd1306 class has no way of knowing the display resolution/size.
 DISPLAY_ENABLE = strtobool(os.environ.get("DISPLAY_ENABLE") or False)
-display = None
-if DISPLAY_ENABLE:
-    display = sh1106(i2c(port=1, address=0x3C), width=128, height=64, rotate=0)
+# The display and the ADS1115 share I2C bus 1; conversions get priority
+i2c_bus = I2CBus("i2c-1")
+
+
+def create_publisher():
+    """Return the (Home Assistant client, state publisher) pair for the configuration."""
+    client_ha = None
+    publisher = None
+    if MQTT_HOST:
+        from smart_espresso.mqtt_publisher import MqttPublisher
+
+        publisher = MqttPublisher(
+            MQTT_HOST,
+            port=int(os.environ.get("MQTT_PORT") or 1883),
+            username=os.environ.get("MQTT_USERNAME"),
+            password=os.environ.get("MQTT_PASSWORD"),
+        )
+    elif HA_ENABLE and RUN_MODE != "async":
+        # The async client opens its aiohttp session inside the event loop,
+        # see run_async().
+        from homeassistant_api import Client
+
+        from smart_espresso.publisher import HomeAssistantPublisher
+
+        print("Connecting to Home Assistant")
+        # A plain keep-alive session; state pushes are never served from a cache.
+        client_ha = Client(
+            f"{HA_URL}/api", HA_TOKEN, verify_ssl=HA_VERIFY_SSL, cache_session=False
+        )
+        # Only send states that changed, plus a heartbeat every HA_MAX_SILENCE seconds
+        publisher = HomeAssistantPublisher(
+            client_ha,
+            deadband=float(os.environ.get("HA_DEADBAND") or 0.0),
+            max_silence=float(os.environ.get("HA_MAX_SILENCE") or 60.0),
+        )
+    return client_ha, publisher
+
+
+def create_display():
+    if not DISPLAY_ENABLE:
+        return None
+    from luma.core.interface.serial import i2c
+    from luma.oled.device import sh1106
+
+    return sh1106(i2c(port=1, address=0x3C), width=128, height=64, rotate=0)
 
 
 if __name__ == "__main__":
@@ -38,39 +91,173 @@ if __name__ == "__main__":
     # Set via environment variable or change here
     ADC_TYPE = os.environ.get("ADC_TYPE", "ADS1115")
 
+    # SAMPLER_PROCESS=True samples the ADCs in a separate process (optionally
+    # pinned to SAMPLER_CPU with SCHED_FIFO priority SAMPLER_PRIORITY, which
+    # needs root) so rendering and HA requests can't disturb sample timing
+    SAMPLER_PROCESS = strtobool(os.environ.get("SAMPLER_PROCESS") or False)
+
     if ADC_TYPE == "ADS1115":
+        from smart_espresso.analog_sensor.ads1115_analog_sensor import ADS1115ADC
+
+        # I2CBus only arbitrates threads of one process; the sampler process
+        # would get its own copy, so its ADCs don't pretend to use it
+        adc_bus = i2c_bus
+        if SAMPLER_PROCESS:
+            adc_bus = None
+            if DISPLAY_ENABLE:
+                print(
+                    "SAMPLER_PROCESS: ADS1115 conversions are not arbitrated "
+                    "with display writes on the shared I2C bus"
+                )
+
         # ADS1115 configuration (16-bit ADC, I2C interface)
         # Suitable for 5V sensors with gain=2/3 (±6.144V range)
         # or gain=1 (±4.096V range)
-        analog_devices = [
-            PressureAnalogSensor(
-                adc=ADS1115ADC(pin=0, gain=2/3),
-                name="Head",
-                max_pressure_mpa=2.0  # 0-2MPa sensor for brew head (0-20 bar)
-            ),  # Head Pressure on ADS1115 channel A0
-            PressureAnalogSensor(
-                adc=ADS1115ADC(pin=1, gain=2/3),
-                name="Boiler",
-                max_pressure_mpa=0.5  # 0-0.5MPa sensor for boiler (0-5 bar)
-            ),  # Boiler Pressure on ADS1115 channel A1
+        adc_factories = [
+            # Head Pressure on channel A0
+            partial(ADS1115ADC, pin=0, gain=2 / 3, bus=adc_bus),
+            # Boiler Pressure on channel A1
+            partial(ADS1115ADC, pin=1, gain=2 / 3, bus=adc_bus),
         ]
     else:
         # MCP3008 configuration (10-bit ADC, SPI interface)
-        analog_devices = [
-            PressureAnalogSensor(
-                adc=MCP3008ADC(pin=0),
-                name="Head",
-                max_pressure_mpa=2.0  # 0-2MPa sensor for brew head (0-20 bar)
-            ),  # Head Pressure
-            PressureAnalogSensor(
-                adc=MCP3008ADC(pin=1),
-                name="Boiler",
-                max_pressure_mpa=0.5  # 0-0.5MPa sensor for boiler (0-5 bar)
-            ),  # Boiler Pressure
+        # MCP3008_BACKEND=spidev reads through /dev/spidev0.0 directly
+        # (faster, all channels in one ioctl) instead of gpiozero
+        if os.environ.get("MCP3008_BACKEND") == "spidev":
+            from smart_espresso.analog_sensor.spidev_mcp3008 import MCP3008SpiDevADC
+
+            speed_hz = int(os.environ.get("SPI_SPEED_HZ") or 1_350_000)
+            mcp3008 = partial(MCP3008SpiDevADC, speed_hz=speed_hz)
+        else:
+            from smart_espresso.analog_sensor.mcp3008_analog_sensor import MCP3008ADC
+
+            mcp3008 = MCP3008ADC
+        adc_factories = [
+            partial(mcp3008, pin=0),  # Head Pressure
+            partial(mcp3008, pin=1),  # Boiler Pressure
         ]
 
+    sampler = None
+    if SAMPLER_PROCESS:
+        sampler = SamplerProcess(
+            adc_factories,
+            interval=float(os.environ.get("SAMPLER_INTERVAL") or 0.005),
+            cpu=int(os.environ["SAMPLER_CPU"])
+            if os.environ.get("SAMPLER_CPU")
+            else None,
+            priority=int(os.environ["SAMPLER_PRIORITY"])
+            if os.environ.get("SAMPLER_PRIORITY")
+            else None,
+        )
+        sampler.start()
+        adcs = sampler.adcs
+    else:
+        adcs = [factory() for factory in adc_factories]
+
+    analog_devices = [
+        PressureAnalogSensor(
+            adc=adcs[0],
+            name="Head",
+            max_pressure_mpa=2.0,  # 0-2MPa sensor for brew head (0-20 bar)
+        ),
+        PressureAnalogSensor(
+            adc=adcs[1],
+            name="Boiler",
+            max_pressure_mpa=0.5,  # 0-0.5MPa sensor for boiler (0-5 bar)
+        ),
+    ]
+
+    # Optional hall-effect flow meter on a GPIO pin (e.g. 17)
+    FLOW_SENSOR_PIN = os.environ.get("FLOW_SENSOR_PIN")
+    flow_sensor = None
+    if FLOW_SENSOR_PIN:
+        flow_sensor = PulseFlowSensor(
+            name="Brew",
+            gpio_pin=int(FLOW_SENSOR_PIN),
+            pulses_per_liter=float(os.environ.get("FLOW_PULSES_PER_LITER") or 5880),
+        )
+
+    # Learn each sensor's zero offset while the machine is idle, remembered across restarts
+    calibration_store = CalibrationStore(
+        os.environ.get("CALIBRATION_FILE") or "calibration.json"
+    )
+    calibrators = [
+        ZeroCalibrator(sensor, calibration_store) for sensor in analog_devices
+    ]
+    for calibrator in calibrators:
+        calibrator.start()
+
+    # Detect shots from the head pressure and print a summary after each one
+    shot_recorder = ShotRecorder(
+        pressure_sensor=analog_devices[0], flow_sensor=flow_sensor
+    )
+    shot_recorder.add_listener(
+        lambda summary, recorder: print(f"Shot finished: {summary}")
+    )
+
+    # Optionally keep every shot's pressure/volume series in a binary log
+    SHOT_LOG = os.environ.get("SHOT_LOG")  # e.g. /home/pi/shots.bin
+    shot_log = ShotLogWriter(SHOT_LOG) if SHOT_LOG else None
+
+    # Optionally expose loop/ADC/HA timings for Prometheus on METRICS_PORT
+    METRICS_PORT = os.environ.get("METRICS_PORT")  # e.g. 9100
+    if METRICS_PORT:
+        registry.enabled = True
+        MetricsServer(port=int(METRICS_PORT)).start()
+
+    # The display and Home Assistant come last: the sensors are already sampling
+    display = create_display()
+    client_ha, publisher = create_publisher()
+
     se = SmartEspresso(
-        analog_devices=analog_devices, client_ha=client_ha, display=display
+        analog_devices=analog_devices + ([flow_sensor] if flow_sensor else []),
+        client_ha=client_ha,
+        display=display,
+        publisher=publisher,
+        shot_recorder=shot_recorder,
+        shot_log=shot_log,
+        i2c_bus=i2c_bus,
+        # Sample every ADC chip's channels in one batch per tick
+        adc_registry=ADCRegistry.from_sensors(analog_devices),
     )
-    se.run()
-# sudo ip route add 192.168.68.56 via 192.168.68.1 dev wlan0
\ No newline at end of file
+    if publisher:
+        publisher.start()
+
+    async def run_async():
+        # States go straight through the async client
+        if HA_ENABLE:
+            from homeassistant_api import Client
+
+            print("Connecting to Home Assistant")
+            se.client_ha = Client(
+                f"{HA_URL}/api",
+                HA_TOKEN,
+                verify_ssl=HA_VERIFY_SSL,
+                use_async=True,
+                async_cache_session=False,
+            )
+        try:
+            await se.run_async()
+        finally:
+            if se.client_ha:
+                await se.client_ha.async_cache_session.close()
+
+    try:
+        if RUN_MODE == "async":
+            asyncio.run(run_async())
+        elif RUN_MODE == "scheduled":
+            se.run_scheduled()
+        else:
+            se.run()
+    finally:
+        for calibrator in calibrators:
+            calibrator.stop()
+        # Send what is still queued and disconnect cleanly
+        if publisher:
+            publisher.stop()
+        if sampler:
+            sampler.stop()
+        # Make sure the last shots reach the SD card on Ctrl-C
+        if shot_log:
+            shot_log.close()
+# sudo ip route add 192.168.68.56 via 192.168.68.1 dev wlan0
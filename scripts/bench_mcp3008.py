@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Benchmark: MCP3008 samples per second through gpiozero vs raw spidev.
+
+Reads the given channels in a tight loop, once through MCP3008ADC (gpiozero,
+one SPI transaction per channel) and once through MCP3008SpiDevADC batched
+by an ADCRegistry (one ioctl for all channels). Needs a Raspberry Pi with SPI
+enabled and an MCP3008 on /dev/spidev<port>.<device>.
+
+Usage:
+    python scripts/bench_mcp3008.py                        # channel 0, 2 s each
+    python scripts/bench_mcp3008.py --channels 0 1 2 3 --speed 3600000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from smart_espresso.analog_sensor.adc_registry import ADCRegistry  # noqa: E402
+from smart_espresso.analog_sensor.mcp3008_analog_sensor import MCP3008ADC  # noqa: E402
+from smart_espresso.analog_sensor.spidev_mcp3008 import MCP3008SpiDevADC  # noqa: E402
+
+
+def bench(read_all, duration: float) -> float:
+    """Return the number of read_all() passes per second."""
+    passes = 0
+    started = perf_counter()
+    while perf_counter() - started < duration:
+        read_all()
+        passes += 1
+    return passes / (perf_counter() - started)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--channels", type=int, nargs="+", default=[0])
+    parser.add_argument(
+        "--duration", type=float, default=2.0, help="seconds per backend"
+    )
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--device", type=int, default=0)
+    parser.add_argument(
+        "--speed", type=int, default=1_350_000, help="spidev clock in Hz"
+    )
+    args = parser.parse_args()
+
+    if not os.path.exists(f"/dev/spidev{args.port}.{args.device}"):
+        print(
+            f"/dev/spidev{args.port}.{args.device} not found; enable SPI with raspi-config"
+        )
+        return 1
+
+    gpiozero_adcs = [
+        MCP3008ADC(pin, port=args.port, device=args.device) for pin in args.channels
+    ]
+    spidev_adcs = [
+        MCP3008SpiDevADC(pin, port=args.port, device=args.device, speed_hz=args.speed)
+        for pin in args.channels
+    ]
+    adc_registry = ADCRegistry()
+    for adc in spidev_adcs:
+        adc_registry.register(adc)
+
+    def read_gpiozero():
+        for adc in gpiozero_adcs:
+            adc.read()
+
+    def read_spidev():
+        adc_registry.scan()
+        for adc in spidev_adcs:
+            adc.read()
+
+    slow = bench(read_gpiozero, args.duration)
+    fast = bench(read_spidev, args.duration)
+
+    channels = len(args.channels)
+    print(f"channels: {args.channels}, spidev clock: {args.speed / 1e6:.2f} MHz")
+    print(f"gpiozero: {slow * channels:10.0f} samples/s")
+    print(f"spidev:   {fast * channels:10.0f} samples/s  ({fast / slow:.1f}x)")
+    print("last codes:", [round(adc.voltage / adc.lsb) for adc in spidev_adcs])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
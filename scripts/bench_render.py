@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: cost of drawing the sensor lines of one display frame.
+
+Compares rasterizing every line with ImageDraw.text() (what a full redraw
+does) against composing the same lines from GlyphCache bitmaps. Readings
+change every frame, like a pressure gauge during a shot.
+
+Usage:
+    python scripts/bench_render.py               # 2000 frames, 3 lines
+    python scripts/bench_render.py --frames 500 --lines 4
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from time import perf_counter
+
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from smart_espresso.glyph_cache import GlyphCache  # noqa: E402
+from smart_espresso.utils import font  # noqa: E402
+
+NAMES = ["Head", "Boiler", "Pump", "Steam", "Flow"]
+
+
+def frame_messages(frame: int, lines: int) -> list[str]:
+    return [
+        f"{NAMES[i % len(NAMES)]}: {round((frame * 0.037 + i) % 12, 2)} Bar"
+        for i in range(lines)
+    ]
+
+
+def bench(draw_frame, frames: int, lines: int) -> float:
+    """Return the mean seconds per frame."""
+    image = Image.new("1", (128, 64))
+    started = perf_counter()
+    for frame in range(frames):
+        image.paste(0, (0, 0, 128, 64))
+        draw_frame(image, frame_messages(frame, lines))
+    return (perf_counter() - started) / frames
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--lines", type=int, default=3)
+    args = parser.parse_args()
+
+    def draw_uncached(image, messages):
+        draw = ImageDraw.Draw(image)
+        for i, message in enumerate(messages):
+            draw.text((5, 15 + i * 15), message, fill=1, font=font)
+
+    cache = GlyphCache()
+
+    def draw_cached(image, messages):
+        for i, message in enumerate(messages):
+            cache.draw_text(image, (5, 15 + i * 15), message, font)
+
+    uncached = bench(draw_uncached, args.frames, args.lines)
+    cached = bench(draw_cached, args.frames, args.lines)
+
+    print(f"frames: {args.frames}, lines per frame: {args.lines}")
+    print(f"ImageDraw.text: {uncached * 1e6:8.1f} us/frame")
+    print(f"GlyphCache:     {cached * 1e6:8.1f} us/frame  ({uncached / cached:.1f}x)")
+    print(f"cache entries: {len(cache)}, hits: {cache.hits}, misses: {cache.misses}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Benchmark: time from interpreter start to the first sensor sample.
+
+Starts fresh Python processes that import SmartEspresso, build it with a
+pressure sensor on a constant stand-in ADC and take one sample(), the path
+main.py goes through after a systemd restart before any hardware I/O. An
+empty interpreter is timed too, so the package's own share is visible, and
+the heavy optional backends that got imported on the way are listed (none
+should be: they load on first use).
+
+Usage:
+    python scripts/bench_startup.py                 # 10 runs
+    python scripts/bench_startup.py --runs 20 --importtime 15
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from time import perf_counter
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that used to load at import time and are only needed by some setups
+HEAVY_MODULES = [
+    "homeassistant_api",
+    "aiohttp",
+    "requests",
+    "luma",
+    "PIL",
+    "gpiozero",
+    "board",
+    "paho",
+]
+
+FIRST_SAMPLE = f"""
+import sys
+from smart_espresso.analog_sensor.analog_sensor import ADCInterface
+from smart_espresso.analog_sensor.pressure_analog_sensor import PressureAnalogSensor
+from smart_espresso.smart_espresso import SmartEspresso
+
+class ConstantADC(ADCInterface):
+    voltage = 0.5
+
+    def read(self):
+        return self.voltage / 5.0
+
+se = SmartEspresso(analog_devices=[PressureAnalogSensor(ConstantADC(), "Head", 2.0)])
+se.sample()
+print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))
+"""
+
+
+def run(args: list[str]) -> tuple[float, str]:
+    """Return the wall time of one fresh interpreter and its stdout."""
+    started = perf_counter()
+    result = subprocess.run(
+        [sys.executable, *args], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return perf_counter() - started, result.stdout.strip()
+
+
+def slowest_imports(count: int) -> list[tuple[int, str]]:
+    """Return (cumulative microseconds, module) of the slowest imports of FIRST_SAMPLE."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", FIRST_SAMPLE],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        # Only top-level entries; nested ones are counted in their parent
+        if not module.startswith("  "):
+            imports.append((int(cumulative), module.strip()))
+    return sorted(imports, reverse=True)[:count]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--importtime",
+        type=int,
+        default=0,
+        metavar="N",
+        help="also list the N slowest top-level imports",
+    )
+    args = parser.parse_args()
+
+    baseline = [run(["-c", "pass"])[0] for _ in range(args.runs)]
+    timings = []
+    for _ in range(args.runs):
+        elapsed, loaded = run(["-c", FIRST_SAMPLE])
+        timings.append(elapsed)
+
+    python = statistics.median(baseline)
+    first_sample = statistics.median(timings)
+    print(f"runs: {args.runs}")
+    print(f"empty interpreter: {python * 1e3:8.1f} ms (median)")
+    print(
+        f"first sample:      {first_sample * 1e3:8.1f} ms (median, min {min(timings) * 1e3:.1f}, "
+        f"max {max(timings) * 1e3:.1f})"
+    )
+    print(
+        f"smart_espresso:    {(first_sample - python) * 1e3:8.1f} ms on top of the interpreter"
+    )
+    print(f"heavy modules loaded: {loaded or 'none'}")
+
+    if args.importtime:
+        print("slowest imports:")
+        for cumulative, module in slowest_imports(args.importtime):
+            print(f"  {cumulative / 1e3:8.1f} ms  {module}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""End-to-end benchmark of the SmartEspresso loop on simulated hardware.
+
+Runs SmartEspresso with N simulated pressure sensors (FakeADC), the SH1106
+driver on a simulated I2C bus (FakeDisplay) and a Home Assistant stand-in
+(FakeHAClient), each with realistic per-operation latency, and reports:
+
+  * achieved samples/sec (sensor reads per second, all sensors)
+  * p50/p99/max latency of a loop tick and of each stage (read, publish, render)
+  * the share of loop time spent in each stage
+  * p99 lateness of sample starts against the configured interval
+
+Results are printed and, with --output, saved as JSON together with the git
+commit so runs on different commits can be compared with --compare.
+
+Usage:
+    python scripts/benchmark.py                           # 2 sensors, serial loop, 10 s
+    python scripts/benchmark.py --sensors 6 --mode scheduled --sample-interval 0.005
+    python scripts/benchmark.py --output bench.json
+    python scripts/benchmark.py --compare bench.json      # show change vs an older run
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from time import perf_counter
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from smart_espresso.analog_sensor.pressure_analog_sensor import (  # noqa: E402
+    PressureAnalogSensor,
+)
+from smart_espresso.simulation import (  # noqa: E402
+    ADS1115_SINGLE_SHOT_LATENCY,
+    I2C_BYTE_TIME,
+    FakeADC,
+    FakeDisplay,
+    FakeHAClient,
+    boiler_profile,
+    shot_profile,
+)
+from smart_espresso.smart_espresso import SmartEspresso  # noqa: E402
+
+STAGES = ("read", "publish", "render")
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def latency_summary(values: list[float]) -> dict:
+    """Milliseconds."""
+    return {
+        "count": len(values),
+        "p50_ms": percentile(values, 50) * 1e3,
+        "p99_ms": percentile(values, 99) * 1e3,
+        "max_ms": max(values, default=0.0) * 1e3,
+        "total_s": sum(values),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def build(args) -> SmartEspresso:
+    sensors = []
+    for i in range(args.sensors):
+        if i % 2 == 0:
+            waveform, max_mpa = shot_profile(idle=1.0), 2.0
+        else:
+            waveform, max_mpa = boiler_profile(), 0.5
+        adc = FakeADC(waveform, latency=args.adc_latency)
+        sensors.append(PressureAnalogSensor(adc, f"Sensor{i}", max_mpa))
+
+    return SmartEspresso(
+        analog_devices=sensors,
+        client_ha=FakeHAClient(latency=args.ha_latency),
+        display=FakeDisplay(byte_time=args.i2c_byte_time),
+        render_interval=args.render_interval,
+        ha_update_interval=args.ha_interval,
+        sample_interval=args.sample_interval,
+    )
+
+
+def instrument(se: SmartEspresso) -> dict[str, list]:
+    """Wrap sample/publish/render to record (start, duration) of every call."""
+    calls: dict[str, list] = {stage: [] for stage in STAGES}
+    originals = {"read": se.sample, "publish": se.publish, "render": se.render}
+
+    def timed(stage, func):
+        def wrapper():
+            started = perf_counter()
+            func()
+            calls[stage].append((started, perf_counter() - started))
+
+        return wrapper
+
+    for stage, func in originals.items():
+        setattr(se, "sample" if stage == "read" else stage, timed(stage, func))
+    return calls
+
+
+def run(args) -> dict:
+    se = build(args)
+    calls = instrument(se)
+    target = se.run_scheduled if args.mode == "scheduled" else se.run
+    runner = threading.Thread(target=target)
+
+    started = perf_counter()
+    runner.start()
+    time.sleep(args.duration)
+    se.stop()
+    runner.join()
+    elapsed = perf_counter() - started
+
+    durations = {stage: [d for _, d in calls[stage]] for stage in STAGES}
+    sample_starts = [s for s, _ in calls["read"]]
+    interval = args.render_interval if args.mode == "loop" else args.sample_interval
+    lateness = [
+        max(0.0, b - a - interval) for a, b in zip(sample_starts, sample_starts[1:])
+    ]
+
+    if args.mode == "loop":
+        # A tick is everything that ran between two sample starts
+        ticks = []
+        for i, start in enumerate(sample_starts):
+            end = sample_starts[i + 1] if i + 1 < len(sample_starts) else float("inf")
+            ticks.append(
+                sum(d for stage in STAGES for s, d in calls[stage] if start <= s < end)
+            )
+    else:
+        ticks = durations["read"]
+
+    busy = sum(sum(d) for d in durations.values()) or 1.0
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "config": vars(args) | {"output": None, "compare": None},
+        "elapsed_s": elapsed,
+        "samples_per_sec": len(sample_starts) * args.sensors / elapsed,
+        "tick": latency_summary(ticks),
+        "stages": {stage: latency_summary(durations[stage]) for stage in STAGES},
+        "stage_share": {stage: sum(durations[stage]) / busy for stage in STAGES},
+        "sample_lateness_p99_ms": percentile(lateness, 99) * 1e3,
+        "tasks": {name: task.stats.snapshot() for name, task in se.tasks.items()},
+    }
+
+
+def report(result: dict, baseline: dict | None = None):
+    def delta(value, old):
+        if old in (None, 0):
+            return ""
+        return f"  ({(value - old) / old * 100:+.1f}% vs {baseline['commit']})"
+
+    base_stages = (baseline or {}).get("stages", {})
+    print(
+        f"commit {result['commit']}, mode {result['config']['mode']}, "
+        f"{result['config']['sensors']} sensors, {result['elapsed_s']:.1f}s"
+    )
+    print(
+        f"samples/sec:  {result['samples_per_sec']:10.1f}"
+        f"{delta(result['samples_per_sec'], (baseline or {}).get('samples_per_sec'))}"
+    )
+    tick, base_tick = result["tick"], (baseline or {}).get("tick", {})
+    print(
+        f"tick p50/p99: {tick['p50_ms']:7.2f} / {tick['p99_ms']:7.2f} ms"
+        f"{delta(tick['p99_ms'], base_tick.get('p99_ms'))}"
+    )
+    print(f"sample lateness p99: {result['sample_lateness_p99_ms']:.2f} ms")
+    for stage in STAGES:
+        stats = result["stages"][stage]
+        print(
+            f"  {stage:8s} {result['stage_share'][stage] * 100:5.1f}%  "
+            f"p50 {stats['p50_ms']:7.2f} ms  p99 {stats['p99_ms']:7.2f} ms  "
+            f"n={stats['count']}"
+            f"{delta(stats['p99_ms'], base_stages.get(stage, {}).get('p99_ms'))}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sensors", type=int, default=2)
+    parser.add_argument("--mode", choices=("loop", "scheduled"), default="loop")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--sample-interval", type=float, default=0.01)
+    parser.add_argument("--render-interval", type=float, default=0.1)
+    parser.add_argument("--ha-interval", type=float, default=1.0)
+    parser.add_argument(
+        "--adc-latency", type=float, default=ADS1115_SINGLE_SHOT_LATENCY
+    )
+    parser.add_argument("--ha-latency", type=float, default=0.05)
+    parser.add_argument("--i2c-byte-time", type=float, default=I2C_BYTE_TIME)
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--compare", type=Path, help="JSON results of an earlier run")
+    args = parser.parse_args()
+
+    result = run(args)
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    report(result, baseline)
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2))
+        print(f"results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
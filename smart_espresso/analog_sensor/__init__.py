@@ -1,4 +1,18 @@
-from .dht22_sensor import DHT22Sensor
+import importlib
 
-__all__ = ["DHT22Sensor"]
+# Exported names and their modules, imported on first access so that
+# `import smart_espresso.analog_sensor.<module>` doesn't load them all
+_EXPORTS = {
+    "DHT22Sensor": "dht22_sensor",
+    "DigitalSensor": "digital_sensor",
+    "DigitalSensorPoller": "digital_sensor",
+    "Reading": "digital_sensor",
+}
 
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,72 @@
+from time import monotonic
+from typing import Iterable
+
+from smart_espresso.analog_sensor.analog_sensor import ADCInterface
+from smart_espresso.metrics import registry
+
+
+class ADCRegistry:
+    """
+    Groups ADC channels by physical chip and samples each chip in one batch.
+
+    register() switches an ADC to batched mode: its read() no longer starts a
+    conversion but returns the sample pushed by the last scan(). scan()
+    then samples every chip once per tick, all of its registered channels
+    in one pass (see the ADC classes' scan_chip()), and fans the results out
+    to the channels, so the sensors' read() calls that follow don't touch the
+    hardware at all.
+
+    Example, for a rig with several sensors on two chips:
+
+        adcs = ADCRegistry.from_sensors(analog_devices)
+        SmartEspresso(analog_devices=analog_devices, adc_registry=adcs, ...)
+    """
+
+    def __init__(self):
+        self.chips: dict[tuple, list[ADCInterface]] = {}
+        self.scans = 0
+        self._scan_seconds: dict[tuple, object] = {}
+
+    @classmethod
+    def from_sensors(cls, sensors: Iterable) -> "ADCRegistry":
+        """Registry holding the ADC of every sensor that supports batched scans."""
+        adc_registry = cls()
+        for sensor in sensors:
+            adc = getattr(sensor, "adc", None)
+            if adc is not None and adc.chip_key is not None:
+                adc_registry.register(adc)
+        return adc_registry
+
+    def register(self, adc: ADCInterface) -> ADCInterface:
+        if adc.chip_key is None:
+            raise ValueError(f"{type(adc).__name__} doesn't support batched scans")
+        channels = self.chips.setdefault(adc.chip_key, [])
+        if adc not in channels:
+            channels.append(adc)
+            adc.batched = True
+        if adc.chip_key not in self._scan_seconds:
+            self._scan_seconds[adc.chip_key] = registry.histogram(
+                "adc_scan_seconds",
+                "Time per batched chip scan",
+                chip=":".join(map(str, adc.chip_key)),
+            )
+        return adc
+
+    def scan(self):
+        """Sample every registered chip once and push the results to its channels."""
+        for key, adcs in self.chips.items():
+            started = monotonic()
+            try:
+                type(adcs[0]).scan_chip(adcs)
+            except Exception as e:
+                # The channels keep their previous sample
+                print(f"Failed to scan ADC {key}: {e}")
+            if registry.enabled:
+                self._scan_seconds[key].observe(monotonic() - started)
+        self.scans += 1
+
+    def __repr__(self) -> str:
+        chips = ", ".join(
+            f"{key}: {len(adcs)} channels" for key, adcs in self.chips.items()
+        )
+        return f"ADCRegistry({chips})"
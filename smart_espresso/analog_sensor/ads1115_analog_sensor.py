@@ -1,9 +1,151 @@
+import threading
+from contextlib import nullcontext
+from time import monotonic
+from typing import Optional
+
+import adafruit_ads1x15.ads1115 as ADS
 import board
 import busio
-import adafruit_ads1x15.ads1115 as ADS
+from adafruit_ads1x15.ads1x15 import Mode
 from adafruit_ads1x15.analog_in import AnalogIn
 
 from smart_espresso.analog_sensor.analog_sensor import ADCInterface
+from smart_espresso.i2c_bus import I2CBus
+from smart_espresso.metrics import registry
+
+# Map pin number to ADS1115 channel
+CHANNEL_MAP = {0: ADS.P0, 1: ADS.P1, 2: ADS.P2, 3: ADS.P3}
+
+
+def _full_scale_voltage(gain: float) -> float:
+    # For gain=1, max voltage is 4.096V
+    # For gain=2/3, max voltage is 6.144V (suitable for full 5V range)
+    return 4.096 / gain if gain >= 1 else 6.144
+
+
+class ADS1115Scanner:
+    """
+    Continuous-conversion scan engine for a single ADS1115 chip.
+
+    Puts the chip in continuous mode at a fixed data rate and rotates the
+    input multiplexer over the registered channels on a background daemon
+    thread. The most recent sample of every channel is kept in a slot guarded
+    by a lock, so readers never wait on an I2C conversion.
+
+    Switching the mux in continuous mode costs two conversion periods (the
+    adafruit driver waits for the new channel to settle), so each channel is
+    refreshed at roughly data_rate / (2 * channels) Hz. A single channel is
+    refreshed at the full data rate.
+
+    Args:
+        ads: Shared ADS1115 instance (see ADS1115ADC._ads_instances)
+        data_rate: Conversion rate in samples per second
+                   (8, 16, 32, 64, 128, 250, 475 or 860)
+        bus: Optional I2CBus arbiter each conversion read is done under
+    """
+
+    def __init__(
+        self, ads: ADS.ADS1115, data_rate: int = 860, bus: Optional[I2CBus] = None
+    ):
+        self.ads = ads
+        self.bus = bus
+        self.ads.mode = Mode.CONTINUOUS
+        self.ads.data_rate = data_rate
+        self.data_rate = data_rate
+        self._volts_per_count = _full_scale_voltage(ads.gain) / 32767
+
+        self._channels: dict[int, AnalogIn] = {}
+        self._slots: dict[int, int] = {}
+        self._slot_times: dict[
+            int, float
+        ] = {}  # Monotonic time each slot was converted
+        self._first_sample: dict[int, threading.Event] = {}
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._scan_thread: Optional[threading.Thread] = None
+
+        address = (
+            hex(ads.i2c_device.device_address) if hasattr(ads, "i2c_device") else "?"
+        )
+        self._bus_client = f"ads1115@{address}"
+        self._conversion_seconds = registry.histogram(
+            "adc_conversion_seconds",
+            "Time per ADC conversion read",
+            adc="ads1115",
+            address=address,
+        )
+
+    def add_channel(self, pin: int):
+        """Include a channel (0-3) in the scan sequence and start scanning."""
+        with self._lock:
+            if pin not in self._channels:
+                self._first_sample[pin] = threading.Event()
+                # Copy-on-write so the scan loop can iterate without the lock
+                channels = dict(self._channels)
+                channels[pin] = AnalogIn(self.ads, CHANNEL_MAP[pin])
+                self._channels = channels
+
+        if self._scan_thread is None:
+            self._scan_thread = threading.Thread(target=self._scan_loop, daemon=True)
+            self._scan_thread.start()
+
+    def _scan_loop(self):
+        """Background loop that rotates the mux and stores each conversion result."""
+        period = 1.0 / self.data_rate
+        while not self._stop_event.is_set():
+            channels = self._channels
+            for pin, channel in channels.items():
+                started = monotonic() if registry.enabled else 0.0
+                with self.bus.transaction(
+                    self._bus_client, high_priority=True
+                ) if self.bus else nullcontext():
+                    value = channel.value
+                converted = monotonic()
+                if registry.enabled:
+                    self._conversion_seconds.observe(converted - started)
+                with self._lock:
+                    self._slots[pin] = value
+                    self._slot_times[pin] = converted
+                self._first_sample[pin].set()
+
+            # With a single channel the mux never changes and the driver
+            # returns the conversion register immediately; pace the loop to
+            # the data rate instead of re-reading the same result.
+            if len(channels) == 1:
+                self._stop_event.wait(period)
+
+    def raw_value(self, pin: int, timeout: float = 1.0) -> int:
+        """
+        Return the latest raw 16-bit sample for a channel.
+
+        Only blocks (up to timeout) until the first conversion of a newly added
+        channel has completed.
+        """
+        if not self._first_sample[pin].wait(timeout):
+            raise TimeoutError(f"No ADS1115 sample for channel {pin} within {timeout}s")
+        with self._lock:
+            return self._slots[pin]
+
+    def voltage(self, pin: int, timeout: float = 1.0) -> float:
+        """Return the latest voltage for a channel (see raw_value)."""
+        return self.raw_value(pin, timeout) * self._volts_per_count
+
+    def sample(self, pin: int, timeout: float = 1.0) -> tuple[float, float]:
+        """
+        Return the latest (voltage, monotonic time read off the chip) of a
+        channel, taken together so the time always belongs to the voltage.
+        """
+        if not self._first_sample[pin].wait(timeout):
+            raise TimeoutError(f"No ADS1115 sample for channel {pin} within {timeout}s")
+        with self._lock:
+            return self._slots[pin] * self._volts_per_count, self._slot_times[pin]
+
+    def stop(self):
+        """Stop the background scan thread."""
+        self._stop_event.set()
+        if self._scan_thread is not None:
+            self._scan_thread.join(timeout=1.0)
 
 
 class ADS1115ADC(ADCInterface):
@@ -20,19 +162,49 @@ class ADS1115ADC(ADCInterface):
               Possible values: 2/3 (±6.144V), 1 (±4.096V), 2 (±2.048V),
                                4 (±1.024V), 8 (±0.512V), 16 (±0.256V)
         i2c_address: I2C address of the ADS1115 (default=0x48)
+        continuous: If True, sample through a shared ADS1115Scanner running the
+                    chip in continuous mode, so read() returns the latest scanned
+                    value without blocking on I2C. All channels of one chip must
+                    use the same mode.
+        data_rate: Conversion rate in samples per second. Defaults to the driver
+                   default (128) in single-shot mode and 860 in continuous mode.
+        bus: I2CBus arbiter shared with the display; conversions then get
+             priority over display writes (default: no arbitration)
     """
 
     # Class-level I2C and ADS1115 instances to share across sensors
     _i2c = None
     _ads_instances = {}
+    _scanners: dict[int, ADS1115Scanner] = {}
 
-    def __init__(self, pin: int, gain: float = 1, i2c_address: int = 0x48):
+    def __init__(
+        self,
+        pin: int,
+        gain: float = 1,
+        i2c_address: int = 0x48,
+        continuous: bool = False,
+        data_rate: Optional[int] = None,
+        bus: Optional[I2CBus] = None,
+    ):
         if not 0 <= pin <= 3:
             raise ValueError(f"Invalid pin {pin}. Must be 0-3 for ADS1115")
 
+        if continuous and data_rate is None:
+            data_rate = 860
+
+        scanned = i2c_address in ADS1115ADC._scanners
+        if i2c_address in ADS1115ADC._ads_instances and scanned != continuous:
+            raise ValueError(
+                f"ADS1115 at {hex(i2c_address)} is already used in "
+                f"{'continuous' if scanned else 'single-shot'} mode"
+            )
+
         self.pin = pin
         self.gain = gain
         self.i2c_address = i2c_address
+        self.bus = bus
+        self._bus_client = f"ads1115@{hex(i2c_address)}"
+        self.chip_key = ("ads1115", i2c_address)
 
         # Initialize I2C bus (shared across all instances)
         if ADS1115ADC._i2c is None:
@@ -43,49 +215,94 @@ class ADS1115ADC(ADCInterface):
             ADS1115ADC._ads_instances[i2c_address] = ADS.ADS1115(
                 ADS1115ADC._i2c,
                 address=i2c_address,
-                gain=gain
+                gain=gain,
+                data_rate=data_rate,
             )
 
         self.ads = ADS1115ADC._ads_instances[i2c_address]
 
-        # Map pin number to ADS1115 channel
-        channel_map = {
-            0: ADS.P0,
-            1: ADS.P1,
-            2: ADS.P2,
-            3: ADS.P3
-        }
-
         # Create analog input channel
-        self.channel = AnalogIn(self.ads, channel_map[pin])
+        self.channel = AnalogIn(self.ads, CHANNEL_MAP[pin])
+
+        self.scanner: Optional[ADS1115Scanner] = None
+        if continuous:
+            if i2c_address not in ADS1115ADC._scanners:
+                ADS1115ADC._scanners[i2c_address] = ADS1115Scanner(
+                    self.ads, data_rate, bus
+                )
+            self.scanner = ADS1115ADC._scanners[i2c_address]
+            self.scanner.add_channel(pin)
 
         # Calculate max voltage based on gain
-        # For gain=1, max voltage is 4.096V
-        # For gain=2/3, max voltage is 6.144V (suitable for full 5V range)
-        self.max_voltage = 4.096 / self.gain if self.gain >= 1 else 6.144
+        self.max_voltage = _full_scale_voltage(self.gain)
+
+        # Signed 16-bit codes
+        self.min_code = -32768
+        self.max_code = 32767
+        self.lsb = self.max_voltage / 32767
+
+        self._conversion_seconds = registry.histogram(
+            "adc_conversion_seconds",
+            "Time per ADC conversion read",
+            adc="ads1115",
+            address=hex(i2c_address),
+        )
 
         # Cached from the last read() call so that voltage can be read
         # repeatedly within a loop iteration without re-triggering an I2C
         # conversion (each ADS1115 conversion takes ~8ms).
         self._cached_voltage = None
 
+    def _read_voltage(self) -> float:
+        """Take a sample and set conversion_time."""
+        if self.scanner is not None:
+            voltage, self.conversion_time = self.scanner.sample(self.pin)
+            return voltage
+        with self.bus.transaction(
+            self._bus_client, high_priority=True
+        ) if self.bus else nullcontext():
+            started = monotonic()
+            voltage = self.channel.voltage
+            # A single-shot conversion completes right before its result is read
+            self.conversion_time = monotonic()
+            if registry.enabled:
+                self._conversion_seconds.observe(self.conversion_time - started)
+            return voltage
+
     def read(self):
         """
         Read the normalized value from the ADS1115.
         Returns a value between 0.0 and 1.0 normalized to the voltage range.
         For gain=1 (±4.096V range), 5V sensor will read close to 1.0 at max.
         """
-        self._cached_voltage = self.channel.voltage
+        if not (self.batched and self._cached_voltage is not None):
+            self._cached_voltage = self._read_voltage()
         return min(self._cached_voltage / self.max_voltage, 1.0)  # Cap at 1.0
 
     @property
     def voltage(self):
         """Get the voltage from the most recent read(); triggers a hardware read on first use."""
         if self._cached_voltage is None:
-            self._cached_voltage = self.channel.voltage
+            self._cached_voltage = self._read_voltage()
         return self._cached_voltage
 
     @property
     def raw_value(self):
         """Get the raw ADC value (16-bit)."""
-        return self.channel.value
+        if self.scanner is not None:
+            return self.scanner.raw_value(self.pin)
+        with self.bus.transaction(
+            self._bus_client, high_priority=True
+        ) if self.bus else nullcontext():
+            return self.channel.value
+
+    @classmethod
+    def scan_chip(cls, adcs: list["ADS1115ADC"]):
+        """
+        Sample the channels of one ADS1115 in sequence and push the results.
+
+        In continuous mode this just collects the scanner's latest samples;
+        in single-shot mode it runs one conversion per channel.
+        """
+        for adc in adcs:
+            adc.push_sample(adc._read_voltage(), adc.conversion_time)
@@ -1,10 +1,102 @@
 from abc import ABC, abstractmethod
+from time import monotonic
+from typing import TYPE_CHECKING, Optional
 
-from homeassistant_api import Client
+import numpy as np
+
+from smart_espresso.analog_sensor.filters import FilterChain
+from smart_espresso.analog_sensor.sample_buffer import SampleBuffer
+from smart_espresso.metrics import registry
+
+if TYPE_CHECKING:
+    from homeassistant_api import Client, State
+
+
+class cached_per_sample:
+    """
+    Property computed at most once per sample.
+
+    The owner keeps a `generation` counter that it bumps whenever a new
+    sample arrives (AnalogSensor.read(), DigitalSensor.poll()). The value
+    is cached together with the generation it was computed for and reused
+    until the counter moves on, so e.g. the display and Home Assistant
+    formatting the same reading only convert it once. invalidate_cache()
+    drops cached values early, for changes that aren't new samples
+    (calibration).
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        cache = obj.__dict__.setdefault("_sample_cache", {})
+        generation = obj.generation
+        entry = cache.get(self.name)
+        if entry is not None and entry[0] == generation:
+            return entry[1]
+        # Tagged with the generation read before computing, so a sample that
+        # arrives meanwhile still triggers a recomputation
+        value = self.func(obj)
+        cache[self.name] = (generation, value)
+        return value
+
+
+def invalidate_cache(obj):
+    """Drop every cached_per_sample value of obj."""
+    obj.__dict__.get("_sample_cache", {}).clear()
 
 
 class ADCInterface(ABC):
-    """Abstract interface for Analog-to-Digital Converters."""
+    """
+    Abstract interface for Analog-to-Digital Converters.
+
+    ADCs that know their resolution set `lsb` (volts per code) and the code
+    range, so that every voltage they return is `code * lsb` for an integer
+    code in [min_code, max_code]. Sensors can then convert through a
+    per-code lookup table instead of float math.
+
+    ADCs that can be sampled in batches set `chip_key` (identifying the
+    physical chip) and implement scan_chip(); an ADCRegistry then samples all
+    channels of a chip in one pass and pushes the results with push_sample().
+
+    Every sample taken sets `conversion_time`, the monotonic time the
+    conversion actually ran, which sensors record instead of the time they
+    happened to call read() (a batched read may return a sample from earlier
+    in the tick, a continuous scanner one from up to a period ago).
+    """
+
+    lsb: Optional[float] = None
+    min_code: int = 0
+    max_code: int = 0
+
+    # Physical chip of this channel, e.g. ("ads1115", 0x48); None if the ADC
+    # can't be scanned in batches
+    chip_key: Optional[tuple] = None
+    # Set by ADCRegistry.register(): read() then returns the sample pushed by
+    # the last chip scan instead of starting a conversion of its own
+    batched: bool = False
+    # ADCs sampled elsewhere (SharedRingADC) record their samples themselves;
+    # sensors then use this buffer as their history
+    history: Optional[SampleBuffer] = None
+    _cached_voltage: Optional[float] = None
+    # Monotonic time of the conversion behind _cached_voltage
+    conversion_time: Optional[float] = None
+
+    def push_sample(self, voltage: float, conversion_time: Optional[float] = None):
+        """Store a sample taken by a batched chip scan (at conversion_time, default: now)."""
+        self._cached_voltage = voltage
+        self.conversion_time = (
+            monotonic() if conversion_time is None else conversion_time
+        )
+
+    @classmethod
+    def scan_chip(cls, adcs: list["ADCInterface"]):
+        """Sample every channel in `adcs` (all on one chip) and push_sample() the results."""
+        raise NotImplementedError(f"{cls.__name__} doesn't support batched scans")
 
     @abstractmethod
     def read(self):
@@ -22,18 +114,104 @@ class ADCInterface(ABC):
 
 
 class AnalogSensor(ABC):
-    """Abstract base class for analog sensors (pressure, flow, temperature, etc.)."""
+    """
+    Abstract base class for analog sensors (pressure, flow, temperature, etc.).
+
+    Every read() also records (monotonic timestamp, voltage) in `history`, a
+    fixed-size SampleBuffer, so recent samples stay available for smoothing
+    and shot analysis. The timestamp is the ADC's conversion_time when it
+    reports one, so rates and shot series use the real sample spacing. If
+    the ADC keeps its own history (samples taken by a SamplerProcess), that
+    buffer is used instead and read() just picks up its newest sample.
 
-    def __init__(self, adc: ADCInterface, name: str):
+    With a FilterChain given as `filters`, `voltage` is the newest output of
+    the chain run over the last `filters.window` samples of `history`, and
+    filtered() returns whole filtered blocks.
+
+    Each read() bumps `generation`; derived values decorated with
+    cached_per_sample are computed once per sample.
+    """
+
+    def __init__(
+        self,
+        adc: ADCInterface,
+        name: str,
+        history_size: int = 4096,
+        filters: Optional[FilterChain] = None,
+    ):
         self.name = name
         self.adc = adc
         self._value = None
+        self._timestamp = 0.0
+        self.history = getattr(adc, "history", None)
+        if self.history is None:
+            self.history = SampleBuffer(history_size)
+        self.filters = filters
+        if filters and filters.window > self.history.capacity:
+            raise ValueError(
+                f"Filter window ({filters.window} samples) exceeds history_size ({self.history.capacity})"
+            )
+        self.generation = 0
+
+        self._reads = registry.counter(
+            "sensor_reads_total", "Sensor reads", sensor=name
+        )
+        self._read_seconds = registry.histogram(
+            "sensor_read_seconds", "Time spent in AnalogSensor.read()", sensor=name
+        )
 
     def read(self):
         """Read the raw value from the ADC."""
+        started = monotonic() if registry.enabled else 0.0
         self._value = self.adc.read()
+        if getattr(self.adc, "history", None) is None:
+            self._timestamp = getattr(self.adc, "conversion_time", None) or monotonic()
+            self.history.append(self._timestamp, self.adc.voltage)
+        else:
+            latest = self.history.latest()
+            self._timestamp = latest[0] if latest else monotonic()
+        self.generation += 1
+        if registry.enabled:
+            self._reads.inc()
+            self._read_seconds.observe(monotonic() - started)
         return self._value
 
+    @cached_per_sample
+    def voltage(self) -> float:
+        """Latest voltage, passed through `filters` when configured."""
+        if not self.filters:
+            return self.adc.voltage
+
+        _, values = self.history.last(self.filters.window)
+        filtered = self.filters.apply(np.frombuffer(values))
+        # Until the window has filled, fall back to the raw reading
+        return float(filtered[-1]) if len(filtered) else self.adc.voltage
+
+    def filtered(
+        self, seconds: Optional[float] = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return (timestamps, voltages) of the recorded history run through `filters`.
+
+        Args:
+            seconds: Only the last `seconds` of history (default: all of it).
+                     Filters need some older samples to settle, so outputs
+                     start up to `filters.window` samples into the block.
+        """
+        if seconds is None:
+            times, values = self.history.last(self.history.capacity)
+        else:
+            times, values = self.history.since(seconds)
+        times, values = np.frombuffer(times), np.frombuffer(values)
+        if not self.filters:
+            return times.copy(), values.copy()
+        return self.filters.apply_with_times(times, values)
+
+    @property
+    def timestamp(self) -> float:
+        """Monotonic time of the last read() (0.0 before the first one)."""
+        return self._timestamp
+
     @property
     def value(self):
         if self._value is not None:
@@ -41,9 +219,13 @@ class AnalogSensor(ABC):
         else:
             return self.read()
 
-    @abstractmethod
-    def update_home_assistant(self, client: Client):
-        raise NotImplementedError
+    def ha_states(self) -> list["State"]:
+        """Build the Home Assistant states describing the current reading (none by default)."""
+        return []
+
+    def update_home_assistant(self, client: "Client"):
+        for state in self.ha_states():
+            client.set_state(state)
 
     @property
     @abstractmethod
@@ -0,0 +1,203 @@
+"""Zero-offset calibration for pressure sensors, learned while the machine is idle."""
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+from smart_espresso.analog_sensor.calibration_curve import CalibrationCurve
+from smart_espresso.analog_sensor.pressure_analog_sensor import PressureAnalogSensor
+from smart_espresso.metrics import registry
+
+
+class CalibrationStore:
+    """
+    Per-sensor calibration persisted as JSON, keyed by sensor name.
+
+    Each entry holds the learned zero offset and, optionally, the points of
+    a measured CalibrationCurve:
+
+        {"Head": {"offset_voltage": 0.012, "curve": [[0.5, 0.0], [4.5, 20.0]]}}
+
+    Writes go to a temporary file that is then renamed over the old one, so a
+    power cut never leaves a truncated file behind.
+
+    Args:
+        path: JSON file (created on the first save)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data: dict[str, dict] = {}
+        try:
+            with open(path) as f:
+                self._data = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable calibration file {path}: {e}")
+
+    def offset_voltage(self, name: str) -> Optional[float]:
+        """Stored zero offset of sensor `name`, or None if it was never calibrated."""
+        with self._lock:
+            entry = self._data.get(name)
+        return entry.get("offset_voltage") if entry else None
+
+    def curve(self, name: str) -> Optional[CalibrationCurve]:
+        """Stored calibration curve of sensor `name`, if any."""
+        with self._lock:
+            points = self._data.get(name, {}).get("curve")
+        return CalibrationCurve(points) if points else None
+
+    def save_offset_voltage(self, name: str, offset_voltage: float):
+        self._save(name, offset_voltage=offset_voltage)
+
+    def save_curve(self, name: str, curve: CalibrationCurve):
+        self._save(name, curve=[list(point) for point in curve.points])
+
+    def _save(self, name: str, **values):
+        with self._lock:
+            entry = self._data.setdefault(name, {})
+            entry.update(values, updated=time.time())
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._data, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+
+class ZeroCalibrator:
+    """
+    Estimate a PressureAnalogSensor's zero offset from its recorded history.
+
+    A stored offset (and calibration curve) is applied to the sensor right
+    away. Every `interval` seconds a background thread then looks at the last
+    `window` seconds of raw voltages in `sensor.history`. Samples further than
+    `outlier_sigma` robust standard deviations (median absolute deviation)
+    from the median are discarded as glitches. If the rest is steady
+    (standard deviation under `max_std`) and close to the sensor's zero
+    pressure voltage (the first point of its curve, within `max_offset`), the machine is considered idle
+    and their mean becomes the new zero: `sensor.offset_voltage` is replaced
+    and saved to `store`. Windows taken under pressure never qualify, so a
+    shot or a hot boiler leaves the calibration alone.
+
+    The conversion in PressureAnalogSensor.mpa only reads offset_voltage;
+    all of this runs off the sampling path.
+
+    Args:
+        sensor: Pressure sensor to calibrate
+        store: Where the offset is loaded from and saved to (default: not persisted)
+        window: Seconds of history per estimate (default: 5.0)
+        interval: Seconds between estimates (default: 10.0)
+        max_offset: Largest accepted |offset| in volts (default: 0.1)
+        max_std: Largest standard deviation of an idle window in volts (default: 0.01)
+        outlier_sigma: Outlier rejection threshold (default: 4.0)
+        min_samples: Fewest samples an estimate is based on (default: 20)
+        save_threshold: Smallest offset change written to disk, in volts
+                        (default: 0.002), to spare the SD card
+    """
+
+    def __init__(
+        self,
+        sensor: PressureAnalogSensor,
+        store: Optional[CalibrationStore] = None,
+        window: float = 5.0,
+        interval: float = 10.0,
+        max_offset: float = 0.1,
+        max_std: float = 0.01,
+        outlier_sigma: float = 4.0,
+        min_samples: int = 20,
+        save_threshold: float = 0.002,
+    ):
+        self.sensor = sensor
+        self.store = store
+        self.window = window
+        self.interval = interval
+        self.max_offset = max_offset
+        self.max_std = max_std
+        self.outlier_sigma = outlier_sigma
+        self.min_samples = min_samples
+        self.save_threshold = save_threshold
+
+        if store:
+            stored = store.offset_voltage(sensor.name)
+            if stored is not None:
+                sensor.offset_voltage = stored
+            curve = store.curve(sensor.name)
+            if curve:
+                sensor.curve = curve
+        self._saved_offset = sensor.offset_voltage
+
+        self._calibrations = registry.counter(
+            "pressure_calibrations_total", "Zero offset adjustments", sensor=sensor.name
+        )
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def estimate(self, now: Optional[float] = None) -> Optional[float]:
+        """
+        Zero offset implied by the last `window` seconds, or None if the
+        machine wasn't idle (or there were too few samples) during it.
+        """
+        _, values = self.sensor.history.since(self.window, now)
+        voltages = np.frombuffer(values)
+        if len(voltages) < self.min_samples:
+            return None
+
+        median = np.median(voltages)
+        spread = 1.4826 * np.median(np.abs(voltages - median))  # MAD scaled to sigma
+        # Steady readings can have zero MAD (every sample on the same ADC code)
+        limit = self.outlier_sigma * max(spread, self.max_std / 10)
+        inliers = voltages[np.abs(voltages - median) <= limit]
+        if len(inliers) < self.min_samples or inliers.std() > self.max_std:
+            return None
+
+        offset = float(inliers.mean()) - self.sensor.curve.voltages[0]
+        if abs(offset) > self.max_offset:
+            return None
+        return offset
+
+    def update(self, now: Optional[float] = None) -> bool:
+        """Re-estimate the offset once; returns True if the sensor was updated."""
+        offset = self.estimate(now)
+        if offset is None:
+            return False
+
+        self.sensor.offset_voltage = offset
+        if registry.enabled:
+            self._calibrations.inc()
+        if self.store and abs(offset - self._saved_offset) >= self.save_threshold:
+            try:
+                self.store.save_offset_voltage(self.sensor.name, offset)
+                self._saved_offset = offset
+            except OSError as e:
+                print(f"Failed to save calibration for {self.sensor.name}: {e}")
+        return True
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.update()
+            except Exception as e:
+                print(f"Calibration of {self.sensor.name} failed: {e}")
+
+    def start(self):
+        """Start estimating on a background daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"calibrate-{self.sensor.name}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def __repr__(self):
+        return f"ZeroCalibrator(sensor='{self.sensor.name}', offset_voltage={self.sensor.offset_voltage:.4f})"
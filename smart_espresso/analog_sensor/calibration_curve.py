@@ -0,0 +1,68 @@
+from bisect import bisect_right
+from typing import Iterable
+
+import numpy as np
+
+
+class CalibrationCurve:
+    """
+    Piecewise-linear voltage to pressure (bar) mapping through calibration points.
+
+    Real transducers are rarely perfectly linear; measuring a few points
+    against a reference gauge and interpolating between them corrects that.
+    Below the first point the pressure stays at the first point's value (0 bar
+    for a zero point, like the old clamp); above the last point the last
+    segment is extrapolated.
+
+    Args:
+        points: (voltage, bar) pairs, at least two, with distinct voltages
+    """
+
+    def __init__(self, points: Iterable[tuple[float, float]]):
+        points = sorted((float(voltage), float(bar)) for voltage, bar in points)
+        if len(points) < 2:
+            raise ValueError("A calibration curve needs at least two points")
+        self.voltages = [voltage for voltage, _ in points]
+        self.bars = [bar for _, bar in points]
+        if len(set(self.voltages)) != len(self.voltages):
+            raise ValueError("Calibration points must have distinct voltages")
+
+        self._voltages_array = np.array(self.voltages)
+        self._bars_array = np.array(self.bars)
+        (v0, b0), (v1, b1) = points[-2:]
+        self._end_slope = (b1 - b0) / (v1 - v0)
+
+    @classmethod
+    def linear(
+        cls, max_pressure_mpa: float, min_voltage: float = 0.5, max_voltage: float = 4.5
+    ):
+        """The nominal curve of a 0.5-4.5V transducer rated for max_pressure_mpa."""
+        return cls([(min_voltage, 0.0), (max_voltage, max_pressure_mpa * 10)])
+
+    @property
+    def points(self) -> list[tuple[float, float]]:
+        return list(zip(self.voltages, self.bars))
+
+    def __call__(self, voltage: float) -> float:
+        """Convert a single voltage."""
+        voltages = self.voltages
+        if voltage <= voltages[0]:
+            return self.bars[0]
+        if voltage >= voltages[-1]:
+            return self.bars[-1] + (voltage - voltages[-1]) * self._end_slope
+        i = bisect_right(voltages, voltage)
+        v0, v1 = voltages[i - 1], voltages[i]
+        b0, b1 = self.bars[i - 1], self.bars[i]
+        return b0 + (b1 - b0) * (voltage - v0) / (v1 - v0)
+
+    def convert(self, voltages) -> np.ndarray:
+        """Convert a block of voltages at once."""
+        voltages = np.asarray(voltages, dtype=float)
+        bars = np.interp(voltages, self._voltages_array, self._bars_array)
+        above = voltages > self.voltages[-1]
+        if above.any():
+            bars[above] += (voltages[above] - self.voltages[-1]) * self._end_slope
+        return bars
+
+    def __repr__(self):
+        return f"CalibrationCurve({self.points})"
@@ -1,29 +1,38 @@
 """DHT22 (AM2302) Temperature and Humidity Sensor implementation."""
-import threading
-import time
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-try:
-    import Adafruit_DHT
-except ImportError:
-    Adafruit_DHT = None
+from smart_espresso.analog_sensor.analog_sensor import cached_per_sample
+from smart_espresso.analog_sensor.digital_sensor import (
+    DigitalSensor,
+    DigitalSensorPoller,
+)
 
-from homeassistant_api import Client, State
+if TYPE_CHECKING:
+    from homeassistant_api import Client, State
 
 
-class DHT22Sensor:
+class DHT22Sensor(DigitalSensor):
     """
     DHT22 (AM2302) digital temperature and humidity sensor.
 
     Note: This is a digital sensor, not analog, so it doesn't use the ADCInterface.
 
-    Adafruit_DHT.read_retry() bit-bangs GPIO and can block for a few hundred
-    milliseconds even when successful. To keep that latency off the shared
-    render loop, actual sampling happens on a background daemon thread;
-    read() just returns the most recently cached value.
+    Reading a DHT22 bit-bangs GPIO and can block for a few hundred
+    milliseconds, and the sensor may only be read every 2 seconds. Sampling
+    is done by a DigitalSensorPoller shared with the other digital sensors,
+    one single-attempt read at a time (failed reads are retried with
+    backoff, not in a read_retry() loop); read() just returns the most
+    recently cached value. Check `age`/`stale` to know how recent it is.
     """
 
-    def __init__(self, pin: int, name: str = "DHT22", use_fahrenheit: bool = False):
+    def __init__(
+        self,
+        pin: int,
+        name: str = "DHT22",
+        use_fahrenheit: bool = False,
+        poller: Optional[DigitalSensorPoller] = None,
+        stale_after: Optional[float] = None,
+    ):
         """
         Initialize DHT22 sensor.
 
@@ -31,76 +40,63 @@ class DHT22Sensor:
             pin: GPIO pin number (BCM numbering, e.g., 4 for GPIO4)
             name: Sensor name for display and Home Assistant
             use_fahrenheit: If True, return temperature in Fahrenheit instead of Celsius
+            poller: DigitalSensorPoller to register with (default: the shared one)
+            stale_after: Seconds after which the last reading counts as stale
+                         (default: 6.0)
         """
-        if Adafruit_DHT is None:
+        try:
+            import Adafruit_DHT
+        except ImportError:
             raise ImportError(
                 "Adafruit_DHT library not found. Install with: "
                 "sudo pip3 install Adafruit_DHT"
             )
 
-        self.name = name
+        super().__init__(name, poller, stale_after)
         self.pin = pin
         self.use_fahrenheit = use_fahrenheit
-        self._temperature: Optional[float] = None
-        self._humidity: Optional[float] = None
-        self._last_read_time = 0
-        self._min_read_interval = 2.0  # DHT22 max sampling rate is 0.5Hz (every 2 seconds)
+        self._dht = Adafruit_DHT
         self.sensor_type = Adafruit_DHT.DHT22
+        self.add_to_poller()
 
-        self._lock = threading.Lock()
-        self._stop_event = threading.Event()
-        self._poll_thread = threading.Thread(target=self._poll_loop, daemon=True)
-        self._poll_thread.start()
-
-    def _poll_loop(self):
-        """Background loop that performs the blocking sensor read every _min_read_interval."""
-        while not self._stop_event.is_set():
-            humidity, temperature = Adafruit_DHT.read_retry(self.sensor_type, self.pin)
-
-            if humidity is not None and temperature is not None:
-                # Convert to Fahrenheit if requested
-                if self.use_fahrenheit:
-                    temperature = temperature * 9.0 / 5.0 + 32.0
-
-                with self._lock:
-                    self._humidity = humidity
-                    self._temperature = temperature
-                    self._last_read_time = time.time()
+    def _read_once(self) -> Optional[tuple[float, float]]:
+        """One read attempt; returns (humidity, temperature) or None."""
+        humidity, temperature = self._dht.read(self.sensor_type, self.pin)
+        if humidity is None or temperature is None:
+            return None
 
-            self._stop_event.wait(self._min_read_interval)
+        # Convert to Fahrenheit if requested
+        if self.use_fahrenheit:
+            temperature = temperature * 9.0 / 5.0 + 32.0
+        return humidity, temperature
 
     def read(self) -> tuple[Optional[float], Optional[float]]:
         """
-        Return the most recently sampled temperature and humidity.
+        Return the most recently sampled humidity and temperature.
 
-        This never blocks on hardware I/O: actual sampling happens on a
-        background thread (see _poll_loop) since DHT22 can only be read
-        every 2 seconds and each read may take a few hundred ms.
+        This never blocks on hardware I/O: actual sampling happens on the
+        poller thread since DHT22 can only be read every 2 seconds and each
+        read may take a few hundred ms.
         """
-        with self._lock:
-            return self._humidity, self._temperature
-
-    def stop(self):
-        """Stop the background polling thread."""
-        self._stop_event.set()
-        self._poll_thread.join(timeout=self._min_read_interval)
+        reading = self.reading
+        return reading.values if reading is not None else (None, None)
 
     @property
     def temperature(self) -> Optional[float]:
         """Get the last temperature reading."""
-        return self._temperature
+        return self.read()[1]
 
     @property
     def humidity(self) -> Optional[float]:
         """Get the last humidity reading."""
-        return self._humidity
+        return self.read()[0]
 
     @property
     def temperature_unit(self) -> str:
         """Get temperature unit symbol."""
         return "°F" if self.use_fahrenheit else "°C"
 
-    @property
+    @cached_per_sample
     def message(self) -> str:
         """
         Get formatted message for display.
@@ -108,58 +104,70 @@ class DHT22Sensor:
         Returns:
             Formatted string with temperature and humidity
         """
-        if self._temperature is None or self._humidity is None:
+        humidity, temperature = self.read()
+        if temperature is None or humidity is None:
             return f"{self.name}: No data"
 
-        temp_str = f"{self._temperature:.1f}{self.temperature_unit}"
-        humidity_str = f"{self._humidity:.1f}%"
+        temp_str = f"{temperature:.1f}{self.temperature_unit}"
+        humidity_str = f"{humidity:.1f}%"
         return f"{self.name}: {temp_str} {humidity_str}"
 
-    def update_home_assistant(self, client: Client):
+    def ha_states(self) -> list["State"]:
         """
-        Update Home Assistant with current sensor readings.
+        Build Home Assistant states for the current temperature and humidity.
 
-        Args:
-            client: Home Assistant API client
+        Readings that are not available yet are left out.
         """
-        if client is None:
-            return
+        from homeassistant_api import State
 
         # Create entity IDs based on sensor name
         temp_entity_id = f"sensor.{self.name.lower().replace(' ', '_')}_temperature"
         humidity_entity_id = f"sensor.{self.name.lower().replace(' ', '_')}_humidity"
 
-        try:
-            # Update temperature sensor
-            if self._temperature is not None:
-                client.set_state(
-                    State(
-                        entity_id=temp_entity_id,
-                        state=str(round(self._temperature, 1)),
-                        attributes={
-                            "unit_of_measurement": self.temperature_unit,
-                            "friendly_name": f"{self.name} Temperature",
-                            "device_class": "temperature",
-                        },
-                    )
+        humidity, temperature = self.read()
+        states = []
+        if temperature is not None:
+            states.append(
+                State(
+                    entity_id=temp_entity_id,
+                    state=str(round(temperature, 1)),
+                    attributes={
+                        "unit_of_measurement": self.temperature_unit,
+                        "friendly_name": f"{self.name} Temperature",
+                        "device_class": "temperature",
+                    },
                 )
+            )
 
-            # Update humidity sensor
-            if self._humidity is not None:
-                client.set_state(
-                    State(
-                        entity_id=humidity_entity_id,
-                        state=str(round(self._humidity, 1)),
-                        attributes={
-                            "unit_of_measurement": "%",
-                            "friendly_name": f"{self.name} Humidity",
-                            "device_class": "humidity",
-                        },
-                    )
+        if humidity is not None:
+            states.append(
+                State(
+                    entity_id=humidity_entity_id,
+                    state=str(round(humidity, 1)),
+                    attributes={
+                        "unit_of_measurement": "%",
+                        "friendly_name": f"{self.name} Humidity",
+                        "device_class": "humidity",
+                    },
                 )
+            )
+        return states
+
+    def update_home_assistant(self, client: "Client"):
+        """
+        Update Home Assistant with current sensor readings.
+
+        Args:
+            client: Home Assistant API client
+        """
+        if client is None:
+            return
+
+        try:
+            for state in self.ha_states():
+                client.set_state(state)
         except Exception as e:
             print(f"Failed to update Home Assistant for {self.name}: {e}")
 
     def __repr__(self) -> str:
-        return f"DHT22Sensor(pin={self.pin}, name='{self.name}', temp={self._temperature}, humidity={self._humidity})"
-
+        return f"DHT22Sensor(pin={self.pin}, name='{self.name}', temp={self.temperature}, humidity={self.humidity}, age={self.age})"
@@ -0,0 +1,239 @@
+"""Digital sensors (DHT22, ...) sampled by one shared background poller."""
+import threading
+from abc import ABC, abstractmethod
+from time import monotonic
+from typing import Callable, Optional
+
+
+class Reading:
+    """
+    One successful reading of a digital sensor.
+
+    Args:
+        values: Sensor-specific tuple of values, e.g. (humidity, temperature)
+        timestamp: Monotonic time the reading was taken
+    """
+
+    __slots__ = ("values", "timestamp")
+
+    def __init__(self, values: tuple, timestamp: float):
+        self.values = values
+        self.timestamp = timestamp
+
+    @property
+    def age(self) -> float:
+        """Seconds since the reading was taken."""
+        return monotonic() - self.timestamp
+
+    def __repr__(self) -> str:
+        return f"Reading(values={self.values}, age={self.age:.1f}s)"
+
+
+class DigitalSensor(ABC):
+    """
+    Base class of digital sensors sampled by a DigitalSensorPoller.
+
+    Subclasses implement _read_once(), a single blocking read attempt, and
+    register themselves with add_to_poller() at the end of __init__. The
+    latest successful Reading is kept in `reading`; `age` and `stale` tell
+    consumers how old it is, since a sensor that keeps failing keeps its
+    last value. Listeners added with add_listener() are called with
+    (sensor, reading) from the poller thread, only when the values changed.
+
+    Args:
+        name: Sensor name for display and Home Assistant
+        poller: Poller to register with (default: the shared one)
+        stale_after: Seconds after which a reading counts as stale
+                     (default: three poll intervals)
+    """
+
+    # Minimum seconds between two reads of the sensor
+    min_interval: float = 2.0
+
+    def __init__(
+        self,
+        name: str,
+        poller: Optional["DigitalSensorPoller"] = None,
+        stale_after: Optional[float] = None,
+    ):
+        self.name = name
+        self.poller = poller or DigitalSensorPoller.shared()
+        self.stale_after = stale_after or 3 * self.min_interval
+        self.reading: Optional[Reading] = None
+        # Bumped for every new reading (see cached_per_sample)
+        self.generation = 0
+        self._listeners: list[Callable[["DigitalSensor", Reading], None]] = []
+
+    @abstractmethod
+    def _read_once(self) -> Optional[tuple]:
+        """Read the sensor once; return its values, or None if the read failed."""
+        raise NotImplementedError
+
+    def add_to_poller(self):
+        self.poller.add(self)
+
+    def add_listener(self, listener: Callable[["DigitalSensor", Reading], None]):
+        """Call listener(sensor, reading) whenever a reading differs from the previous one."""
+        self._listeners.append(listener)
+
+    def poll(self) -> bool:
+        """Take one reading (called by the poller); return False if it failed."""
+        values = self._read_once()
+        if values is None:
+            return False
+
+        previous = self.reading
+        # Replaced as a whole, so readers never see half an update
+        self.reading = Reading(values, monotonic())
+        self.generation += 1
+        if previous is None or previous.values != values:
+            for listener in self._listeners:
+                try:
+                    listener(self, self.reading)
+                except Exception as e:
+                    print(f"Listener of {self.name} failed: {e}")
+        return True
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the last successful reading (None before the first one)."""
+        reading = self.reading
+        return reading.age if reading is not None else None
+
+    @property
+    def stale(self) -> bool:
+        """True if there is no reading yet or it is older than stale_after."""
+        age = self.age
+        return age is None or age > self.stale_after
+
+    def stop(self):
+        """Stop polling this sensor."""
+        self.poller.remove(self)
+
+
+class _PollEntry:
+    __slots__ = ("sensor", "due", "failures", "polls", "errors")
+
+    def __init__(self, sensor: DigitalSensor, due: float):
+        self.sensor = sensor
+        self.due = due
+        self.failures = 0  # Consecutive failed reads
+        self.polls = 0
+        self.errors = 0  # Failed reads in total
+
+
+class DigitalSensorPoller:
+    """
+    One background thread polling every registered DigitalSensor in turn.
+
+    Bit-banged reads like the DHT22's hold the GIL for a good part of their
+    duration, so instead of one thread per sensor a single poller reads one
+    sensor at a time: whichever is due first, round-robin among those due
+    together. Each sensor is read at most every `min_interval` seconds. A
+    failed read isn't retried right away; the sensor's next read is pushed
+    back exponentially (min_interval, 2x, 4x, ... up to max_backoff) until a
+    read succeeds again.
+
+    Args:
+        max_backoff: Longest delay after repeated failures (default: 60.0)
+    """
+
+    _shared: Optional["DigitalSensorPoller"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_backoff: float = 60.0):
+        self.max_backoff = max_backoff
+        self._entries: list[_PollEntry] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def shared(cls) -> "DigitalSensorPoller":
+        """The poller sensors use unless given one, created on first use."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def add(self, sensor: DigitalSensor):
+        """Start polling a sensor; its first read is due right away."""
+        with self._lock:
+            self._entries.append(_PollEntry(sensor, monotonic()))
+            if self._thread is None:
+                self._stop_event.clear()
+                self._thread = threading.Thread(
+                    target=self._poll_loop, name="digital-sensors", daemon=True
+                )
+                self._thread.start()
+        self._wakeup.set()
+
+    def remove(self, sensor: DigitalSensor):
+        with self._lock:
+            self._entries = [
+                entry for entry in self._entries if entry.sensor is not sensor
+            ]
+
+    def _next_entry(self) -> Optional[_PollEntry]:
+        with self._lock:
+            # min() keeps list order among equal deadlines, and polled
+            # entries move to the back: round-robin
+            return min(self._entries, key=lambda entry: entry.due, default=None)
+
+    def _poll_loop(self):
+        while not self._stop_event.is_set():
+            entry = self._next_entry()
+            delay = entry.due - monotonic() if entry is not None else None
+            if delay is None or delay > 0:
+                self._wakeup.wait(delay)
+                self._wakeup.clear()
+                continue
+
+            sensor = entry.sensor
+            try:
+                ok = sensor.poll()
+            except Exception as e:
+                print(f"Failed to read {sensor.name}: {e}")
+                ok = False
+
+            now = monotonic()
+            entry.polls += 1
+            if ok:
+                entry.failures = 0
+                entry.due = now + sensor.min_interval
+            else:
+                entry.errors += 1
+                entry.failures += 1
+                entry.due = now + min(
+                    sensor.min_interval * 2 ** (entry.failures - 1), self.max_backoff
+                )
+            with self._lock:
+                if entry in self._entries:
+                    self._entries.remove(entry)
+                    self._entries.append(entry)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            entries = list(self._entries)
+        return {
+            entry.sensor.name: {
+                "polls": entry.polls,
+                "errors": entry.errors,
+                "consecutive_failures": entry.failures,
+                "age": entry.sensor.age,
+            }
+            for entry in entries
+        }
+
+    def stop(self):
+        """Stop the poller thread (sensors stay registered; add() restarts it)."""
+        self._stop_event.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        with self._lock:
+            self._thread = None
+
+    def __repr__(self) -> str:
+        return f"DigitalSensorPoller(sensors={[entry.sensor.name for entry in self._entries]})"
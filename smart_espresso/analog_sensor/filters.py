@@ -0,0 +1,218 @@
+"""
+Signal conditioning for analog sensor readings.
+
+Filters work on whole blocks of samples (NumPy arrays, typically a window of
+an AnalogSensor's SampleBuffer history) instead of one sample at a time. All
+of them are causal: each output only depends on the samples up to and
+including the one it is aligned with, and the newest output is always aligned
+with the newest input. Filters that need a full window (Median,
+SavitzkyGolay) only produce outputs once the window is filled, so their
+output is shorter than their input.
+
+Example, for a noisy 10-bit MCP3008 sampled at a few hundred Hz:
+
+    FilterChain(Oversample(4), Median(5), EMA(0.2))
+"""
+import math
+from abc import ABC, abstractmethod
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class Filter(ABC):
+    """One stage of a FilterChain."""
+
+    # Number of inputs consumed per output (>1 for decimating filters)
+    stride = 1
+
+    @abstractmethod
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        """Filter a block of samples, oldest first."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def inputs_needed(self, outputs: int) -> int:
+        """Number of input samples required to produce `outputs` settled outputs."""
+        raise NotImplementedError
+
+
+class Oversample(Filter):
+    """
+    Average non-overlapping groups of `factor` samples (decimation).
+
+    Averaging N samples of uncorrelated noise lowers it by sqrt(N), trading
+    sample rate for resolution. Leading samples that don't fill a whole group
+    are dropped so the last group always ends at the newest sample.
+    """
+
+    def __init__(self, factor: int):
+        if factor < 1:
+            raise ValueError(f"Invalid factor {factor}. Must be at least 1")
+        self.factor = factor
+        self.stride = factor
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        usable = len(values) - len(values) % self.factor
+        return values[len(values) - usable :].reshape(-1, self.factor).mean(axis=1)
+
+    def inputs_needed(self, outputs: int) -> int:
+        return outputs * self.factor
+
+    def __repr__(self):
+        return f"Oversample({self.factor})"
+
+
+class Median(Filter):
+    """Sliding median over `size` samples; rejects single-sample spikes."""
+
+    def __init__(self, size: int = 5):
+        if size < 1:
+            raise ValueError(f"Invalid size {size}. Must be at least 1")
+        self.size = size
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        if len(values) < self.size:
+            return values[:0]
+        return np.median(sliding_window_view(values, self.size), axis=1)
+
+    def inputs_needed(self, outputs: int) -> int:
+        return outputs + self.size - 1
+
+    def __repr__(self):
+        return f"Median({self.size})"
+
+
+class EMA(Filter):
+    """
+    Exponential moving average: y[k] = alpha * x[k] + (1 - alpha) * y[k-1].
+
+    Computed in closed form with cumsum instead of a Python loop, seeded with
+    the first sample of the block. The block is processed in chunks short
+    enough that (1 - alpha) ** -chunk stays far from float overflow.
+
+    Args:
+        alpha: Smoothing factor in (0, 1]; smaller is smoother
+        settle: Residual weight of the seed value considered negligible when
+                sizing the input window (default: 0.001)
+    """
+
+    def __init__(self, alpha: float, settle: float = 0.001):
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError(f"Invalid alpha {alpha}. Must be in (0, 1]")
+        self.alpha = alpha
+        self.settle = settle
+
+        decay = 1.0 - alpha
+        self._chunk = max(1, int(100 / -math.log10(decay))) if decay > 0 else 0
+        self._settle_samples = (
+            math.ceil(math.log(settle) / math.log(decay)) if decay > 0 else 0
+        )
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        if self.alpha == 1.0 or len(values) == 0:
+            return np.array(values, dtype=float)
+
+        decay = 1.0 - self.alpha
+        out = np.empty(len(values))
+        previous = values[0]
+        for start in range(0, len(values), self._chunk):
+            block = values[start : start + self._chunk]
+            # y[k] = decay^(k+1) * (y[-1] + alpha * sum_{j<=k} x[j] / decay^(j+1))
+            powers = decay ** np.arange(1, len(block) + 1)
+            out[start : start + len(block)] = powers * (
+                previous + self.alpha * np.cumsum(block / powers)
+            )
+            previous = out[start + len(block) - 1]
+        return out
+
+    def inputs_needed(self, outputs: int) -> int:
+        return outputs + self._settle_samples
+
+    def __repr__(self):
+        return f"EMA({self.alpha})"
+
+
+class SavitzkyGolay(Filter):
+    """
+    Causal Savitzky-Golay smoother.
+
+    Fits a polynomial of degree `polyorder` to each window of `window` samples
+    and takes its value at the newest sample. Unlike a moving average it
+    follows ramps (the pressure rise of a shot) without lagging behind them.
+    The fit reduces to fixed convolution coefficients, computed once.
+    """
+
+    def __init__(self, window: int = 11, polyorder: int = 2):
+        if polyorder >= window:
+            raise ValueError(
+                f"polyorder ({polyorder}) must be less than window ({window})"
+            )
+        self.window = window
+        self.polyorder = polyorder
+
+        # Sample positions relative to the newest one (-window+1 .. 0); the
+        # fitted value at 0 is the constant term of the least-squares fit.
+        positions = np.arange(-window + 1, 1, dtype=float)
+        self._coefficients = np.linalg.pinv(
+            np.vander(positions, polyorder + 1, increasing=True)
+        )[0]
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        if len(values) < self.window:
+            return values[:0]
+        return np.correlate(values, self._coefficients, mode="valid")
+
+    def inputs_needed(self, outputs: int) -> int:
+        return outputs + self.window - 1
+
+    def __repr__(self):
+        return f"SavitzkyGolay({self.window}, {self.polyorder})"
+
+
+class FilterChain:
+    """
+    Sequence of filters applied in order.
+
+    `window` is the number of raw samples needed for one settled output, so
+    the latest filtered value costs a single pass over `window` samples.
+    """
+
+    def __init__(self, *filters: Filter):
+        self.filters = list(filters)
+
+        self.stride = 1
+        for stage in self.filters:
+            self.stride *= stage.stride
+        self.window = self.inputs_needed(1)
+
+    def inputs_needed(self, outputs: int) -> int:
+        """Number of raw samples required for `outputs` settled outputs."""
+        for stage in reversed(self.filters):
+            outputs = stage.inputs_needed(outputs)
+        return outputs
+
+    def apply(self, values) -> np.ndarray:
+        """Run a block of samples (array, memoryview, ...) through every filter."""
+        values = np.asarray(values, dtype=float)
+        for stage in self.filters:
+            values = stage.apply(values)
+        return values
+
+    def apply_with_times(self, times, values) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Like apply(), also returning the timestamp each output is aligned with.
+        """
+        filtered = self.apply(values)
+        times = np.asarray(times, dtype=float)
+        if len(filtered) == 0:
+            return times[:0], filtered
+        # The newest output lines up with the newest input, then every
+        # `stride` inputs back.
+        aligned = times[
+            len(times) - 1 - (len(filtered) - 1) * self.stride :: self.stride
+        ]
+        return aligned, filtered
+
+    def __repr__(self):
+        return f"FilterChain({', '.join(repr(stage) for stage in self.filters)})"
@@ -1,6 +1,9 @@
+from time import monotonic
+
 from gpiozero import MCP3008
 
 from smart_espresso.analog_sensor.analog_sensor import ADCInterface
+from smart_espresso.metrics import registry
 
 
 class MCP3008ADC(ADCInterface):
@@ -11,18 +14,26 @@ class MCP3008ADC(ADCInterface):
     8 channels (0-7).
     """
 
-    def __init__(self, pin: int):
+    def __init__(self, pin: int, port: int = 0, device: int = 0):
         """
         Initialize MCP3008 ADC.
 
         Args:
             pin: Channel number (0-7) on the MCP3008
+            port: SPI port (default: 0)
+            device: SPI chip select of the MCP3008 (default: 0, i.e. CE0)
         """
         if not 0 <= pin <= 7:
             raise ValueError(f"Invalid pin {pin}. Must be 0-7 for MCP3008")
 
         self.pin = pin
-        self.pot = MCP3008(self.pin)
+        self.pot = MCP3008(self.pin, port=port, device=device)
+        self.chip_key = ("mcp3008", port, device)
+
+        # 10-bit codes; gpiozero scales them by max_voltage / 1023
+        self.max_voltage = self.pot.max_voltage
+        self.max_code = 1023
+        self.lsb = self.pot.max_voltage / self.max_code
 
         # Cached from the last read() call. gpiozero's .value and .voltage
         # each trigger their own SPI transaction, so reading both separately
@@ -30,9 +41,24 @@ class MCP3008ADC(ADCInterface):
         # cached .value read instead.
         self._cached_voltage = None
 
+        self._conversion_seconds = registry.histogram(
+            "adc_conversion_seconds",
+            "Time per ADC conversion read",
+            adc="mcp3008",
+            address="spi",
+        )
+
     def read(self):
         """Read normalized value (0.0 to 1.0) from MCP3008."""
-        value = self.pot.value
+        if self.batched and self._cached_voltage is not None:
+            return self._cached_voltage / self.pot.max_voltage
+        if registry.enabled:
+            started = monotonic()
+            value = self.pot.value
+            self._conversion_seconds.observe(monotonic() - started)
+        else:
+            value = self.pot.value
+        self.conversion_time = monotonic()
         self._cached_voltage = value * self.pot.max_voltage
         return value
 
@@ -41,4 +67,16 @@ class MCP3008ADC(ADCInterface):
         """Get the voltage from the most recent read(); triggers a hardware read on first use."""
         if self._cached_voltage is None:
             self._cached_voltage = self.pot.voltage
+            self.conversion_time = monotonic()
         return self._cached_voltage
+
+    @classmethod
+    def scan_chip(cls, adcs: list["MCP3008ADC"]):
+        """Read the channels of one MCP3008 back to back and push the results."""
+        # gpiozero has no multi-channel transfer, so this is one tight pass
+        # over the channels rather than a single SPI burst
+        started = monotonic()
+        for adc in adcs:
+            adc.push_sample(adc.pot.value * adc.pot.max_voltage)
+        if registry.enabled:
+            adcs[0]._conversion_seconds.observe((monotonic() - started) / len(adcs))
@@ -1,6 +1,19 @@
-from homeassistant_api import Client, State
+from typing import TYPE_CHECKING, Optional
 
-from smart_espresso.analog_sensor.analog_sensor import AnalogSensor, ADCInterface
+import numpy as np
+
+from smart_espresso.analog_sensor.analog_sensor import (
+    ADCInterface,
+    AnalogSensor,
+    cached_per_sample,
+    invalidate_cache,
+)
+from smart_espresso.analog_sensor.calibration_curve import CalibrationCurve
+from smart_espresso.analog_sensor.filters import FilterChain
+from smart_espresso.metrics import registry
+
+if TYPE_CHECKING:
+    from homeassistant_api import State
 
 
 class PressureAnalogSensor(AnalogSensor):
@@ -14,6 +27,8 @@ class PressureAnalogSensor(AnalogSensor):
     - 0.5V = 0 pressure
     - 4.5V = max_pressure_mpa
     - Linear mapping in between
+
+    A measured multi-point CalibrationCurve can replace the nominal linear one.
     """
 
     # Voltage offset for zero pressure (sensors output 0.5V at 0 pressure)
@@ -21,7 +36,15 @@ class PressureAnalogSensor(AnalogSensor):
     SENSOR_MAX_VOLTAGE = 4.5
     SENSOR_VOLTAGE_RANGE = SENSOR_MAX_VOLTAGE - SENSOR_MIN_VOLTAGE  # 4.0V
 
-    def __init__(self, adc: ADCInterface, name: str, max_pressure_mpa: float):
+    def __init__(
+        self,
+        adc: ADCInterface,
+        name: str,
+        max_pressure_mpa: float,
+        history_size: int = 4096,
+        filters: Optional[FilterChain] = None,
+        curve: Optional[CalibrationCurve] = None,
+    ):
         """
         Initialize pressure sensor.
 
@@ -30,56 +53,133 @@ class PressureAnalogSensor(AnalogSensor):
             name: Name of the sensor (e.g., "Head", "Boiler")
             max_pressure_mpa: Maximum pressure rating of the sensor in MPa
                             (e.g., 2.0 for 0-2MPa sensor, 0.5 for 0-0.5MPa sensor)
+            history_size: Number of (timestamp, voltage) samples kept in
+                          `history` (default: 4096)
+            filters: Optional FilterChain smoothing the voltage before it is
+                     converted (e.g. FilterChain(Oversample(4), Median(5), EMA(0.2)))
+            curve: Voltage to bar calibration (default: linear 0.5-4.5V over
+                   0-max_pressure_mpa)
         """
-        super().__init__(adc, name)
+        super().__init__(adc, name, history_size, filters)
         self.max_pressure_mpa = max_pressure_mpa
-        self.offset_voltage = 0.0  # Auto-calibrated offset for fine-tuning
+        # Zero offset for fine-tuning; learned by calibration.ZeroCalibrator
+        self._offset_voltage = 0.0
+        self._curve = curve or CalibrationCurve.linear(
+            max_pressure_mpa, self.SENSOR_MIN_VOLTAGE, self.SENSOR_MAX_VOLTAGE
+        )
+        # Bar per ADC code for `curve`, without the offset; None without lsb
+        self._lut: Optional[np.ndarray] = None
+        # offset_voltage in whole ADC codes, applied as a shift of the code
+        self._offset_codes = 0
+        self._build_lookup_table()
+
+        self._conversions = registry.counter(
+            "pressure_conversions_total", "Voltage to pressure conversions", sensor=name
+        )
 
     @property
-    def mpa(self):
-        """
-        Convert ADC reading to pressure in MPa.
+    def offset_voltage(self) -> float:
+        return self._offset_voltage
 
-        The sensor outputs 0.5V at 0 pressure and 4.5V at max pressure.
-        ADC returns normalized value (0.0-1.0) and voltage.
+    @offset_voltage.setter
+    def offset_voltage(self, value: float):
+        self._offset_voltage = value
+        if self.adc.lsb:
+            self._offset_codes = round(value / self.adc.lsb)
+        invalidate_cache(self)
 
-        Formula:
-        1. Get actual voltage from ADC
-        2. Subtract minimum sensor voltage (0.5V) and offset calibration
-        3. Divide by sensor voltage range (4.0V)
-        4. Multiply by sensor's max pressure rating
-        """
-        voltage = self.adc.voltage
+    @property
+    def curve(self) -> CalibrationCurve:
+        return self._curve
 
-        # Auto-calibrate offset: track lowest voltage reading for fine-tuning
-        if voltage < (self.SENSOR_MIN_VOLTAGE + self.offset_voltage):
-            self.offset_voltage = voltage - self.SENSOR_MIN_VOLTAGE
-            if self.offset_voltage < -0.1:  # Cap at -0.1V to prevent bad calibration
-                self.offset_voltage = -0.1
-            print(f"{self.name} - Calibrating offset: {self.offset_voltage:.4f}V (voltage: {voltage:.4f}V)")
+    @curve.setter
+    def curve(self, value: CalibrationCurve):
+        self._curve = value
+        self._build_lookup_table()
+        invalidate_cache(self)
 
-        # Calculate pressure from voltage
-        # voltage_adjusted = actual voltage - sensor's zero voltage - calibration offset
-        voltage_adjusted = voltage - self.SENSOR_MIN_VOLTAGE - self.offset_voltage
+    @property
+    def lookup_table(self) -> Optional[np.ndarray]:
+        """
+        Pressure in bar for every code of the ADC (index = code - adc.min_code)
+        before the zero offset, which is applied by shifting the code by
+        `offset_voltage` rounded to whole codes. Rebuilt when `curve` is set.
+        None if the ADC doesn't report its resolution.
+        """
+        return self._lut
+
+    def _lut_index(self, codes):
+        # Shift by the zero offset, then clamp into the table
+        adc = self.adc
+        return (
+            np.clip(codes - self._offset_codes, adc.min_code, adc.max_code)
+            - adc.min_code
+        )
 
-        # Clamp to prevent negative values
-        if voltage_adjusted < 0:
-            voltage_adjusted = 0
+    def _build_lookup_table(self):
+        """
+        Build the table for the current curve and swap it in.
 
-        # Convert to MPa: (adjusted_voltage / 4V_range) * max_pressure
-        pressure_mpa = (voltage_adjusted / self.SENSOR_VOLTAGE_RANGE) * self.max_pressure_mpa
+        Runs in the thread that sets the curve, so the sampling and render
+        paths never pay for a rebuild. Zero offset updates (every few seconds
+        from a ZeroCalibrator) only change the code shift.
+        """
+        if not self.adc.lsb:
+            self._lut = None
+            return
+        codes = np.arange(self.adc.min_code, self.adc.max_code + 1)
+        self._lut = self._curve.convert(codes * self.adc.lsb)
 
-        return pressure_mpa
+    def bar_block(self, voltages) -> np.ndarray:
+        """
+        Convert a block of voltages (e.g. from `history` or filtered()) to bar.
 
-    @property
+        Unfiltered sensors on an ADC with known resolution convert with a
+        single lookup table index; otherwise the curve is interpolated.
+        """
+        voltages = np.asarray(voltages, dtype=float)
+        lut = self._lut
+        if self.filters is None and lut is not None:
+            codes = np.rint(voltages / self.adc.lsb).astype(np.int64)
+            return lut[self._lut_index(codes)]
+        return self.curve.convert(voltages - self.offset_voltage)
+
+    @cached_per_sample
+    def mpa(self):
+        """Convert the latest reading to pressure in MPa."""
+        return self.bar / 10
+
+    @cached_per_sample
     def bar(self):
-        return self.mpa * 10
+        """
+        Convert the latest reading to pressure in bar.
 
-    @property
+        The sensor outputs 0.5V at 0 pressure and 4.5V at max pressure.
+
+        1. Get actual voltage from ADC (filtered when `filters` is set)
+        2. Subtract the zero offset (offset_voltage)
+        3. Map through `curve` (linear between 0.5V and 4.5V unless calibrated)
+
+        Raw readings of an ADC with known resolution take one lookup_table
+        index instead.
+        """
+        voltage = self.voltage
+        if registry.enabled:
+            self._conversions.inc()
+
+        adc = self.adc
+        lut = self._lut
+        if self.filters is None and lut is not None:
+            code = round(voltage / adc.lsb) - self._offset_codes
+            code = min(max(code, adc.min_code), adc.max_code)
+            return float(lut[code - adc.min_code])
+        return self.curve(voltage - self.offset_voltage)
+
+    @cached_per_sample
     def message_mpa(self):
         return f"{self.name}: {round(self.mpa, 4)} MPa"
 
-    @property
+    @cached_per_sample
     def message_bar(self):
         return f"{self.name}: {round(self.bar, 2)} Bar"
 
@@ -87,7 +187,7 @@ class PressureAnalogSensor(AnalogSensor):
     def unit_of_measurement():
         return "Bar"
 
-    @property
+    @cached_per_sample
     def message(self):
         return self.message_bar
 
@@ -95,8 +195,10 @@ class PressureAnalogSensor(AnalogSensor):
     def normalized_value(self):
         return self.bar
 
-    def update_home_assistant(self, client: Client):
-        return client.set_state(
+    def ha_states(self) -> list["State"]:
+        from homeassistant_api import State
+
+        return [
             State(
                 entity_id=f"sensor.espresso_machine_{self.name.lower()}_pressure",
                 state=str(round(self.bar, 2)),
@@ -105,7 +207,7 @@ class PressureAnalogSensor(AnalogSensor):
                     "friendly_name": f"{self.name} Pressure",
                 },
             )
-        )
+        ]
 
     # value = pot.voltage
     # if value < OFFSET_VOLTAGE:
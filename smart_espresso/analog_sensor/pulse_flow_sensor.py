@@ -0,0 +1,196 @@
+"""Hall-effect pulse flow meter: debounced pulse counting and flow rate estimation."""
+from time import monotonic
+from typing import TYPE_CHECKING, Optional
+
+from smart_espresso.analog_sensor.analog_sensor import cached_per_sample
+from smart_espresso.analog_sensor.sample_buffer import SampleBuffer
+from smart_espresso.analog_sensor.water_flow_sensor import WaterFlowAnalogSensor
+
+if TYPE_CHECKING:
+    from homeassistant_api import State
+
+
+class PulseCounter:
+    """
+    Debounced, timestamped pulse counter.
+
+    pulse() is the edge callback: it rejects edges closer than `debounce`
+    seconds to the previous accepted one (contact bounce, noise) and records
+    the timestamp of every accepted pulse in a SampleBuffer ring. It does no
+    other work, so it keeps up with the sensor's maximum pulse rate no matter
+    how busy the main loop is; counting and rate estimation happen on the
+    reader's side.
+
+    Args:
+        debounce: Minimum seconds between two pulses (default: 0.0005; the
+                  flow meters sold for espresso machines stay below ~600 Hz)
+        capacity: Number of pulse timestamps kept (default: 4096)
+        latency: Seconds a pulse may take to reach pulse() (callback thread
+                 scheduling, GIL); see rate() (default: 0.02)
+    """
+
+    def __init__(
+        self, debounce: float = 0.0005, capacity: int = 4096, latency: float = 0.02
+    ):
+        self.debounce = debounce
+        self.latency = latency
+        self.pulses = SampleBuffer(capacity)  # (timestamp, pulse number)
+        self.rejected = 0
+        self._last_pulse = float("-inf")
+
+    def pulse(self, timestamp: Optional[float] = None):
+        """Record one edge at `timestamp` on the monotonic clock (default: now)."""
+        if timestamp is None:
+            timestamp = monotonic()
+        if timestamp - self._last_pulse < self.debounce:
+            self.rejected += 1
+            return
+        self._last_pulse = timestamp
+        self.pulses.append(timestamp, self.pulses.total + 1)
+
+    @property
+    def count(self) -> int:
+        """Pulses accepted since creation."""
+        return self.pulses.total
+
+    def rate(self, window: float = 1.0, now: Optional[float] = None) -> float:
+        """
+        Pulse frequency in Hz, from the intervals between the pulses of the
+        last `window` seconds.
+
+        Once no pulse has arrived for longer than the average interval (plus
+        `latency`, as the next one may just not have been delivered yet), the
+        rate is capped at 1 / (time since the last pulse), so it falls
+        towards zero when the flow stops instead of holding the last value.
+        """
+        if now is None:
+            now = monotonic()
+        times, _ = self.pulses.since(window, now)
+        if len(times) < 2:
+            return 0.0
+        rate = (len(times) - 1) / (times[-1] - times[0])
+        idle = now - times[-1] - self.latency
+        if idle * rate > 1.0:
+            rate = 1.0 / idle
+        return rate
+
+
+class GPIOPulseSource:
+    """
+    Feed a PulseCounter from the edges on a GPIO pin (gpiozero).
+
+    gpiozero delivers edge callbacks on its own thread, so pulses are counted
+    while the main loop is busy sampling or rendering.
+
+    Args:
+        counter: Counter to feed
+        pin: GPIO pin (BCM numbering)
+        pull_up: Enable the internal pull-up (open-collector sensors)
+    """
+
+    def __init__(self, counter: PulseCounter, pin: int, pull_up: bool = True):
+        from gpiozero import DigitalInputDevice
+
+        self.counter = counter
+        self.pin = pin
+        self.device = DigitalInputDevice(pin, pull_up=pull_up)
+        # With the pull-up the sensor pulls the line low on every pulse
+        if pull_up:
+            self.device.when_deactivated = lambda: counter.pulse()
+        else:
+            self.device.when_activated = lambda: counter.pulse()
+
+    def close(self):
+        self.device.close()
+
+
+class PulseFlowSensor(WaterFlowAnalogSensor):
+    """
+    Water flow meter with a hall-effect pulse output.
+
+    Pulses are counted by a PulseCounter (fed from a GPIO pin, or by anything
+    calling counter.pulse(), e.g. simulation.FakePulseSource). read()
+    snapshots the count and estimates the flow rate; `history` records the
+    rate in ml/s.
+
+    Args:
+        name: Sensor name (e.g. "Brew")
+        gpio_pin: GPIO pin of the sensor's signal wire; None to feed
+                  `counter` yourself
+        pulses_per_liter: Calibration of the meter (default: 5880)
+        rate_window: Seconds of pulses averaged for the flow rate (default: 1.0)
+        debounce: Minimum seconds between pulses (see PulseCounter)
+        history_size: Number of (timestamp, ml/s) samples kept in `history`
+        counter: Use an existing PulseCounter instead of creating one
+    """
+
+    def __init__(
+        self,
+        name: str,
+        gpio_pin: Optional[int] = None,
+        pulses_per_liter: float = 5880,
+        rate_window: float = 1.0,
+        debounce: float = 0.0005,
+        history_size: int = 4096,
+        counter: Optional[PulseCounter] = None,
+    ):
+        super().__init__(adc=None, name=name, history_size=history_size)
+        self.pulses_per_liter = pulses_per_liter
+        self.rate_window = rate_window
+        self.counter = counter or PulseCounter(debounce)
+        self.source = (
+            GPIOPulseSource(self.counter, gpio_pin) if gpio_pin is not None else None
+        )
+
+        self._count = 0
+        self._rate = 0.0
+
+    def read(self):
+        """Snapshot the pulse count and flow rate."""
+        now = monotonic()
+        self._count = self.counter.count
+        self._rate = self.counter.rate(self.rate_window, now)
+        self._timestamp = now
+        self._value = self._count
+        self.history.append(now, self._ml_per_s(self._rate))
+        self.generation += 1
+        return self._value
+
+    def _ml_per_s(self, rate: float) -> float:
+        return rate / self.pulses_per_liter * 1000
+
+    @cached_per_sample
+    def liter(self):
+        """Volume since start, in liters."""
+        return self._count / self.pulses_per_liter
+
+    @cached_per_sample
+    def flow_ml_per_s(self):
+        """Flow rate at the last read(), in ml/s."""
+        return self._ml_per_s(self._rate)
+
+    @cached_per_sample
+    def message(self):
+        return f"{self.name}: {self.liter * 1000:.0f} ml {self.flow_ml_per_s:.1f} ml/s"
+
+    def ha_states(self) -> list["State"]:
+        from homeassistant_api import State
+
+        return super().ha_states() + [
+            State(
+                entity_id=f"sensor.espresso_machine_{self.name.lower()}_flow_rate",
+                state=str(round(self.flow_ml_per_s, 2)),
+                attributes={
+                    "unit_of_measurement": "mL/s",
+                    "friendly_name": f"{self.name} Flow Rate",
+                    "device_class": "volume_flow_rate",
+                },
+            )
+        ]
+
+    def close(self):
+        if self.source:
+            self.source.close()
+
+    def __repr__(self):
+        return f"PulseFlowSensor(name='{self.name}', pulses={self.counter.count})"
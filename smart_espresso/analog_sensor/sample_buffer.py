@@ -0,0 +1,138 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from time import monotonic
+from typing import Optional
+
+
+class SampleBuffer:
+    """
+    Fixed-size ring buffer of (monotonic timestamp, voltage) samples.
+
+    Storage is preallocated once, so memory use stays constant no matter how
+    long the machine runs. Every sample is written twice, at index i and
+    i + capacity, which keeps the most recent `capacity` samples contiguous
+    in memory: queries return memoryview slices of the underlying
+    array('d') without copying (wrap NumPy around them with np.frombuffer).
+
+    Appends are O(1) and meant for a single writer (the sampling path).
+    Readers don't take a lock; the sample count is only published after the
+    data has been written. A returned view is overwritten once another
+    `capacity - len(view)` samples have been appended, so copy it if it has
+    to be kept around.
+
+    Args:
+        capacity: Number of samples kept (default: 4096, ~40s at 100 Hz)
+    """
+
+    def __init__(self, capacity: int = 4096):
+        if capacity < 1:
+            raise ValueError(f"Invalid capacity {capacity}. Must be at least 1")
+
+        self.capacity = capacity
+        self._times = array("d", bytes(2 * capacity * 8))
+        self._values = array("d", bytes(2 * capacity * 8))
+        self._times_view = memoryview(self._times)
+        self._values_view = memoryview(self._values)
+        self._count = 0  # Total samples ever appended
+
+    def append(self, timestamp: float, value: float):
+        """Store a sample, overwriting the oldest one once the buffer is full."""
+        i = self._count % self.capacity
+        self._times[i] = self._times[i + self.capacity] = timestamp
+        self._values[i] = self._values[i + self.capacity] = value
+        self._count += 1
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    @property
+    def total(self) -> int:
+        """Number of samples appended since creation (including overwritten ones)."""
+        return self._count
+
+    def latest(self) -> Optional[tuple[float, float]]:
+        """Return the most recent (timestamp, value) pair, or None if empty."""
+        count = self._count
+        if count == 0:
+            return None
+        i = (count - 1) % self.capacity
+        return self._times[i], self._values[i]
+
+    def last(self, n: int) -> tuple[memoryview, memoryview]:
+        """
+        Return (timestamps, values) views of the most recent n samples, oldest first.
+        """
+        count = self._count
+        n = max(0, min(n, count, self.capacity))
+        # The newest sample's mirror at +capacity always has `capacity`
+        # valid (or zero-initialized, but unused) slots before it.
+        end = (count - 1) % self.capacity + self.capacity + 1 if count else 0
+        return self._times_view[end - n : end], self._values_view[end - n : end]
+
+    def since(
+        self, seconds: float, now: Optional[float] = None
+    ) -> tuple[memoryview, memoryview]:
+        """
+        Return (timestamps, values) views of the samples from the last `seconds`.
+
+        Args:
+            seconds: Length of the window
+            now: End of the window on the monotonic clock (default: now)
+        """
+        if now is None:
+            now = monotonic()
+        times, values = self.last(self.capacity)
+        start = bisect_left(times, now - seconds)
+        end = bisect_right(times, now, start)
+        return times[start:end], values[start:end]
+
+
+class SharedSampleBuffer(SampleBuffer):
+    """
+    SampleBuffer laid out in an externally owned buffer, e.g. a
+    multiprocessing.shared_memory segment.
+
+    A writer process appends and reader processes query the very same
+    memory, with the same single-writer / lock-free reader semantics as
+    SampleBuffer. Layout: the sample count (int64), then the mirrored
+    timestamps and values (float64, 2 * capacity each); size() returns the
+    number of bytes needed.
+
+    Args:
+        buffer: Writable buffer of at least size(capacity) bytes
+        capacity: Number of samples kept
+    """
+
+    def __init__(self, buffer, capacity: int):
+        if capacity < 1:
+            raise ValueError(f"Invalid capacity {capacity}. Must be at least 1")
+
+        view = memoryview(buffer)[: self.size(capacity)]
+        if len(view) < self.size(capacity):
+            raise ValueError(
+                f"Buffer too small for {capacity} samples ({len(view)} bytes)"
+            )
+
+        self.capacity = capacity
+        self._view = view
+        self._header = view[:8].cast("q")
+        self._times = self._times_view = view[8 : 8 + 16 * capacity].cast("d")
+        self._values = self._values_view = view[8 + 16 * capacity :].cast("d")
+
+    @staticmethod
+    def size(capacity: int) -> int:
+        """Bytes of shared memory needed for `capacity` samples."""
+        return 8 + 32 * capacity
+
+    @property
+    def _count(self) -> int:
+        return self._header[0]
+
+    @_count.setter
+    def _count(self, count: int):
+        self._header[0] = count
+
+    def release(self):
+        """Release the views into the buffer so its owner can be closed."""
+        for view in (self._header, self._times, self._values, self._view):
+            view.release()
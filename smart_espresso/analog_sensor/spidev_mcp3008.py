@@ -0,0 +1,213 @@
+"""
+MCP3008 driven directly through the Linux spidev interface.
+
+gpiozero's MCP3008 runs every read through several Python object layers and
+locks and one SPI transaction per call. This backend talks to
+/dev/spidev<port>.<device> with the SPI_IOC_MESSAGE ioctl instead: all
+requested channels are converted in a single system call (one 3-byte
+transfer per channel, chip select toggled between them), using transfer
+buffers that are allocated once per channel set. Only the standard library
+(ctypes, fcntl) is needed.
+"""
+import ctypes
+import fcntl
+import os
+import struct
+import threading
+from time import monotonic
+from typing import Sequence
+
+from smart_espresso.analog_sensor.analog_sensor import ADCInterface
+from smart_espresso.metrics import registry
+
+# From linux/spi/spidev.h
+_SPI_IOC_MAGIC = ord("k")
+_IOC_WRITE = 1
+
+
+def _iow(nr: int, size: int) -> int:
+    return (_IOC_WRITE << 30) | (size << 16) | (_SPI_IOC_MAGIC << 8) | nr
+
+
+SPI_IOC_WR_MODE = _iow(1, 1)
+SPI_IOC_WR_BITS_PER_WORD = _iow(3, 1)
+SPI_IOC_WR_MAX_SPEED_HZ = _iow(4, 4)
+
+
+class SpiIocTransfer(ctypes.Structure):
+    """struct spi_ioc_transfer"""
+
+    _fields_ = [
+        ("tx_buf", ctypes.c_uint64),
+        ("rx_buf", ctypes.c_uint64),
+        ("len", ctypes.c_uint32),
+        ("speed_hz", ctypes.c_uint32),
+        ("delay_usecs", ctypes.c_uint16),
+        ("bits_per_word", ctypes.c_uint8),
+        ("cs_change", ctypes.c_uint8),
+        ("tx_nbits", ctypes.c_uint8),
+        ("rx_nbits", ctypes.c_uint8),
+        ("word_delay_usecs", ctypes.c_uint8),
+        ("pad", ctypes.c_uint8),
+    ]
+
+
+def spi_ioc_message(count: int) -> int:
+    """SPI_IOC_MESSAGE(count) request number."""
+    return _iow(0, count * ctypes.sizeof(SpiIocTransfer))
+
+
+class _Message:
+    """Preallocated ioctl request converting a fixed set of channels."""
+
+    def __init__(self, channels: Sequence[int], speed_hz: int):
+        count = len(channels)
+        self.tx = (ctypes.c_uint8 * (3 * count))()
+        self.rx = (ctypes.c_uint8 * (3 * count))()
+        self.transfers = (SpiIocTransfer * count)()
+        for i, channel in enumerate(channels):
+            # Start bit, then single-ended mode + channel; the 10-bit result
+            # comes back in the low 2 bits of byte 1 and all of byte 2
+            self.tx[3 * i] = 0x01
+            self.tx[3 * i + 1] = (0x08 | channel) << 4
+            transfer = self.transfers[i]
+            transfer.tx_buf = ctypes.addressof(self.tx) + 3 * i
+            transfer.rx_buf = ctypes.addressof(self.rx) + 3 * i
+            transfer.len = 3
+            transfer.speed_hz = speed_hz
+            transfer.bits_per_word = 8
+            # Release chip select between conversions (not after the last one)
+            transfer.cs_change = 1 if i < count - 1 else 0
+        self.request = spi_ioc_message(count)
+        self.count = count
+
+    def codes(self) -> list[int]:
+        rx = self.rx
+        return [
+            ((rx[3 * i + 1] & 0x03) << 8) | rx[3 * i + 2] for i in range(self.count)
+        ]
+
+
+class MCP3008SpiDev:
+    """
+    One MCP3008 on /dev/spidev<port>.<device>.
+
+    Args:
+        port: SPI bus (default: 0)
+        device: Chip select (default: 0)
+        speed_hz: SPI clock (default: 1.35 MHz, the MCP3008's limit at 2.7V;
+                  up to 3.6 MHz at 5V)
+    """
+
+    def __init__(self, port: int = 0, device: int = 0, speed_hz: int = 1_350_000):
+        self.port = port
+        self.device = device
+        self.speed_hz = speed_hz
+        self._messages: dict[tuple, _Message] = {}
+        self._lock = threading.Lock()
+        self._fd = self._open()
+
+    def _open(self) -> int:
+        fd = os.open(f"/dev/spidev{self.port}.{self.device}", os.O_RDWR)
+        fcntl.ioctl(fd, SPI_IOC_WR_MODE, struct.pack("=B", 0))
+        fcntl.ioctl(fd, SPI_IOC_WR_BITS_PER_WORD, struct.pack("=B", 8))
+        fcntl.ioctl(fd, SPI_IOC_WR_MAX_SPEED_HZ, struct.pack("=I", self.speed_hz))
+        return fd
+
+    def _transfer(self, message: _Message):
+        fcntl.ioctl(self._fd, message.request, message.transfers)
+
+    def read_channels(self, channels: Sequence[int]) -> list[int]:
+        """Convert `channels` (0-7) in one ioctl and return their 10-bit codes."""
+        key = tuple(channels)
+        with self._lock:
+            message = self._messages.get(key)
+            if message is None:
+                message = self._messages[key] = _Message(key, self.speed_hz)
+            self._transfer(message)
+            return message.codes()
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+class MCP3008SpiDevADC(ADCInterface):
+    """
+    MCP3008 channel read through spidev instead of gpiozero.
+
+    Drop-in replacement for MCP3008ADC. Channels of the same chip share one
+    MCP3008SpiDev, and an ADCRegistry converts all of them in one ioctl.
+
+    Args:
+        pin: Channel number (0-7)
+        port: SPI bus (default: 0)
+        device: Chip select (default: 0)
+        speed_hz: SPI clock (default: 1.35 MHz); the first channel of a chip sets it
+        max_voltage: Reference voltage (default: 3.3)
+    """
+
+    # Class-level chips shared by all channels, keyed by (port, device)
+    _chips: dict[tuple[int, int], MCP3008SpiDev] = {}
+
+    def __init__(
+        self,
+        pin: int,
+        port: int = 0,
+        device: int = 0,
+        speed_hz: int = 1_350_000,
+        max_voltage: float = 3.3,
+    ):
+        if not 0 <= pin <= 7:
+            raise ValueError(f"Invalid pin {pin}. Must be 0-7 for MCP3008")
+
+        self.pin = pin
+        self.max_voltage = max_voltage
+        if (port, device) not in MCP3008SpiDevADC._chips:
+            MCP3008SpiDevADC._chips[(port, device)] = MCP3008SpiDev(
+                port, device, speed_hz
+            )
+        self.chip = MCP3008SpiDevADC._chips[(port, device)]
+        self.chip_key = ("mcp3008-spidev", port, device)
+
+        self.max_code = 1023
+        self.lsb = max_voltage / self.max_code
+        self._cached_voltage = None
+
+        self._conversion_seconds = registry.histogram(
+            "adc_conversion_seconds",
+            "Time per ADC conversion read",
+            adc="mcp3008",
+            address="spidev",
+        )
+
+    def read(self):
+        """Read normalized value (0.0 to 1.0) from MCP3008."""
+        if not (self.batched and self._cached_voltage is not None):
+            started = monotonic() if registry.enabled else 0.0
+            code = self.chip.read_channels((self.pin,))[0]
+            self.conversion_time = monotonic()
+            if registry.enabled:
+                self._conversion_seconds.observe(self.conversion_time - started)
+            self._cached_voltage = code * self.lsb
+        return self._cached_voltage / self.max_voltage
+
+    @property
+    def voltage(self):
+        """Get the voltage from the most recent read(); triggers a hardware read on first use."""
+        if self._cached_voltage is None:
+            self.read()
+        return self._cached_voltage
+
+    @classmethod
+    def scan_chip(cls, adcs: list["MCP3008SpiDevADC"]):
+        """Convert every channel of one MCP3008 in a single ioctl and push the results."""
+        started = monotonic()
+        codes = adcs[0].chip.read_channels([adc.pin for adc in adcs])
+        # All channels are converted within the one ioctl
+        converted = monotonic()
+        for adc, code in zip(adcs, codes):
+            adc.push_sample(code * adc.lsb, converted)
+        if registry.enabled:
+            adcs[0]._conversion_seconds.observe((monotonic() - started) / len(adcs))
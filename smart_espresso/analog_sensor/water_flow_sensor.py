@@ -1,17 +1,23 @@
-from homeassistant_api import Client, State
+from typing import TYPE_CHECKING, Optional
 
-from smart_espresso.analog_sensor.analog_sensor import AnalogSensor
+from smart_espresso.analog_sensor.analog_sensor import AnalogSensor, cached_per_sample
+from smart_espresso.analog_sensor.filters import FilterChain
+
+if TYPE_CHECKING:
+    from homeassistant_api import State
 
 
 class WaterFlowAnalogSensor(AnalogSensor):
-    def __init__(self, adc, name):
-        super().__init__(adc, name)
+    def __init__(
+        self, adc, name, history_size: int = 4096, filters: Optional[FilterChain] = None
+    ):
+        super().__init__(adc, name, history_size, filters)
 
-    @property
+    @cached_per_sample
     def liter(self):
         raise NotImplementedError
 
-    @property
+    @cached_per_sample
     def message_liter(self):
         return f"{self.name}: {round(self.liter, 4)} L"
 
@@ -19,7 +25,7 @@ class WaterFlowAnalogSensor(AnalogSensor):
     def unit_of_measurement():
         return "L"
 
-    @property
+    @cached_per_sample
     def message(self):
         return self.message_liter
 
@@ -27,8 +33,10 @@ class WaterFlowAnalogSensor(AnalogSensor):
     def normalized_value(self):
         return self.liter
 
-    def update_home_assistant(self, client: Client):
-        client.set_state(
+    def ha_states(self) -> list["State"]:
+        from homeassistant_api import State
+
+        return [
             State(
                 entity_id=f"sensor.espresso_machine_{self.name.lower()}_flow",
                 state=str(round(self.liter, 2)),
@@ -38,4 +46,4 @@ class WaterFlowAnalogSensor(AnalogSensor):
                     "device_class": "volume",
                 },
             )
-        )
+        ]
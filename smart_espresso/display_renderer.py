@@ -0,0 +1,148 @@
+from contextlib import nullcontext
+from typing import Optional, Sequence
+
+from luma.oled.device import sh1106
+from PIL import Image, ImageDraw, ImageFont
+
+from smart_espresso.glyph_cache import GlyphCache
+from smart_espresso.i2c_bus import I2CBus
+
+# SH1106 page address command; each page is a horizontal band of 8 pixel rows
+SET_PAGE_ADDRESS = 0xB0
+# The SH1106 has 132 columns of RAM for 128 visible ones; start at column 2
+COLUMN_OFFSET = 2
+SET_LOW_COLUMN = 0x00 | COLUMN_OFFSET
+SET_HIGH_COLUMN = 0x10
+
+
+class DisplayRenderer:
+    """
+    Incremental text renderer for 1-bit OLED displays.
+
+    Keeps the last framebuffer and the text of every line. On render(), only
+    lines whose text changed are cleared and redrawn (as 1-bit text from a
+    GlyphCache, no dithering), and on an un-rotated SH1106 only the 8-pixel pages whose
+    bytes actually changed are written over I2C. Other devices get the whole
+    frame through device.display(), but only when something changed.
+
+    Args:
+        display: luma display device
+        font: PIL font used for every line
+        left: X offset of the text (default: 5)
+        top: Y offset of the first line (default: 15)
+        line_height: Pixels between lines (default: 15)
+        glyph_cache: Bitmap cache used to draw text (default: a new GlyphCache)
+        bus: I2CBus arbiter shared with the ADC. Each page is then written
+             in slices of `slice_columns` columns, each in its own
+             low-priority bus transaction, and only slices whose bytes
+             changed are sent, so ADC conversions can run in between.
+        slice_columns: Columns per slice when `bus` is set (default: 32,
+                       about 1ms of bus time at 400 kHz)
+    """
+
+    def __init__(
+        self,
+        display,
+        font: ImageFont.FreeTypeFont,
+        left: int = 5,
+        top: int = 15,
+        line_height: int = 15,
+        glyph_cache: GlyphCache = None,
+        bus: Optional[I2CBus] = None,
+        slice_columns: int = 32,
+    ):
+        self.display = display
+        self.font = font
+        self.left = left
+        self.top = top
+        self.line_height = line_height
+        self.glyph_cache = glyph_cache or GlyphCache()
+        self.bus = bus
+        self.slice_columns = slice_columns
+
+        self.image = Image.new("1", display.size)
+        self._draw = ImageDraw.Draw(self.image)
+        self._lines: list[str] = []
+        self._pages = display.height // 8
+        # Contents of the display RAM are unknown until the first flush
+        self._flushed_pages: list = [None] * self._pages
+        self._page_flush = isinstance(display, sh1106) and display.rotate == 0
+
+        self.frames = 0
+        self.pages_flushed = 0
+
+    def render(self, messages: Sequence[str]):
+        """Draw one message per line and send the changed part to the display."""
+        line_count = max(len(messages), len(self._lines))
+        self._lines.extend([""] * (line_count - len(self._lines)))
+
+        changed_rows = []
+        for index in range(line_count):
+            message = messages[index] if index < len(messages) else ""
+            if message == self._lines[index]:
+                continue
+            y = self.top + index * self.line_height
+            self._draw.rectangle(
+                (0, y, self.image.width - 1, y + self.line_height - 1), fill=0
+            )
+            if message:
+                self.glyph_cache.draw_text(
+                    self.image, (self.left, y), message, self.font
+                )
+            self._lines[index] = message
+            changed_rows.append((y, y + self.line_height))
+
+        if changed_rows or None in self._flushed_pages:
+            self.frames += 1
+            if self._page_flush:
+                self._flush_pages(changed_rows)
+            else:
+                with self.bus.transaction("display") if self.bus else nullcontext():
+                    self.display.display(self.image)
+                self.pages_flushed += self._pages
+                self._flushed_pages = [True] * self._pages
+
+    def _page_bytes(self, page: int) -> bytes:
+        # One byte per column, least significant bit = top row of the page
+        band = self.image.crop((0, page * 8, self.image.width, page * 8 + 8))
+        return band.transpose(Image.Transpose.ROTATE_270).tobytes()
+
+    def _flush_pages(self, changed_rows: list[tuple[int, int]]):
+        candidates = {
+            page
+            for start, end in changed_rows
+            for page in range(
+                max(start, 0) // 8, min(end - 1, self.image.height - 1) // 8 + 1
+            )
+        }
+        candidates.update(
+            i for i, data in enumerate(self._flushed_pages) if data is None
+        )
+
+        for page in sorted(candidates):
+            data = self._page_bytes(page)
+            if data == self._flushed_pages[page]:
+                continue
+            if self.bus:
+                self._write_page_slices(page, data, self._flushed_pages[page])
+            else:
+                self.display.command(
+                    SET_PAGE_ADDRESS + page, SET_LOW_COLUMN, SET_HIGH_COLUMN
+                )
+                self.display.data(list(data))
+            self._flushed_pages[page] = data
+            self.pages_flushed += 1
+
+    def _write_page_slices(self, page: int, data: bytes, previous: Optional[bytes]):
+        for start in range(0, len(data), self.slice_columns):
+            end = start + self.slice_columns
+            if previous is not None and data[start:end] == previous[start:end]:
+                continue
+            column = start + COLUMN_OFFSET
+            with self.bus.transaction("display"):
+                self.display.command(
+                    SET_PAGE_ADDRESS + page,
+                    0x00 | (column & 0x0F),
+                    SET_HIGH_COLUMN | (column >> 4),
+                )
+                self.display.data(list(data[start:end]))
@@ -0,0 +1,85 @@
+import re
+from collections import OrderedDict
+from typing import Optional
+
+from PIL import Image, ImageDraw, ImageFont
+
+# Characters of numeric readouts, drawn from per-character bitmaps so that a
+# changing value never needs a new rasterization.
+NUMERIC_RUN = re.compile(r"[0-9.+\-]+|[^0-9.+\-]+")
+NUMERIC_CHARS = frozenset("0123456789.+-")
+
+
+class GlyphCache:
+    """
+    LRU cache of pre-rasterized 1-bit text bitmaps.
+
+    Entries are keyed on (text, font path, font size). draw_text() splits a
+    line into numeric and non-numeric runs: labels such as "Head: " and
+    " Bar" are cached as whole strings, while numbers are composed from
+    cached single-character bitmaps. A display showing a changing reading
+    therefore only pastes bitmaps instead of asking FreeType to rasterize
+    every line on every frame.
+
+    With PIL's basic layout engine (no kerning, integer advances) the
+    composed result is pixel-identical to ImageDraw.text().
+
+    Args:
+        max_entries: Maximum number of cached bitmaps (default: 256)
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def glyph(
+        self, text: str, font: ImageFont.FreeTypeFont
+    ) -> tuple[Optional[Image.Image], tuple[int, int], float]:
+        """
+        Return (mask, (dx, dy), advance) for a string.
+
+        mask is a 1-bit bitmap to paste at the pen position plus (dx, dy), or
+        None for blank text; advance is how far the pen moves afterwards.
+        """
+        key = (text, getattr(font, "path", id(font)), getattr(font, "size", None))
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+
+        self.misses += 1
+        left, top, right, bottom = font.getbbox(text)
+        mask = None
+        if right > left and bottom > top:
+            mask = Image.new("1", (right - left, bottom - top))
+            ImageDraw.Draw(mask).text((-left, -top), text, fill=1, font=font)
+        entry = (mask, (left, top), font.getlength(text))
+
+        self._entries[key] = entry
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def draw_text(
+        self,
+        image: Image.Image,
+        xy: tuple[int, int],
+        text: str,
+        font: ImageFont.FreeTypeFont,
+        fill: int = 1,
+    ):
+        """Draw text onto a 1-bit image, like ImageDraw.text(xy, text, fill, font)."""
+        x, y = xy
+        for run in NUMERIC_RUN.findall(text):
+            parts = run if run[0] in NUMERIC_CHARS else (run,)
+            for part in parts:
+                mask, (dx, dy), advance = self.glyph(part, font)
+                if mask is not None:
+                    image.paste(fill, (round(x) + dx, y + dy), mask)
+                x += advance
@@ -0,0 +1,137 @@
+import threading
+from contextlib import contextmanager
+from time import monotonic
+
+from smart_espresso.metrics import registry
+
+
+class BusClientStats:
+    """Bus usage counters of one I2CBus client."""
+
+    def __init__(self):
+        self.transactions = 0
+        self.busy_time = 0.0  # Seconds the client held the bus
+        self.wait_time = 0.0  # Seconds spent waiting for it
+        self.max_wait = 0.0
+
+    def snapshot(self) -> dict:
+        return {
+            "transactions": self.transactions,
+            "busy_time": self.busy_time,
+            "wait_time": self.wait_time,
+            "max_wait": self.max_wait,
+        }
+
+    def __repr__(self) -> str:
+        return f"BusClientStats({self.snapshot()})"
+
+
+class I2CBus:
+    """
+    Arbiter for an I2C bus shared by the ADS1115 and the SH1106 display.
+
+    The adafruit driver (busio) and luma (smbus2) open the bus independently,
+    so nothing stops an 8ms ADC conversion and a display page write from
+    interleaving, or a full-screen flush from delaying a conversion for tens
+    of milliseconds. Every user wraps its bus access in transaction():
+
+    - High-priority transactions (ADC conversions) go before any waiting
+      low-priority one (display writes).
+    - After a high-priority transaction, one waiting low-priority transaction
+      is let in before the next conversion, so a continuously scanning ADC
+      can't starve the display. Keep low-priority transactions short
+      (DisplayRenderer writes page slices) and a conversion is never delayed
+      by more than one slice.
+
+    Per-client counters are in `stats`, and utilization() reports the
+    fraction of time the bus was held.
+    """
+
+    def __init__(self, name: str = "i2c-1"):
+        self.name = name
+        self.stats: dict[str, BusClientStats] = {}
+
+        self._cond = threading.Condition()
+        self._owner = None  # Client currently holding the bus
+        self._high_waiting = 0
+        self._low_waiting = 0
+        self._low_turn = False  # Bus is reserved for a waiting low-priority client
+        self._since = monotonic()
+        self._busy_time = 0.0
+
+    @contextmanager
+    def transaction(self, client: str, high_priority: bool = False):
+        """
+        Hold the bus for the duration of the with-block.
+
+        Args:
+            client: Name under which the usage is counted (e.g. "ads1115@0x48")
+            high_priority: True for ADC conversions, False for display writes
+        """
+        requested = monotonic()
+        with self._cond:
+            if high_priority:
+                self._high_waiting += 1
+                while self._owner is not None or self._low_turn:
+                    self._cond.wait()
+                self._high_waiting -= 1
+            else:
+                self._low_waiting += 1
+                while self._owner is not None or (
+                    self._high_waiting and not self._low_turn
+                ):
+                    self._cond.wait()
+                self._low_waiting -= 1
+                self._low_turn = False
+            self._owner = client
+        acquired = monotonic()
+
+        try:
+            yield
+        finally:
+            released = monotonic()
+            with self._cond:
+                self._owner = None
+                if high_priority and self._low_waiting:
+                    self._low_turn = True
+
+                stats = self.stats.get(client)
+                if stats is None:
+                    stats = self.stats[client] = BusClientStats()
+                wait = acquired - requested
+                stats.transactions += 1
+                stats.busy_time += released - acquired
+                stats.wait_time += wait
+                stats.max_wait = max(stats.max_wait, wait)
+                self._busy_time += released - acquired
+                self._cond.notify_all()
+
+            if registry.enabled:
+                registry.histogram(
+                    "i2c_wait_seconds", "Time waiting for the I2C bus", client=client
+                ).observe(wait)
+                registry.counter(
+                    "i2c_transactions_total", "I2C bus transactions", client=client
+                ).inc()
+
+    def utilization(self) -> float:
+        """Fraction of the time since creation (or reset_stats()) the bus was held."""
+        elapsed = monotonic() - self._since
+        return self._busy_time / elapsed if elapsed > 0 else 0.0
+
+    def reset_stats(self):
+        with self._cond:
+            self.stats = {}
+            self._busy_time = 0.0
+            self._since = monotonic()
+
+    def snapshot(self) -> dict:
+        return {
+            "utilization": self.utilization(),
+            "clients": {
+                client: stats.snapshot() for client, stats in self.stats.items()
+            },
+        }
+
+    def __repr__(self) -> str:
+        return f"I2CBus(name='{self.name}', utilization={self.utilization():.1%})"
@@ -0,0 +1,208 @@
+"""
+Lightweight counters and latency histograms for the hot paths.
+
+Instrumented code fetches its Counter/Histogram objects once (at construction)
+and guards every update with `if registry.enabled:`, so with metrics disabled
+(the default) the cost is a single attribute check per call site. Enable with
+`registry.enabled = True`, then read `registry.snapshot()` or serve the
+Prometheus text format with MetricsServer.
+"""
+import json
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+PREFIX = "smart_espresso_"
+
+# Seconds; from fast SPI reads up to slow Home Assistant requests
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+
+def _label_text(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+
+class Counter:
+    """Monotonically increasing count."""
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: int = 1):
+        self.value += amount
+
+
+class Histogram:
+    """Fixed-bucket histogram (cumulative counts are computed when exported)."""
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (inf if beyond the last bucket)."""
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            seen += count
+            if count and seen >= target:
+                return bound
+        return 0.0
+
+
+class Metrics:
+    """Registry of named, labelled counters and histograms."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._metrics: dict[
+            str, dict
+        ] = {}  # name -> {"type", "help", "series": {labels: obj}}
+
+    def _get(self, kind: str, name: str, help_text: str, factory, labels: dict):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            metric = self._metrics.setdefault(
+                name, {"type": kind, "help": help_text, "series": {}}
+            )
+            if metric["type"] != kind:
+                raise ValueError(f"Metric {name} is a {metric['type']}, not a {kind}")
+            series = metric["series"]
+            if key not in series:
+                series[key] = factory()
+            return series[key]
+
+    def counter(self, name: str, help_text: str = "", **labels) -> Counter:
+        return self._get("counter", name, help_text, Counter, labels)
+
+    def histogram(
+        self, name: str, help_text: str = "", buckets: tuple = DEFAULT_BUCKETS, **labels
+    ) -> Histogram:
+        return self._get(
+            "histogram", name, help_text, lambda: Histogram(buckets), labels
+        )
+
+    def snapshot(self) -> dict:
+        """Plain-dict copy of every metric, e.g. for logging or JSON."""
+        result = {}
+        with self._lock:
+            for name, metric in self._metrics.items():
+                for labels, obj in metric["series"].items():
+                    key = name + _label_text(labels)
+                    if metric["type"] == "counter":
+                        result[key] = obj.value
+                    else:
+                        result[key] = {
+                            "count": obj.count,
+                            "sum": obj.sum,
+                            "p50": obj.quantile(0.5),
+                            "p99": obj.quantile(0.99),
+                        }
+        return result
+
+    def prometheus_text(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, metric in self._metrics.items():
+                full_name = PREFIX + name
+                if metric["help"]:
+                    lines.append(f"# HELP {full_name} {metric['help']}")
+                lines.append(f"# TYPE {full_name} {metric['type']}")
+                for labels, obj in metric["series"].items():
+                    if metric["type"] == "counter":
+                        lines.append(f"{full_name}{_label_text(labels)} {obj.value}")
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(obj.buckets + (float("inf"),), obj.counts):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(
+                            f"{full_name}_bucket{_label_text(labels + (('le', le),))} {cumulative}"
+                        )
+                    lines.append(f"{full_name}_sum{_label_text(labels)} {obj.sum}")
+                    lines.append(f"{full_name}_count{_label_text(labels)} {obj.count}")
+        return "\n".join(lines) + "\n"
+
+
+# Shared registry used by all instrumented classes
+registry = Metrics()
+
+
+class MetricsServer:
+    """
+    Serve a Metrics registry over HTTP on a background daemon thread.
+
+    GET /metrics returns the Prometheus text format, GET /stats a JSON snapshot.
+
+    Args:
+        port: TCP port (0 picks a free one, see `port` after start())
+        host: Interface to bind (default: all)
+        metrics: Registry to serve (default: the shared registry)
+    """
+
+    def __init__(
+        self, port: int = 9100, host: str = "", metrics: Optional[Metrics] = None
+    ):
+        self.metrics = metrics or registry
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def start(self):
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body = metrics.prometheus_text().encode()
+                    content_type = "text/plain; version=0.0.4"
+                elif self.path == "/stats":
+                    body = json.dumps(metrics.snapshot()).encode()
+                    content_type = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
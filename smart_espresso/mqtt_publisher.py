@@ -0,0 +1,122 @@
+"""MQTT publishing backend using Home Assistant MQTT discovery."""
+import json
+from typing import TYPE_CHECKING, Iterable
+
+try:
+    import paho.mqtt.client as mqtt
+except ImportError:
+    mqtt = None
+
+from smart_espresso.publisher import StatePublisher
+
+if TYPE_CHECKING:
+    from homeassistant_api import State
+
+
+class MqttPublisher(StatePublisher):
+    """
+    Publish sensor states to an MQTT broker instead of the REST API.
+
+    The first time an entity is seen, a retained Home Assistant discovery
+    config is published for it, so HA creates the sensor by itself and
+    rediscovers it after a restart. After that every state is a small
+    plain-text payload (e.g. "9.12") on the entity's state topic, sent with
+    QoS 0 over a single persistent connection handled by paho's network
+    thread; submit() never waits for the broker. States are retained by
+    default so HA gets the last value back when it restarts. States submitted
+    while the broker is unreachable are dropped; the next tick sends fresh ones.
+
+    Args:
+        host: MQTT broker host
+        port: MQTT broker port (default: 1883)
+        username: Optional broker username
+        password: Optional broker password
+        node_id: Device id used in topics and unique ids (default: "smart_espresso")
+        discovery_prefix: HA discovery prefix (default: "homeassistant")
+        retain_states: Retain state messages on the broker (default: True)
+        keepalive: MQTT keepalive in seconds (default: 60)
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 1883,
+        username: str = None,
+        password: str = None,
+        node_id: str = "smart_espresso",
+        discovery_prefix: str = "homeassistant",
+        retain_states: bool = True,
+        keepalive: int = 60,
+    ):
+        if mqtt is None:
+            raise ImportError(
+                "paho-mqtt library not found. Install with: " "pip3 install paho-mqtt"
+            )
+
+        self.host = host
+        self.port = port
+        self.node_id = node_id
+        self.discovery_prefix = discovery_prefix
+        self.retain_states = retain_states
+        self.keepalive = keepalive
+        self._discovered: set[str] = set()
+
+        if hasattr(mqtt, "CallbackAPIVersion"):  # paho-mqtt >= 2.0
+            self.client = mqtt.Client(
+                mqtt.CallbackAPIVersion.VERSION2, client_id=node_id
+            )
+        else:
+            self.client = mqtt.Client(client_id=node_id)
+        if username:
+            self.client.username_pw_set(username, password)
+
+    def start(self):
+        """Connect in the background; paho reconnects automatically."""
+        self.client.connect_async(self.host, self.port, self.keepalive)
+        self.client.loop_start()
+
+    def stop(self):
+        self.client.disconnect()
+        self.client.loop_stop()
+
+    def object_id(self, entity_id: str) -> str:
+        return entity_id.split(".", 1)[-1]
+
+    def state_topic(self, entity_id: str) -> str:
+        return f"{self.node_id}/{self.object_id(entity_id)}/state"
+
+    def discovery_topic(self, entity_id: str) -> str:
+        return f"{self.discovery_prefix}/sensor/{self.object_id(entity_id)}/config"
+
+    def discovery_config(self, state: "State") -> dict:
+        """Build the HA discovery payload for the entity of a state."""
+        object_id = self.object_id(state.entity_id)
+        config = {
+            "name": state.attributes.get("friendly_name", object_id),
+            "unique_id": f"{self.node_id}_{object_id}",
+            "object_id": object_id,
+            "state_topic": self.state_topic(state.entity_id),
+            "device": {"identifiers": [self.node_id], "name": "Smart Espresso"},
+        }
+        for key in ("unit_of_measurement", "device_class"):
+            if key in state.attributes:
+                config[key] = state.attributes[key]
+        return config
+
+    def submit(self, states: Iterable["State"]):
+        for state in states:
+            if state.entity_id not in self._discovered:
+                self.client.publish(
+                    self.discovery_topic(state.entity_id),
+                    json.dumps(self.discovery_config(state), separators=(",", ":")),
+                    qos=1,
+                    retain=True,
+                )
+                self._discovered.add(state.entity_id)
+
+            self.client.publish(
+                self.state_topic(state.entity_id),
+                state.state,
+                qos=0,
+                retain=self.retain_states,
+            )
@@ -0,0 +1,167 @@
+import threading
+from abc import ABC, abstractmethod
+from time import monotonic
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from smart_espresso.metrics import registry
+
+if TYPE_CHECKING:
+    from homeassistant_api import Client, State
+
+
+class StatePublisher(ABC):
+    """
+    Abstract interface for backends that deliver sensor states to Home Assistant.
+
+    SmartEspresso hands the states built by each sensor's ha_states() to
+    submit(); how and when they reach Home Assistant is up to the backend.
+    """
+
+    def start(self):
+        """Open connections / start background workers."""
+
+    def stop(self):
+        """Flush what is still queued and release resources."""
+
+    @abstractmethod
+    def submit(self, states: Iterable["State"]):
+        """Hand over the latest states. Must not block on network I/O."""
+        raise NotImplementedError
+
+
+class PublisherStats:
+    """Counters for a HomeAssistantPublisher."""
+
+    def __init__(self):
+        self.submitted = 0
+        self.skipped = 0  # Unchanged (within deadband) and not due for a heartbeat
+        self.coalesced = 0  # Replaced by a newer state before being sent
+        self.sent = 0
+        self.failed = 0
+
+    def snapshot(self) -> dict:
+        return {
+            "submitted": self.submitted,
+            "skipped": self.skipped,
+            "coalesced": self.coalesced,
+            "sent": self.sent,
+            "failed": self.failed,
+        }
+
+    def __repr__(self) -> str:
+        return f"PublisherStats({self.snapshot()})"
+
+
+class HomeAssistantPublisher(StatePublisher):
+    """
+    Change-only, coalescing Home Assistant publisher over the REST API.
+
+    Sits between SmartEspresso and the homeassistant_api Client. submit()
+    never touches the network: a state is only queued if it differs from the
+    last one sent for that entity (by more than `deadband` for numeric
+    states) or if the entity has been silent for `max_silence` seconds. The
+    queue keeps a single pending state per entity, so a slow link only ever
+    delays the latest value instead of building a backlog. A daemon worker
+    thread drains the queue through the client's HTTP session, which is
+    reused for every request (create the Client with cache_session=False for
+    a plain keep-alive requests.Session).
+
+    Args:
+        client: Home Assistant API client
+        deadband: Minimum change of a numeric state worth sending (default: 0.0,
+                  any change of the rounded value)
+        max_silence: Seconds after which an unchanged state is re-sent as a
+                     heartbeat (default: 60.0)
+    """
+
+    def __init__(
+        self, client: "Client", deadband: float = 0.0, max_silence: float = 60.0
+    ):
+        self.client = client
+        self.deadband = deadband
+        self.max_silence = max_silence
+        self.stats = PublisherStats()
+        self._failures = registry.counter(
+            "ha_failures_total", "Failed Home Assistant updates"
+        )
+
+        self._last_sent: dict[str, tuple["State", float]] = {}
+        self._pending: dict[str, "State"] = {}
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the background worker that sends queued states."""
+        self._worker = threading.Thread(target=self._drain_loop, daemon=True)
+        self._worker.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the worker after it has sent whatever is still queued."""
+        self._stop_event.set()
+        self._wakeup.set()
+        if self._worker is not None:
+            self._worker.join(timeout=timeout)
+
+    def _changed(self, state: "State", now: float) -> bool:
+        last = self._last_sent.get(state.entity_id)
+        if last is None:
+            return True
+
+        last_state, sent_at = last
+        if now - sent_at >= self.max_silence:
+            return True
+        if state.attributes != last_state.attributes:
+            return True
+        try:
+            return abs(float(state.state) - float(last_state.state)) > self.deadband
+        except ValueError:
+            return state.state != last_state.state
+
+    def submit(self, states: Iterable["State"]):
+        """Queue the states that are worth sending; never blocks on I/O."""
+        now = monotonic()
+        queued = False
+        with self._lock:
+            for state in states:
+                self.stats.submitted += 1
+                if not self._changed(state, now):
+                    self.stats.skipped += 1
+                    # Back at the last sent value: an older pending change is stale
+                    if self._pending.pop(state.entity_id, None) is not None:
+                        self.stats.coalesced += 1
+                    continue
+                if state.entity_id in self._pending:
+                    self.stats.coalesced += 1
+                self._pending[state.entity_id] = state
+                queued = True
+        if queued:
+            self._wakeup.set()
+
+    def flush(self):
+        """Send all queued states from the calling thread."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        for entity_id, state in pending.items():
+            try:
+                self.client.set_state(state)
+            except Exception as e:
+                # Not recorded as sent, so the next submit() queues it again
+                self.stats.failed += 1
+                if registry.enabled:
+                    self._failures.inc()
+                print(f"Failed to update Home Assistant for {entity_id}: {e}")
+                continue
+            with self._lock:
+                self._last_sent[entity_id] = (state, monotonic())
+                self.stats.sent += 1
+
+    def _drain_loop(self):
+        while not self._stop_event.is_set():
+            self._wakeup.wait()
+            self._wakeup.clear()
+            self.flush()
+        self.flush()
@@ -0,0 +1,267 @@
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+from time import monotonic
+from typing import Callable, Optional
+
+from smart_espresso.analog_sensor.adc_registry import ADCRegistry
+from smart_espresso.analog_sensor.analog_sensor import ADCInterface
+from smart_espresso.analog_sensor.sample_buffer import SharedSampleBuffer
+from smart_espresso.scheduler import FixedRateSchedule
+
+# Per-channel ADC description written by the sampler: max_voltage, lsb, min_code, max_code
+_CHANNEL_FIELDS = 4
+# Sampler counters: runs, missed deadlines, max_jitter, last_duration
+_STATUS_FIELDS = 4
+
+# The sampler inherits the shared memory mapping (and the ADC factories,
+# which may be closures) by forking, whatever the platform default is
+_context = multiprocessing.get_context("fork")
+
+
+class SharedRingADC(ADCInterface):
+    """
+    ADC channel sampled by a SamplerProcess.
+
+    read() doesn't touch the hardware: it returns the newest sample the
+    sampler process wrote into the shared `history` buffer, which sensors
+    built on this ADC use as their own history (no copies, no pickling).
+    Resolution and range are those of the ADC in the sampler process.
+    """
+
+    def __init__(
+        self,
+        history: SharedSampleBuffer,
+        max_voltage: float,
+        lsb: float,
+        min_code: int,
+        max_code: int,
+    ):
+        self.history = history
+        self.max_voltage = max_voltage
+        self.lsb = lsb or None
+        self.min_code = min_code
+        self.max_code = max_code
+        self._cached_voltage = None
+
+    def read(self):
+        latest = self.history.latest()
+        self._cached_voltage = latest[1] if latest else 0.0
+        return min(self._cached_voltage / self.max_voltage, 1.0)
+
+    @property
+    def voltage(self):
+        if self._cached_voltage is None:
+            self.read()
+        return self._cached_voltage
+
+
+class SamplerProcess:
+    """
+    Sample ADC channels in a dedicated process, at a fixed interval.
+
+    In the main process DHT22 polling, Home Assistant requests and PIL
+    rendering all compete with ADC sampling for the GIL. The sampler process
+    has its own interpreter, optionally pinned to a CPU core (`cpu`) and
+    running with SCHED_FIFO real-time priority (`priority`, needs root or
+    CAP_SYS_NICE), so sample timing stays steady whatever the main process
+    is doing.
+
+    The ADCs are created inside the sampler process by `adc_factories` (one
+    callable per channel, e.g. partial(ADS1115ADC, pin=0, gain=2/3)), so no
+    SPI/I2C handle is shared between processes; channels on the same chip
+    are scanned in one batch through an ADCRegistry. Samples go into one
+    SharedSampleBuffer per channel in a multiprocessing.shared_memory
+    segment, read in the main process through `adcs`, which drop into the
+    sensors like any other ADC:
+
+        sampler = SamplerProcess([partial(ADS1115ADC, pin=0, gain=2/3)], interval=0.005)
+        sampler.start()
+        head = PressureAnalogSensor(adc=sampler.adcs[0], name="Head", max_pressure_mpa=2.0)
+
+    Timestamps are on the system-wide monotonic clock, so they compare with
+    the main process's. The sampler process is forked, so start it before
+    other threads (metrics server, publishers). Don't give the factories an
+    I2CBus: the forked copy would no longer arbitrate with the main process.
+
+    Args:
+        adc_factories: One callable per channel, returning its ADC
+        interval: Seconds between samples of all channels (default: 0.005)
+        capacity: Samples kept per channel (default: 4096)
+        cpu: CPU core to pin the sampler process to (default: any)
+        priority: SCHED_FIFO priority 1-99 for the sampler process (default:
+                  normal scheduling)
+    """
+
+    def __init__(
+        self,
+        adc_factories: list[Callable[[], ADCInterface]],
+        interval: float = 0.005,
+        capacity: int = 4096,
+        cpu: Optional[int] = None,
+        priority: Optional[int] = None,
+    ):
+        if not adc_factories:
+            raise ValueError("No ADC channels to sample")
+        if interval <= 0:
+            raise ValueError(f"Invalid interval {interval}. Must be > 0")
+
+        self.adc_factories = adc_factories
+        self.interval = interval
+        self.capacity = capacity
+        self.cpu = cpu
+        self.priority = priority
+        self.adcs: list[SharedRingADC] = []
+
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._buffers: list[SharedSampleBuffer] = []
+        self._channel_info = None
+        self._status = None
+        self._process = None
+        self._ready = _context.Event()
+        self._stop_event = _context.Event()
+
+    def _attach(self, buf):
+        """Map the channel info, status counters and per-channel buffers onto buf."""
+        channels = len(self.adc_factories)
+        view = memoryview(buf)
+        header = 8 * (_CHANNEL_FIELDS * channels + _STATUS_FIELDS)
+        self._channel_info = view[: 8 * _CHANNEL_FIELDS * channels].cast("d")
+        self._status = view[8 * _CHANNEL_FIELDS * channels : header].cast("d")
+        size = SharedSampleBuffer.size(self.capacity)
+        self._buffers = [
+            SharedSampleBuffer(
+                view[header + i * size : header + (i + 1) * size], self.capacity
+            )
+            for i in range(channels)
+        ]
+        view.release()
+
+    def start(self, timeout: float = 10.0):
+        """Start the sampler process and wait until its ADCs are set up."""
+        channels = len(self.adc_factories)
+        size = 8 * (
+            _CHANNEL_FIELDS * channels + _STATUS_FIELDS
+        ) + channels * SharedSampleBuffer.size(self.capacity)
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        self._attach(self._shm.buf)
+
+        self._ready.clear()
+        self._stop_event.clear()
+        self._process = _context.Process(
+            target=self._run, name="smart-espresso-sampler", daemon=True
+        )
+        self._process.start()
+        if not self._ready.wait(timeout):
+            self.stop()
+            raise RuntimeError("Sampler process failed to start")
+
+        info = self._channel_info
+        self.adcs = [
+            SharedRingADC(
+                buffer,
+                max_voltage=info[_CHANNEL_FIELDS * i],
+                lsb=info[_CHANNEL_FIELDS * i + 1],
+                min_code=int(info[_CHANNEL_FIELDS * i + 2]),
+                max_code=int(info[_CHANNEL_FIELDS * i + 3]),
+            )
+            for i, buffer in enumerate(self._buffers)
+        ]
+
+    def _set_scheduling(self):
+        if self.cpu is not None:
+            try:
+                os.sched_setaffinity(0, {self.cpu})
+            except (AttributeError, OSError) as e:
+                print(f"Failed to pin sampler process to CPU {self.cpu}: {e}")
+        if self.priority is not None:
+            try:
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(self.priority))
+            except (AttributeError, OSError) as e:
+                print(
+                    f"Failed to set SCHED_FIFO priority {self.priority} for sampler process: {e}"
+                )
+
+    def _run(self):
+        """Sampler process main loop."""
+        self._set_scheduling()
+        try:
+            adcs = [factory() for factory in self.adc_factories]
+        except Exception as e:
+            print(f"Failed to set up sampler ADCs: {e}")
+            return
+
+        adc_registry = ADCRegistry()
+        for i, adc in enumerate(adcs):
+            if adc.chip_key is not None:
+                adc_registry.register(adc)
+            fields = (adc.max_voltage, adc.lsb or 0.0, adc.min_code, adc.max_code)
+            for j, value in enumerate(fields):
+                self._channel_info[_CHANNEL_FIELDS * i + j] = float(value)
+        self._ready.set()
+
+        status = self._status
+        schedule = FixedRateSchedule(self.interval)
+        while not self._stop_event.is_set():
+            jitter = schedule.lateness()
+            started = monotonic()
+            if adc_registry.chips:
+                adc_registry.scan()
+            for adc, buffer in zip(adcs, self._buffers):
+                try:
+                    adc.read()
+                    buffer.append(adc.conversion_time or monotonic(), adc.voltage)
+                except Exception as e:
+                    print(f"Sampler failed to read {adc}: {e}")
+
+            status[0] += 1
+            status[1] += schedule.advance()
+            status[2] = max(status[2], jitter)
+            status[3] = monotonic() - started
+            schedule.wait(self._stop_event)
+
+    def snapshot(self) -> dict:
+        """Sampler timing counters, as written by the sampler process."""
+        if self._status is None:
+            return {}
+        runs, missed, max_jitter, last_duration = self._status
+        return {
+            "runs": int(runs),
+            "missed": int(missed),
+            "max_jitter": max_jitter,
+            "last_duration": last_duration,
+            "samples": [buffer.total for buffer in self._buffers],
+        }
+
+    def stop(self, timeout: float = 1.0):
+        """
+        Stop the sampler process and free the shared memory.
+
+        Views returned by the sensors' history queries must not be used
+        afterwards (drop them first so the segment can be unmapped).
+        """
+        self._stop_event.set()
+        if self._process is not None:
+            self._process.join(timeout)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join()
+            self._process = None
+        if self._shm is not None:
+            for buffer in self._buffers:
+                buffer.release()
+            self._channel_info.release()
+            self._status.release()
+            self.adcs, self._buffers = [], []
+            self._channel_info = self._status = None
+            try:
+                self._shm.close()
+            except BufferError:
+                # Views handed out by history queries are still alive; the
+                # mapping then goes away with the process
+                pass
+            self._shm.unlink()
+            self._shm = None
+
+    def __repr__(self) -> str:
+        return f"SamplerProcess(channels={len(self.adc_factories)}, interval={self.interval}, {self.snapshot()})"
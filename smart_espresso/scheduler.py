@@ -0,0 +1,201 @@
+import threading
+from time import monotonic_ns
+from typing import Callable, Optional
+
+from smart_espresso.metrics import registry
+
+
+class TaskStats:
+    """Timing counters for a PeriodicTask."""
+
+    def __init__(self):
+        self.runs = 0
+        self.overruns = 0  # Runs that finished after the next one was due
+        self.missed = 0  # Deadlines skipped because of overruns
+        self.failures = 0
+        self.last_duration = 0.0
+        self.max_duration = 0.0
+        self.max_jitter = 0.0  # Worst lateness of a run start, in seconds
+        self.total_jitter = 0.0
+
+    @property
+    def mean_jitter(self) -> float:
+        return self.total_jitter / self.runs if self.runs else 0.0
+
+    def record(self, duration: float, jitter: float, missed: int = 0):
+        """Account one run that took `duration` and started `jitter` seconds late."""
+        self.runs += 1
+        self.last_duration = duration
+        self.max_duration = max(self.max_duration, duration)
+        self.max_jitter = max(self.max_jitter, jitter)
+        self.total_jitter += jitter
+        if missed:
+            self.overruns += 1
+            self.missed += missed
+
+    def snapshot(self) -> dict:
+        return {
+            "runs": self.runs,
+            "overruns": self.overruns,
+            "missed": self.missed,
+            "failures": self.failures,
+            "last_duration": self.last_duration,
+            "max_duration": self.max_duration,
+            "max_jitter": self.max_jitter,
+            "mean_jitter": self.mean_jitter,
+        }
+
+    def __repr__(self) -> str:
+        return f"TaskStats({self.snapshot()})"
+
+
+class MonotonicClock:
+    """
+    The time source of FixedRateSchedule and PeriodicTask.
+
+    Reads monotonic_ns and sleeps on the stop event; tests pass a fake one
+    to step through a schedule without real sleeps.
+    """
+
+    def now_ns(self) -> int:
+        return monotonic_ns()
+
+    def wait(self, event: threading.Event, timeout: float) -> bool:
+        """Sleep for timeout seconds; return True early if event is set."""
+        return event.wait(timeout)
+
+
+class FixedRateSchedule:
+    """
+    Absolute deadlines at a fixed rate on the monotonic_ns clock.
+
+    Deadline k is start + k * interval, kept in integer nanoseconds, so
+    neither the time a run takes nor sleep inaccuracy accumulates into
+    drift. When a run overruns, the deadlines that already passed are
+    skipped (and counted in `missed`) rather than run back to back, and the
+    schedule keeps its phase.
+
+    Args:
+        interval: Seconds between deadlines
+        start_ns: First deadline on the clock (default: now)
+        clock: Time source (default: a MonotonicClock)
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        start_ns: Optional[int] = None,
+        clock: Optional[MonotonicClock] = None,
+    ):
+        if interval <= 0:
+            raise ValueError(f"Invalid interval {interval}. Must be > 0")
+
+        self.clock = clock if clock is not None else MonotonicClock()
+        self.interval_ns = max(1, round(interval * 1e9))
+        self.deadline_ns = self.clock.now_ns() if start_ns is None else start_ns
+        self.missed = 0
+
+    def lateness(self, now_ns: Optional[int] = None) -> float:
+        """Seconds past the current deadline (negative while it's ahead)."""
+        if now_ns is None:
+            now_ns = self.clock.now_ns()
+        return (now_ns - self.deadline_ns) / 1e9
+
+    def remaining(self, now_ns: Optional[int] = None) -> float:
+        """Seconds until the current deadline (0.0 once it has passed)."""
+        return max(0.0, -self.lateness(now_ns))
+
+    def advance(self, now_ns: Optional[int] = None) -> int:
+        """Move on to the next deadline that is still ahead and return how many were skipped."""
+        if now_ns is None:
+            now_ns = self.clock.now_ns()
+        self.deadline_ns += self.interval_ns
+        missed = 0
+        if now_ns > self.deadline_ns:
+            missed = (now_ns - self.deadline_ns - 1) // self.interval_ns + 1
+            self.deadline_ns += missed * self.interval_ns
+            self.missed += missed
+        return missed
+
+    def wait(self, stop_event) -> bool:
+        """Sleep until the current deadline; return True early if stop_event is set."""
+        return self.clock.wait(stop_event, self.remaining())
+
+
+class PeriodicTask:
+    """
+    Run a callable at a fixed interval on its own daemon thread.
+
+    Runs start on the absolute deadlines of a FixedRateSchedule, so the
+    rate doesn't drift. Exceptions raised by the callable are printed and
+    counted so one failing run doesn't kill the task. If a run takes longer
+    than the interval the overrun is counted, the deadlines it overlapped are
+    skipped (counted in stats.missed) and the task resumes on the next one.
+
+    Args:
+        name: Task name used in log messages and stats
+        func: Callable invoked once per interval
+        interval: Seconds between run starts
+        clock: Time source of the schedule (default: a MonotonicClock)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], None],
+        interval: float,
+        clock: Optional[MonotonicClock] = None,
+    ):
+        if interval <= 0:
+            raise ValueError(
+                f"Invalid interval {interval} for task {name}. Must be > 0"
+            )
+
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.clock = clock if clock is not None else MonotonicClock()
+        self.stats = TaskStats()
+        self._overruns = registry.counter(
+            "task_overruns_total", "Late PeriodicTask runs", task=name
+        )
+        self._missed = registry.counter(
+            "task_missed_deadlines_total",
+            "PeriodicTask deadlines skipped after overruns",
+            task=name,
+        )
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Signal the task to stop and wait for the current run to finish."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+    def _run(self):
+        schedule = FixedRateSchedule(self.interval, clock=self.clock)
+        while not self._stop_event.is_set():
+            started = self.clock.now_ns()
+            jitter = schedule.lateness(started)
+            try:
+                self.func()
+            except Exception as e:
+                self.stats.failures += 1
+                print(f"Task {self.name} failed: {e}")
+
+            finished = self.clock.now_ns()
+            missed = schedule.advance(finished)
+            self.stats.record((finished - started) / 1e9, jitter, missed)
+            if missed and registry.enabled:
+                self._overruns.inc()
+                self._missed.inc(missed)
+            schedule.wait(self._stop_event)
+
+    def __repr__(self) -> str:
+        return f"PeriodicTask(name='{self.name}', interval={self.interval}, stats={self.stats})"
@@ -0,0 +1,236 @@
+from array import array
+from typing import Callable, Optional
+
+from smart_espresso.analog_sensor.pressure_analog_sensor import PressureAnalogSensor
+
+
+class ShotSummary:
+    """Summary of one recorded shot. Times in seconds, pressures in bar, volume in liters."""
+
+    def __init__(
+        self,
+        started_at: float,
+        duration: float,
+        preinfusion_time: float,
+        peak_pressure: float,
+        mean_pressure: float,
+        volume: float,
+        samples: int,
+    ):
+        self.started_at = started_at  # Monotonic timestamp of the first sample (Unix time in a shot log)
+        self.duration = duration
+        self.preinfusion_time = (
+            preinfusion_time  # Until pressure first reached brew_bar
+        )
+        self.peak_pressure = peak_pressure
+        self.mean_pressure = mean_pressure
+        self.volume = volume
+        self.samples = samples
+
+    def as_dict(self) -> dict:
+        return {
+            "started_at": self.started_at,
+            "duration": self.duration,
+            "preinfusion_time": self.preinfusion_time,
+            "peak_pressure": self.peak_pressure,
+            "mean_pressure": self.mean_pressure,
+            "volume": self.volume,
+            "samples": self.samples,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"ShotSummary(duration={self.duration:.1f}s, "
+            f"preinfusion={self.preinfusion_time:.1f}s, "
+            f"peak={self.peak_pressure:.2f}bar, mean={self.mean_pressure:.2f}bar, "
+            f"volume={self.volume * 1000:.0f}ml)"
+        )
+
+
+class ShotRecorder:
+    """
+    Shot detection state machine and per-shot recorder.
+
+    A shot starts when the head pressure reaches `start_bar` (or, with
+    start_on_flow, when the flow sensor reports `start_volume` liters of
+    water) and ends once pressure has stayed below `stop_bar` (and no water
+    has flowed) for `stop_delay` seconds. The gap between start_bar and
+    stop_bar is the hysteresis that keeps pump pulsation from splitting one
+    shot into several.
+
+    While a shot runs, every sample's time, pressure and volume (since the
+    start of the shot) go into preallocated array('d') buffers, so the
+    per-tick path only writes into existing slots. When the shot ends a
+    ShotSummary is built and passed to every listener; shots shorter than
+    `min_duration` (e.g. group head flushes) are discarded.
+
+    Args:
+        pressure_sensor: Head pressure sensor
+        flow_sensor: Optional flow sensor exposing a cumulative `liter` reading
+        start_bar: Pressure that starts a shot (default: 2.0)
+        stop_bar: Pressure below which a shot may end (default: 1.0)
+        stop_delay: Seconds below stop_bar before the shot ends (default: 1.0)
+        brew_bar: Pressure that ends preinfusion (default: 7.0)
+        min_duration: Shorter shots are discarded (default: 5.0)
+        start_on_flow: Also start a shot when water flows without pressure
+        start_volume: Liters of flow that start a shot (default: 0.002)
+        max_samples: Samples kept per shot; the rest are dropped (default: 12000,
+                     two minutes at 100 Hz)
+    """
+
+    def __init__(
+        self,
+        pressure_sensor: PressureAnalogSensor,
+        flow_sensor=None,
+        start_bar: float = 2.0,
+        stop_bar: float = 1.0,
+        stop_delay: float = 1.0,
+        brew_bar: float = 7.0,
+        min_duration: float = 5.0,
+        start_on_flow: bool = False,
+        start_volume: float = 0.002,
+        max_samples: int = 12000,
+    ):
+        if stop_bar > start_bar:
+            raise ValueError(
+                f"stop_bar ({stop_bar}) must not exceed start_bar ({start_bar})"
+            )
+
+        self.pressure_sensor = pressure_sensor
+        self.flow_sensor = flow_sensor
+        self.start_bar = start_bar
+        self.stop_bar = stop_bar
+        self.stop_delay = stop_delay
+        self.brew_bar = brew_bar
+        self.min_duration = min_duration
+        self.start_on_flow = start_on_flow
+        self.start_volume = start_volume
+        self.max_samples = max_samples
+
+        self._times = array("d", bytes(8 * max_samples))
+        self._pressures = array("d", bytes(8 * max_samples))
+        self._volumes = array("d", bytes(8 * max_samples))
+
+        self.active = False
+        self.count = 0  # Samples recorded for the current/last shot
+        self.dropped = 0  # Samples that didn't fit in the buffers
+        self.discarded = 0  # Shots shorter than min_duration
+        self.last_shot: Optional[ShotSummary] = None
+
+        self._start_volume = 0.0
+        self._idle_volume = 0.0
+        self._last_flow_time = 0.0
+        self._last_volume = 0.0
+        self._below_since = -1.0  # Timestamp pressure fell below stop_bar, -1 if not
+        self._below_count = 0
+        self._listeners: list[Callable[[ShotSummary, "ShotRecorder"], None]] = []
+
+    def add_listener(self, listener: Callable[[ShotSummary, "ShotRecorder"], None]):
+        """Call listener(summary, recorder) when a shot ends; recorder.series() holds its data."""
+        self._listeners.append(listener)
+
+    def sample(self) -> bool:
+        """Feed the sensors' latest reading into the state machine (call after read())."""
+        volume = self.flow_sensor.liter if self.flow_sensor is not None else 0.0
+        return self.update(
+            self.pressure_sensor.timestamp, self.pressure_sensor.bar, volume
+        )
+
+    def update(self, timestamp: float, pressure: float, volume: float = 0.0) -> bool:
+        """
+        Advance the state machine with one sample.
+
+        Args:
+            timestamp: Monotonic time of the sample
+            pressure: Head pressure in bar
+            volume: Cumulative flow in liters (0.0 without a flow sensor)
+
+        Returns:
+            True while a shot is running
+        """
+        if volume != self._last_volume:
+            self._last_volume = volume
+            self._last_flow_time = timestamp
+
+        if not self.active:
+            flowing = (
+                self.start_on_flow and volume - self._idle_volume >= self.start_volume
+            )
+            if pressure < self.start_bar and not flowing:
+                self._idle_volume = volume
+                return False
+            self.active = True
+            self.count = 0
+            self.dropped = 0
+            self._start_volume = self._idle_volume
+            self._below_since = -1.0
+
+        i = self.count
+        if i < self.max_samples:
+            self._times[i] = timestamp
+            self._pressures[i] = pressure
+            self._volumes[i] = volume - self._start_volume
+            self.count = i + 1
+        else:
+            self.dropped += 1
+
+        flow_stopped = (
+            not self.start_on_flow
+            or timestamp - self._last_flow_time >= self.stop_delay
+        )
+        if pressure >= self.stop_bar or not flow_stopped:
+            self._below_since = -1.0
+        elif self._below_since < 0:
+            self._below_since = timestamp
+            self._below_count = self.count - 1
+        elif timestamp - self._below_since >= self.stop_delay:
+            self._finish()
+        return self.active
+
+    def _finish(self):
+        self.active = False
+        self._idle_volume = self._last_volume
+        # The shot ended when pressure dropped; samples after that are trailing noise
+        end = max(self._below_count, 1)
+        self.count = end
+        started_at = self._times[0]
+        duration = self._times[end - 1] - started_at
+        if duration < self.min_duration:
+            self.discarded += 1
+            return
+
+        times, pressures, volumes = self.series()
+        peak = max(pressures)
+        preinfusion_time = duration
+        for t, pressure in zip(times, pressures):
+            if pressure >= self.brew_bar:
+                preinfusion_time = t - started_at
+                break
+
+        self.last_shot = ShotSummary(
+            started_at=started_at,
+            duration=duration,
+            preinfusion_time=preinfusion_time,
+            peak_pressure=peak,
+            mean_pressure=sum(pressures) / end,
+            volume=volumes[end - 1],
+            samples=end,
+        )
+        for listener in self._listeners:
+            try:
+                listener(self.last_shot, self)
+            except Exception as e:
+                print(f"Shot listener failed: {e}")
+
+    def series(self) -> tuple[memoryview, memoryview, memoryview]:
+        """
+        Return (times, pressures, volumes) views of the current or last shot.
+
+        The views share memory with the recorder and are overwritten by the
+        next shot; copy them to keep the data.
+        """
+        return (
+            memoryview(self._times)[: self.count],
+            memoryview(self._pressures)[: self.count],
+            memoryview(self._volumes)[: self.count],
+        )
@@ -0,0 +1,268 @@
+"""
+Append-only binary shot log.
+
+Two files, both little-endian with fixed-width records:
+
+* ``<path>``: a 32 byte header (magic, version, record size) followed by one
+  16 byte record per sample: float64 timestamp, float32 pressure (bar),
+  float32 volume since the start of the shot (liters).
+* ``<path>.idx``: the same header followed by one 40 byte entry per shot:
+  uint64 first record, uint32 record count, float64 start time (Unix time)
+  and float32 duration, preinfusion time, peak pressure, mean pressure and
+  volume.
+
+Sample timestamps are monotonic seconds, only meaningful relative to each
+other; the start time in the index is wall-clock time, so shots can be
+dated across reboots.
+
+Both files are only ever appended to, so a crash can at most leave a
+partial record at the end, which is ignored when reading. Index entries
+whose samples didn't reach the disk are dropped when the log is reopened
+for writing.
+"""
+import mmap
+import os
+import queue
+import struct
+import threading
+from time import monotonic, time
+
+import numpy as np
+
+from smart_espresso.shot import ShotRecorder, ShotSummary
+
+VERSION = 1
+DATA_MAGIC = b"SESHOTLG"
+INDEX_MAGIC = b"SESHOTIX"
+HEADER = struct.Struct("<8sHH20x")
+
+RECORD_DTYPE = np.dtype([("time", "<f8"), ("pressure", "<f4"), ("volume", "<f4")])
+INDEX_DTYPE = np.dtype(
+    [
+        ("first_record", "<u8"),
+        ("count", "<u4"),
+        ("started_at", "<f8"),
+        ("duration", "<f4"),
+        ("preinfusion_time", "<f4"),
+        ("peak_pressure", "<f4"),
+        ("mean_pressure", "<f4"),
+        ("volume", "<f4"),
+    ]
+)
+
+
+def _prepare_log(path: str, magic: bytes, dtype: np.dtype) -> int:
+    """Create a log file or check an existing one; return its record count."""
+    size = os.path.getsize(path) if os.path.exists(path) else 0
+    if size < HEADER.size:
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(magic, VERSION, dtype.itemsize))
+        return 0
+
+    with open(path, "rb") as f:
+        _check_header(f.read(HEADER.size), path, magic, dtype)
+    records = (size - HEADER.size) // dtype.itemsize
+    # Drop a record left half-written by a crash so appends stay aligned
+    os.truncate(path, HEADER.size + records * dtype.itemsize)
+    return records
+
+
+def _drop_incomplete_entries(index_path: str, shots: int, records: int) -> int:
+    """Truncate index entries pointing past the data file; return the count kept."""
+    if not shots:
+        return 0
+    index = np.fromfile(index_path, dtype=INDEX_DTYPE, count=shots, offset=HEADER.size)
+    complete = index["first_record"] + index["count"] <= records
+    if complete.all():
+        return shots
+    # Everything after the first incomplete entry would overlap new records
+    kept = int(np.argmin(complete))
+    os.truncate(index_path, HEADER.size + kept * INDEX_DTYPE.itemsize)
+    return kept
+
+
+def _check_header(header: bytes, path: str, magic: bytes, dtype: np.dtype):
+    file_magic, version, record_size = HEADER.unpack(header)
+    if file_magic != magic or version != VERSION or record_size != dtype.itemsize:
+        raise ValueError(
+            f"{path} is not a version {VERSION} shot log ({file_magic!r}, v{version})"
+        )
+
+
+class ShotLogWriter:
+    """
+    Append recorded shots to a binary shot log.
+
+    Register write_shot() as a ShotRecorder listener (SmartEspresso does this
+    when given shot_log=...). The listener runs in the sampling path, so it
+    only copies the finished shot and queues it; a daemon writer thread does
+    the file I/O. Each shot is written as one batch through a large
+    userspace buffer; fsync is deferred until `fsync_interval` seconds have
+    passed since the last one (and done on close()), which keeps SD card
+    write amplification low. The data file is synced before the index, so
+    an index entry never points at samples that aren't on disk; if a power
+    loss still leaves such entries (e.g. a reordering SD card), they are
+    dropped when the log is reopened. The shot's start time is stored as
+    wall-clock time.
+
+    A shot is only logged once it has ended: a crash or power loss during a
+    shot loses that shot (as well as shots not yet synced).
+
+    Args:
+        path: Data file path; the index goes to path + ".idx"
+        fsync_interval: Minimum seconds between fsyncs (default: 60.0)
+        buffer_size: Userspace write buffer in bytes (default: 256 KiB)
+    """
+
+    def __init__(
+        self, path: str, fsync_interval: float = 60.0, buffer_size: int = 256 * 1024
+    ):
+        self.path = path
+        self.index_path = f"{path}.idx"
+        self.fsync_interval = fsync_interval
+        self.records = _prepare_log(path, DATA_MAGIC, RECORD_DTYPE)
+        shots = _prepare_log(self.index_path, INDEX_MAGIC, INDEX_DTYPE)
+        self.shots = _drop_incomplete_entries(self.index_path, shots, self.records)
+        self._data = open(path, "ab", buffering=buffer_size)
+        self._index = open(self.index_path, "ab")
+        self._last_sync = monotonic()
+        self._dirty = False
+
+        self._queue: queue.Queue = queue.Queue()
+        self._writer = threading.Thread(
+            target=self._write_loop, name="shot-log", daemon=True
+        )
+        self._writer.start()
+
+    def write_shot(self, summary: ShotSummary, recorder: ShotRecorder):
+        """ShotRecorder listener: queue the shot's samples and index entry."""
+        # Copied, since the recorder reuses its buffers for the next shot
+        times, pressures, volumes = recorder.series()
+        records = np.empty(len(times), dtype=RECORD_DTYPE)
+        records["time"] = times
+        records["pressure"] = pressures
+        records["volume"] = volumes
+
+        entry = np.zeros(1, dtype=INDEX_DTYPE)
+        entry["count"] = len(records)
+        for field in (
+            "started_at",
+            "duration",
+            "preinfusion_time",
+            "peak_pressure",
+            "mean_pressure",
+            "volume",
+        ):
+            entry[field] = getattr(summary, field)
+        # Monotonic time means nothing after a reboot; store Unix time
+        entry["started_at"] = summary.started_at + time() - monotonic()
+        self._queue.put((records, entry))
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            try:
+                self._append(*item)
+                if monotonic() - self._last_sync >= self.fsync_interval:
+                    self.sync()
+            except Exception as e:
+                print(f"Failed to write shot to {self.path}: {e}")
+
+    def _append(self, records: np.ndarray, entry: np.ndarray):
+        entry["first_record"] = self.records
+        self._data.write(records.tobytes())
+        self._index.write(entry.tobytes())
+        self.records += len(records)
+        self.shots += 1
+        self._dirty = True
+
+    def sync(self):
+        """Flush buffers and fsync the data file, then the index (writer thread)."""
+        for f in (self._data, self._index):
+            f.flush()
+            os.fsync(f.fileno())
+        self._last_sync = monotonic()
+        self._dirty = False
+
+    def close(self):
+        """Write the queued shots, sync and close the files."""
+        self._queue.put(None)
+        self._writer.join()
+        if self._dirty:
+            self.sync()
+        self._data.close()
+        self._index.close()
+
+
+class ShotLogReader:
+    """
+    Memory-mapped reader for a shot log.
+
+    `records` and `index` are NumPy structured arrays backed directly by the
+    mmap, so even multi-GB logs are opened without reading or copying them;
+    shot(i) returns a slice view (fields "time", "pressure", "volume").
+    Summaries carry the shot's wall-clock start time in `started_at`.
+    Views stay valid until close(). Shots appended after opening are not
+    visible; open a new reader to see them.
+
+    Args:
+        path: Data file path written by ShotLogWriter
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._maps: list[mmap.mmap] = []
+        self.records = self._map(path, DATA_MAGIC, RECORD_DTYPE)
+        index = self._map(f"{path}.idx", INDEX_MAGIC, INDEX_DTYPE)
+        # Entries written before their samples reached the disk
+        complete = index["first_record"] + index["count"] <= len(self.records)
+        self.index = index if complete.all() else index[: int(np.argmin(complete))]
+
+    def _map(self, path: str, magic: bytes, dtype: np.dtype) -> np.ndarray:
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        _check_header(mapped[: HEADER.size], path, magic, dtype)
+        count = (len(mapped) - HEADER.size) // dtype.itemsize
+        return np.frombuffer(mapped, dtype=dtype, count=count, offset=HEADER.size)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def shot(self, i: int) -> np.ndarray:
+        """Return the records of shot i as a view into the mapped file."""
+        entry = self.index[i]
+        first = int(entry["first_record"])
+        return self.records[first : first + int(entry["count"])]
+
+    def summary(self, i: int) -> ShotSummary:
+        entry = self.index[i]
+        return ShotSummary(
+            started_at=float(entry["started_at"]),
+            duration=float(entry["duration"]),
+            preinfusion_time=float(entry["preinfusion_time"]),
+            peak_pressure=float(entry["peak_pressure"]),
+            mean_pressure=float(entry["mean_pressure"]),
+            volume=float(entry["volume"]),
+            samples=int(entry["count"]),
+        )
+
+    def close(self):
+        """Unmap the files. Views returned earlier must not be used afterwards."""
+        self.records = self.index = None
+        for mapped in self._maps:
+            try:
+                mapped.close()
+            except BufferError:
+                # Views handed out earlier still exist; the mapping goes
+                # away when the last of them is garbage collected.
+                pass
+        self._maps = []
+
+    def __enter__(self) -> "ShotLogReader":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,341 @@
+"""
+Hardware-free stand-ins for the ADCs, the flow meter, the SH1106 display and
+the Home Assistant client, plus synthetic sensor waveforms.
+
+Nothing here imports board/busio/gpiozero, so SmartEspresso can be run,
+profiled and load-tested on any Linux box. Fakes sleep for a configurable
+time per operation to mimic I2C/SPI/HTTP latency.
+"""
+import asyncio
+import math
+import random
+import threading
+from bisect import bisect_right
+from time import monotonic, sleep
+from typing import Callable, Optional, Sequence
+
+from homeassistant_api import State
+from luma.oled.device import sh1106
+
+from smart_espresso.analog_sensor.analog_sensor import ADCInterface
+from smart_espresso.analog_sensor.pressure_analog_sensor import PressureAnalogSensor
+from smart_espresso.analog_sensor.pulse_flow_sensor import PulseCounter
+
+# Typical time a single read takes on real hardware
+ADS1115_SINGLE_SHOT_LATENCY = 0.008  # One conversion at the default 128 SPS
+ADS1115_CONTINUOUS_LATENCY = 0.0002  # Reading the conversion register only
+MCP3008_LATENCY = 0.0001  # 3-byte SPI transfer through gpiozero
+I2C_BYTE_TIME = 9 / 400_000  # 8 data bits + ACK at 400 kHz
+
+Waveform = Callable[[float], float]
+
+
+def pressure_voltage(bar: float, max_pressure_mpa: float) -> float:
+    """Sensor output voltage for a pressure (inverse of PressureAnalogSensor.mpa)."""
+    return (
+        PressureAnalogSensor.SENSOR_MIN_VOLTAGE
+        + bar / 10 / max_pressure_mpa * PressureAnalogSensor.SENSOR_VOLTAGE_RANGE
+    )
+
+
+def shot_profile(
+    max_pressure_mpa: float = 2.0,
+    idle: float = 10.0,
+    preinfusion: float = 4.0,
+    preinfusion_bar: float = 3.0,
+    ramp: float = 2.0,
+    plateau_bar: float = 9.0,
+    plateau: float = 22.0,
+    noise_bar: float = 0.05,
+) -> Waveform:
+    """
+    Repeating espresso shot: idle, preinfusion, ramp, 9-bar plateau, release.
+
+    Returns a waveform mapping seconds since start to head sensor voltage.
+    """
+    period = idle + preinfusion + ramp + plateau + 1.0
+
+    def waveform(t: float) -> float:
+        t = t % period
+        if t < idle:
+            bar = 0.0
+        elif t < idle + preinfusion:
+            bar = preinfusion_bar * min(1.0, (t - idle) / 1.0)
+        elif t < idle + preinfusion + ramp:
+            bar = (
+                preinfusion_bar
+                + (plateau_bar - preinfusion_bar) * (t - idle - preinfusion) / ramp
+            )
+        elif t < idle + preinfusion + ramp + plateau:
+            # Vibratory pump pulsation on top of the plateau
+            bar = plateau_bar + 0.2 * math.sin(2 * math.pi * 50 * t)
+        else:
+            bar = plateau_bar * (period - t)
+        bar += random.gauss(0.0, noise_bar) if noise_bar else 0.0
+        return pressure_voltage(max(0.0, bar), max_pressure_mpa)
+
+    return waveform
+
+
+def boiler_profile(
+    max_pressure_mpa: float = 0.5,
+    low_bar: float = 1.0,
+    high_bar: float = 1.3,
+    period: float = 60.0,
+    noise_bar: float = 0.01,
+) -> Waveform:
+    """Boiler pressure cycling between the pressurestat's cut-in and cut-out points."""
+
+    def waveform(t: float) -> float:
+        phase = (t % period) / period
+        # Heat up for the first third, then slowly drop
+        if phase < 1 / 3:
+            bar = low_bar + (high_bar - low_bar) * phase * 3
+        else:
+            bar = high_bar - (high_bar - low_bar) * (phase - 1 / 3) * 1.5
+        bar += random.gauss(0.0, noise_bar) if noise_bar else 0.0
+        return pressure_voltage(max(0.0, bar), max_pressure_mpa)
+
+    return waveform
+
+
+def replay_profile(
+    times: Sequence[float], voltages: Sequence[float], loop: bool = True
+) -> Waveform:
+    """
+    Replay recorded voltages (e.g. AnalogSensor.history), linearly interpolated.
+
+    Times are shifted to start at 0; with loop=True the recording repeats.
+    """
+    if len(times) < 2:
+        raise ValueError("Need at least two samples to replay")
+    start = times[0]
+    offsets = [t - start for t in times]
+    duration = offsets[-1]
+
+    def waveform(t: float) -> float:
+        t = t % duration if loop else min(t, duration)
+        i = min(bisect_right(offsets, t), len(offsets) - 1)
+        t0, t1 = offsets[i - 1], offsets[i]
+        v0, v1 = voltages[i - 1], voltages[i]
+        return v0 + (v1 - v0) * (t - t0) / (t1 - t0) if t1 > t0 else v1
+
+    return waveform
+
+
+class FakeADC(ADCInterface):
+    """
+    Simulated ADC channel replaying a waveform.
+
+    Args:
+        waveform: Callable mapping seconds since creation to voltage
+        max_voltage: Full-scale voltage used to normalize read() (default: 6.144,
+                     an ADS1115 at gain 2/3)
+        latency: Seconds each read() blocks, e.g. ADS1115_SINGLE_SHOT_LATENCY
+        bits: Quantize readings like an ADC of this resolution (e.g. 10 for an
+              MCP3008, 15 for the positive half of an ADS1115); default: exact
+        chip: Name of the simulated chip; FakeADCs sharing one can be scanned
+              together by an ADCRegistry, costing a single `latency` per scan
+    """
+
+    def __init__(
+        self,
+        waveform: Waveform,
+        max_voltage: float = 6.144,
+        latency: float = 0.0,
+        bits: Optional[int] = None,
+        chip: Optional[str] = None,
+    ):
+        self.waveform = waveform
+        self.max_voltage = max_voltage
+        self.latency = latency
+        if bits:
+            self.max_code = 2**bits - 1
+            self.lsb = max_voltage / self.max_code
+        self.reads = 0
+        self._started = monotonic()
+        self._cached_voltage = None
+        if chip is not None:
+            self.chip_key = ("fake", chip)
+
+    def _sample(self) -> float:
+        self.reads += 1
+        self.conversion_time = monotonic()
+        voltage = self.waveform(self.conversion_time - self._started)
+        if self.lsb:
+            voltage = (
+                min(max(round(voltage / self.lsb), self.min_code), self.max_code)
+                * self.lsb
+            )
+        return voltage
+
+    def read(self):
+        if not (self.batched and self._cached_voltage is not None):
+            if self.latency:
+                sleep(self.latency)
+            self._cached_voltage = self._sample()
+        return min(self._cached_voltage / self.max_voltage, 1.0)
+
+    @classmethod
+    def scan_chip(cls, adcs: list["FakeADC"]):
+        if adcs[0].latency:
+            sleep(adcs[0].latency)
+        for adc in adcs:
+            adc.push_sample(adc._sample(), adc.conversion_time)
+
+    @property
+    def voltage(self):
+        if self._cached_voltage is None:
+            self.read()
+        return self._cached_voltage
+
+
+def pulse_times(
+    flow: Callable[[float], float],
+    pulses_per_liter: float,
+    duration: float,
+    step: float = 0.0001,
+) -> list[float]:
+    """
+    Times (seconds from 0) at which a flow meter emits its pulses.
+
+    Args:
+        flow: Callable mapping seconds to flow in ml/s
+        pulses_per_liter: Calibration of the simulated meter
+        duration: Seconds to simulate
+        step: Integration step in seconds
+    """
+    times = []
+    pulses = 0.0
+    for i in range(int(duration / step)):
+        pulses += flow(i * step) / 1000 * pulses_per_liter * step
+        while pulses >= len(times) + 1:
+            times.append((i + 1) * step)
+    return times
+
+
+class FakePulseSource:
+    """
+    Simulated flow meter feeding a PulseCounter from a background thread.
+
+    Pulses are delivered in real time with their ideal timestamps (like edge
+    timestamps taken by the GPIO driver), optionally each followed by a
+    contact bounce edge that the counter's debounce has to reject.
+
+    Args:
+        counter: Counter to feed
+        flow: Callable mapping seconds since start() to flow in ml/s
+        pulses_per_liter: Calibration of the simulated meter (default: 5880)
+        duration: Seconds of pulses to generate (default: 60)
+        bounce: Seconds after each pulse at which a spurious edge is added
+                (default: none)
+    """
+
+    def __init__(
+        self,
+        counter: PulseCounter,
+        flow: Callable[[float], float],
+        pulses_per_liter: float = 5880,
+        duration: float = 60.0,
+        bounce: Optional[float] = None,
+    ):
+        self.counter = counter
+        self.times = pulse_times(flow, pulses_per_liter, duration)
+        self.bounce = bounce
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self, started: float):
+        for offset in self.times:
+            delay = started + offset - monotonic()
+            if delay > 0 and self._stop_event.wait(delay):
+                return
+            self.counter.pulse(started + offset)
+            if self.bounce is not None:
+                self.counter.pulse(started + offset + self.bounce)
+
+    def start(self):
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(monotonic(),), daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    def join(self, timeout: Optional[float] = None):
+        """Wait until every pulse has been delivered."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+class FakeI2CSerial:
+    """luma serial interface that discards data after the time it would take on I2C."""
+
+    def __init__(self, byte_time: float = I2C_BYTE_TIME):
+        self.byte_time = byte_time
+        self.bytes_sent = 0
+
+    def _send(self, count: int):
+        self.bytes_sent += count
+        if self.byte_time:
+            sleep(count * self.byte_time)
+
+    def command(self, *cmd):
+        self._send(len(cmd) + 1)  # + control byte
+
+    def data(self, data):
+        self._send(len(data) + 1)
+
+    def cleanup(self):
+        pass
+
+
+class FakeDisplay(sh1106):
+    """
+    SH1106 driven through FakeI2CSerial: the real luma driver and page layout,
+    with bus time simulated and bytes counted in `serial.bytes_sent`.
+    """
+
+    def __init__(
+        self, byte_time: float = I2C_BYTE_TIME, width: int = 128, height: int = 64
+    ):
+        self.serial = FakeI2CSerial(byte_time)
+        super().__init__(self.serial, width=width, height=height)
+        self.persist = True  # Nothing to clear at interpreter exit
+
+
+class FakeHAClient:
+    """
+    Home Assistant client stand-in with the sync and async set_state methods.
+
+    Args:
+        latency: Seconds each request takes
+        fail_every: If set, every n-th request raises ConnectionError
+    """
+
+    def __init__(self, latency: float = 0.0, fail_every: Optional[int] = None):
+        self.latency = latency
+        self.fail_every = fail_every
+        self.requests = 0
+        self.states: dict[str, State] = {}
+
+    def _record(self, state: State) -> State:
+        self.requests += 1
+        if self.fail_every and self.requests % self.fail_every == 0:
+            raise ConnectionError("Simulated Home Assistant failure")
+        self.states[state.entity_id] = state
+        return state
+
+    def set_state(self, state: State) -> State:
+        if self.latency:
+            sleep(self.latency)
+        return self._record(state)
+
+    async def async_set_state(self, state: State) -> State:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._record(state)
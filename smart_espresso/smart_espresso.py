@@ -1,12 +1,24 @@
-from time import monotonic, sleep
-from typing import Union
-
-from homeassistant_api import Client
-from luma.core.render import canvas
-from luma.oled.device import sh1106
+import asyncio
+import threading
+from time import monotonic
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional
 
+from smart_espresso.analog_sensor.adc_registry import ADCRegistry
 from smart_espresso.analog_sensor.analog_sensor import AnalogSensor
-from smart_espresso.utils import font
+from smart_espresso.i2c_bus import I2CBus
+from smart_espresso.metrics import registry
+from smart_espresso.publisher import StatePublisher
+from smart_espresso.scheduler import FixedRateSchedule, PeriodicTask, TaskStats
+from smart_espresso.shot import ShotRecorder
+from smart_espresso.shot_log import ShotLogWriter
+from smart_espresso.utils import load_font
+
+if TYPE_CHECKING:
+    # Only needed for annotations; importing them costs startup time
+    from homeassistant_api import Client
+    from luma.oled.device import sh1106
+
+    from smart_espresso.display_renderer import DisplayRenderer
 
 
 class SmartEspresso:
@@ -14,10 +26,16 @@ class SmartEspresso:
         self,
         analog_devices: list[AnalogSensor] = None,
         digital_sensors: list = None,
-        client_ha: Client = None,
-        display: sh1106 = None,
+        client_ha: "Client" = None,
+        display: "sh1106" = None,
         render_interval: float = 0.1,
         ha_update_interval: float = 1.0,
+        sample_interval: Optional[float] = None,
+        publisher: Optional[StatePublisher] = None,
+        shot_recorder: Optional[ShotRecorder] = None,
+        shot_log: Optional[ShotLogWriter] = None,
+        i2c_bus: Optional[I2CBus] = None,
+        adc_registry: Optional[ADCRegistry] = None,
     ):
         """
         Initialize SmartEspresso monitoring system.
@@ -32,54 +50,311 @@ class SmartEspresso:
                 (default: 1.0). Kept separate from render_interval so the
                 display can refresh quickly without flooding HA's REST API
                 with a request per sensor on every render tick.
+            sample_interval: Seconds between sensor reads in run_scheduled()
+                (default: render_interval). run() samples once per render tick.
+            publisher: State publishing backend (HomeAssistantPublisher,
+                MqttPublisher, ...). When given, states are handed to it
+                instead of being sent with client_ha directly.
+            shot_recorder: Detects shots and records their pressure/flow
+                series; fed after every sample.
+            shot_log: Binary log every shot of shot_recorder is appended to.
+            i2c_bus: I2CBus arbiter the display shares with the ADS1115ADCs
+                (pass the same one to them).
+            adc_registry: Scans the registered ADC chips in batches at the
+                start of every sample(), before the sensors are read.
         """
         self.analog_devices: list[AnalogSensor] = analog_devices or []
         self.digital_sensors: list = digital_sensors or []
         self.all_sensors = self.analog_devices + self.digital_sensors
-        self.client_ha: Client = client_ha
-        self.display: sh1106 = display
+        self.client_ha: "Client" = client_ha
+        self.display: "sh1106" = display
+        self.i2c_bus: Optional[I2CBus] = i2c_bus
+        self.adc_registry: Optional[ADCRegistry] = adc_registry
+        self.renderer: Optional["DisplayRenderer"] = None
+        if display:
+            # PIL and luma are only loaded when there is a display
+            from smart_espresso import display_renderer
+
+            self.renderer = display_renderer.DisplayRenderer(
+                display, load_font(), bus=i2c_bus
+            )
         self.render_interval: float = render_interval
         self.ha_update_interval: float = ha_update_interval
+        self.sample_interval: float = sample_interval or render_interval
+        self.publisher: Optional[StatePublisher] = publisher
+        self.shot_recorder: Optional[ShotRecorder] = shot_recorder
+        self.shot_log: Optional[ShotLogWriter] = shot_log
+        if shot_log:
+            if not shot_recorder:
+                raise ValueError("shot_log requires a shot_recorder")
+            shot_recorder.add_listener(shot_log.write_shot)
         self._last_ha_update: float = 0.0
 
+        # Held while sensors are sampled so the render task never formats a
+        # half-updated set of readings in run_scheduled().
+        self._sample_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self.tasks: dict[str, PeriodicTask] = {}
+        # Per-task timing and failures of run_async()
+        self.async_stats: dict[str, TaskStats] = {}
+        # Iteration timing of run(): overruns and skipped ticks
+        self.loop_stats = TaskStats()
+
+        self._stage_seconds = {
+            stage: registry.histogram(
+                "loop_stage_seconds", "Time spent per loop stage", stage=stage
+            )
+            for stage in ("read", "publish", "render")
+        }
+        self._loop_overruns = registry.counter(
+            "loop_overruns_total", "run() iterations longer than render_interval"
+        )
+        self._loop_missed = registry.counter(
+            "loop_missed_deadlines_total", "run() ticks skipped after overruns"
+        )
+        self._ha_failures = registry.counter(
+            "ha_failures_total", "Failed Home Assistant updates"
+        )
+        self._dropped_frames = registry.counter(
+            "display_dropped_frames_total",
+            "Display frames skipped because rendering fell behind",
+        )
+        self._last_render: Optional[float] = None
+
+    def sample(self):
+        """Read all sensors."""
+        started = monotonic()
+        with self._sample_lock:
+            if self.adc_registry:
+                self.adc_registry.scan()
+            for sensor in self.all_sensors:
+                sensor.read()
+            if self.shot_recorder:
+                self.shot_recorder.sample()
+        if registry.enabled:
+            self._stage_seconds["read"].observe(monotonic() - started)
+
+    def publish(self):
+        """Push the current reading of every sensor to Home Assistant."""
+        started = monotonic()
+        if self.publisher:
+            states = []
+            for sensor in self.all_sensors:
+                try:
+                    states.extend(sensor.ha_states())
+                except Exception as e:
+                    print(
+                        f"Failed to build Home Assistant state for {sensor.name}: {e}"
+                    )
+            self.publisher.submit(states)
+        else:
+            for sensor in self.all_sensors:
+                try:
+                    sensor.update_home_assistant(self.client_ha)
+                except Exception as e:
+                    if registry.enabled:
+                        self._ha_failures.inc()
+                    print(f"Failed to update Home Assistant for {sensor.name}: {e}")
+        if registry.enabled:
+            self._stage_seconds["publish"].observe(monotonic() - started)
+
+    def render(self):
+        """Draw one line per sensor on the display."""
+        started = monotonic()
+        if registry.enabled and self._last_render is not None:
+            # A frame is counted as dropped for every render_interval missed
+            missed = int((started - self._last_render) / self.render_interval) - 1
+            if missed > 0:
+                self._dropped_frames.inc(missed)
+        self._last_render = started
+
+        with self._sample_lock:
+            messages = [sensor.message for sensor in self.all_sensors]
+
+        # Only lines whose text changed are redrawn, and only the display
+        # pages they touch are sent over I2C.
+        self.renderer.render(messages)
+        if registry.enabled:
+            self._stage_seconds["render"].observe(monotonic() - started)
+
     def run(self):
         if not self.all_sensors:
-            raise ValueError("No sensors to read (provide analog_devices or digital_sensors)")
+            raise ValueError(
+                "No sensors to read (provide analog_devices or digital_sensors)"
+            )
 
-        while True:
+        # Ticks are absolute deadlines, so the loop holds its rate and phase;
+        # a tick that overruns skips the deadlines it overlapped
+        schedule = FixedRateSchedule(self.render_interval)
+        self._stop_event.clear()
+        while not self._stop_event.is_set():
+            jitter = schedule.lateness()
             loop_start = monotonic()
 
             # Read all sensors
-            for sensor in self.all_sensors:
-                sensor.read()
+            self.sample()
 
             # Update Home Assistant, throttled independently of render_interval
             # so a slow/unreachable HA instance can't stall sensor sampling or
             # the display, and so we don't hammer its REST API every tick.
-            if self.client_ha and (loop_start - self._last_ha_update) >= self.ha_update_interval:
-                for sensor in self.all_sensors:
-                    try:
-                        sensor.update_home_assistant(self.client_ha)
-                    except Exception as e:
-                        print(f"Failed to update Home Assistant for {sensor.name}: {e}")
+            publishing = self.client_ha or self.publisher
+            if (
+                publishing
+                and (loop_start - self._last_ha_update) >= self.ha_update_interval
+            ):
+                self.publish()
                 self._last_ha_update = loop_start
 
             # Update display
             if self.display:
-                # NB this will only send the data to the display after this "with" block is complete.
-                # see https://github.com/rm-hull/luma.core/blob/master/luma/core/render.py
-                with canvas(self.display, dither=True) as draw:
-                    position_height = 15
-                    for sensor in self.all_sensors:
-                        draw.text(
-                            (5, position_height),
-                            sensor.message,
-                            fill="white",
-                            font=font,
-                        )
-                        position_height += 15
-
-            elapsed = monotonic() - loop_start
-            sleep(max(0.0, self.render_interval - elapsed))
+                self.render()
+
+            missed = schedule.advance()
+            self.loop_stats.record(monotonic() - loop_start, jitter, missed)
+            if missed and registry.enabled:
+                self._loop_overruns.inc()
+                self._loop_missed.inc(missed)
+            schedule.wait(self._stop_event)
 
         # NB the display will be turn off after we exit this application.
+
+    def run_scheduled(self):
+        """
+        Run sampling, Home Assistant publishing and display rendering as
+        independent PeriodicTasks, each at its own rate (sample_interval,
+        ha_update_interval and render_interval).
+
+        A slow display flush or HA request then only delays its own task, not
+        the sensor sampling. Per-task overrun/jitter counters are available
+        in `self.tasks[name].stats`. Blocks until stop() is called.
+        """
+        if not self.all_sensors:
+            raise ValueError(
+                "No sensors to read (provide analog_devices or digital_sensors)"
+            )
+
+        self._stop_event.clear()
+        self.tasks = {
+            "sample": PeriodicTask("sample", self.sample, self.sample_interval)
+        }
+        if self.client_ha or self.publisher:
+            self.tasks["publish"] = PeriodicTask(
+                "publish", self.publish, self.ha_update_interval
+            )
+        if self.display:
+            self.tasks["render"] = PeriodicTask(
+                "render", self.render, self.render_interval
+            )
+
+        for task in self.tasks.values():
+            task.start()
+        try:
+            self._stop_event.wait()
+        finally:
+            for task in self.tasks.values():
+                task.stop()
+
+    async def publish_async(self, timeout: float = 2.0) -> list:
+        """
+        Push every sensor's states to Home Assistant concurrently.
+
+        Uses the async side of homeassistant_api, so client_ha must be created
+        with use_async=True. Each request is bounded by `timeout` seconds;
+        failures are printed and returned in place of the resulting State.
+        """
+        states = []
+        for sensor in self.all_sensors:
+            try:
+                states.extend(sensor.ha_states())
+            except Exception as e:
+                print(f"Failed to build Home Assistant state for {sensor.name}: {e}")
+        results = await asyncio.gather(
+            *(
+                asyncio.wait_for(self.client_ha.async_set_state(state), timeout)
+                for state in states
+            ),
+            return_exceptions=True,
+        )
+        for state, result in zip(states, results):
+            if isinstance(result, BaseException):
+                if registry.enabled:
+                    self._ha_failures.inc()
+                print(
+                    f"Failed to update Home Assistant for {state.entity_id}: {result!r}"
+                )
+        return results
+
+    async def _run_every(
+        self, name: str, interval: float, func: Callable[[], Awaitable]
+    ):
+        """Await func() on a fixed-rate schedule; the asyncio counterpart of PeriodicTask."""
+        stats = self.async_stats[name] = TaskStats()
+        overruns = registry.counter(
+            "task_overruns_total", "Late PeriodicTask runs", task=name
+        )
+        missed_deadlines = registry.counter(
+            "task_missed_deadlines_total",
+            "PeriodicTask deadlines skipped after overruns",
+            task=name,
+        )
+        schedule = FixedRateSchedule(interval)
+        while not self._stop_event.is_set():
+            jitter = schedule.lateness()
+            started = monotonic()
+            try:
+                await func()
+            except Exception as e:
+                stats.failures += 1
+                print(f"Task {name} failed: {e}")
+
+            missed = schedule.advance()
+            stats.record(monotonic() - started, jitter, missed)
+            if missed and registry.enabled:
+                overruns.inc()
+                missed_deadlines.inc(missed)
+            await asyncio.sleep(schedule.remaining())
+
+    async def run_async(self, ha_timeout: float = 2.0):
+        """
+        asyncio counterpart of run_scheduled().
+
+        Sampling, Home Assistant publishing and rendering run as separate
+        asyncio tasks. With a publisher, states are handed to it (submit()
+        doesn't block); otherwise all HA states are sent concurrently through
+        the async homeassistant_api client with a per-request timeout, so a
+        slow link never holds up sampling. Rendering runs in a worker thread
+        to keep PIL and I2C work off the event loop. A task that raises is
+        counted in `self.async_stats[name]` and keeps running. Runs until
+        stop() is called.
+
+        Args:
+            ha_timeout: Seconds allowed for each Home Assistant request
+        """
+        if not self.all_sensors:
+            raise ValueError(
+                "No sensors to read (provide analog_devices or digital_sensors)"
+            )
+
+        async def sample():
+            self.sample()
+
+        async def publish():
+            if self.publisher:
+                self.publish()
+            else:
+                await self.publish_async(ha_timeout)
+
+        async def render():
+            await asyncio.to_thread(self.render)
+
+        self._stop_event.clear()
+        jobs = [self._run_every("sample", self.sample_interval, sample)]
+        if self.client_ha or self.publisher:
+            jobs.append(self._run_every("publish", self.ha_update_interval, publish))
+        if self.display:
+            jobs.append(self._run_every("render", self.render_interval, render))
+        await asyncio.gather(*jobs)
+
+    def stop(self):
+        """Stop a running run(), run_scheduled() or run_async()."""
+        self._stop_event.set()
@@ -0,0 +1,52 @@
+import time
+import unittest
+
+from smart_espresso.analog_sensor.adc_registry import ADCRegistry
+from smart_espresso.analog_sensor.pressure_analog_sensor import PressureAnalogSensor
+from smart_espresso.simulation import FakeADC, pressure_voltage
+from smart_espresso.smart_espresso import SmartEspresso
+
+
+def sensor(
+    name: str, bar: float, chip=None, latency: float = 0.0
+) -> PressureAnalogSensor:
+    adc = FakeADC(lambda t: pressure_voltage(bar, 2.0), latency=latency, chip=chip)
+    return PressureAnalogSensor(adc, name, 2.0)
+
+
+class TestADCRegistry(unittest.TestCase):
+    def test_groups_channels_by_chip(self):
+        sensors = [
+            sensor("A", 1.0, "spi0"),
+            sensor("B", 2.0, "spi0"),
+            sensor("C", 3.0, "i2c"),
+            sensor("D", 4.0),
+        ]
+        adcs = ADCRegistry.from_sensors(sensors)
+
+        self.assertEqual(
+            sorted(len(channels) for channels in adcs.chips.values()), [1, 2]
+        )
+        self.assertFalse(sensors[3].adc.batched)
+        with self.assertRaises(ValueError):
+            adcs.register(sensors[3].adc)
+
+    def test_one_scan_per_chip_fans_out_to_sensors(self):
+        sensors = [
+            sensor(name, bar, "spi0", latency=0.01)
+            for name, bar in [("A", 1.0), ("B", 2.0), ("C", 3.0)]
+        ]
+        se = SmartEspresso(
+            analog_devices=sensors, adc_registry=ADCRegistry.from_sensors(sensors)
+        )
+
+        started = time.monotonic()
+        se.sample()
+        # One simulated burst for the whole chip instead of one read per sensor
+        self.assertLess(time.monotonic() - started, 0.025)
+        self.assertEqual([s.adc.reads for s in sensors], [1, 1, 1])
+        self.assertEqual([round(s.bar, 2) for s in sensors], [1.0, 2.0, 3.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,212 @@
+import threading
+import time
+import unittest
+
+from smart_espresso.analog_sensor import ads1115_analog_sensor
+from smart_espresso.analog_sensor.ads1115_analog_sensor import (
+    ADS1115ADC,
+    ADS1115Scanner,
+)
+from smart_espresso.i2c_bus import I2CBus
+
+
+class FakeI2CDevice:
+    device_address = 0x49
+
+
+class FakeADS:
+    """Stands in for adafruit's ADS1115: one raw code per channel."""
+
+    def __init__(self, gain=1):
+        self.gain = gain
+        self.mode = None
+        self.data_rate = None
+        self.i2c_device = FakeI2CDevice()
+        self.codes = {pin: 0 for pin in range(4)}
+        self.reads = []
+        self.ready = threading.Event()
+
+    def convert(self, pin):
+        # Nothing converts until the test says so, like a slow first conversion
+        self.ready.wait()
+        self.reads.append(pin)
+        return self.codes[pin]
+
+
+class FakeAnalogIn:
+    def __init__(self, ads, pin):
+        self.ads = ads
+        self.pin = pin
+
+    @property
+    def value(self):
+        return self.ads.convert(self.pin)
+
+    @property
+    def voltage(self):
+        return self.value * 4.096 / 32767
+
+
+class FakeADSModule:
+    """Replaces the adafruit_ads1x15.ads1115 module: ADS1115() returns the fake."""
+
+    def __init__(self, ads):
+        self.ads = ads
+
+    def ADS1115(self, i2c, address, gain, data_rate):
+        self.ads.gain = gain
+        self.ads.data_rate = data_rate
+        return self.ads
+
+
+class TestADS1115Scanner(unittest.TestCase):
+    def setUp(self):
+        self._analog_in = ads1115_analog_sensor.AnalogIn
+        ads1115_analog_sensor.AnalogIn = FakeAnalogIn
+        self.ads = FakeADS()
+        self.scanner = ADS1115Scanner(self.ads, data_rate=860)
+
+    def tearDown(self):
+        self.ads.ready.set()
+        self.scanner.stop()
+        ads1115_analog_sensor.AnalogIn = self._analog_in
+
+    def test_puts_chip_in_continuous_mode(self):
+        self.assertEqual(self.ads.mode, ads1115_analog_sensor.Mode.CONTINUOUS)
+        self.assertEqual(self.ads.data_rate, 860)
+
+    def test_rotates_mux_over_channels(self):
+        self.ads.codes.update({0: 1000, 2: 3000})
+        self.scanner.add_channel(0)
+        self.scanner.add_channel(2)
+        self.ads.ready.set()
+
+        self.assertEqual(self.scanner.raw_value(0), 1000)
+        self.assertEqual(self.scanner.raw_value(2), 3000)
+        while len(self.ads.reads) < 10:
+            time.sleep(0.001)
+        self.assertEqual(set(self.ads.reads), {0, 2})
+        # The first pass only saw channel 0; from then on the mux alternates
+        self.assertEqual(self.ads.reads[1:9], [0, 2] * 4)
+
+        self.ads.codes[0] = 2000
+        deadline = time.monotonic() + 1.0
+        while self.scanner.raw_value(0) != 2000 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        self.assertEqual(self.scanner.raw_value(0), 2000)
+
+    def test_raw_value_waits_for_first_sample(self):
+        self.ads.codes[1] = 1234
+        self.scanner.add_channel(1)
+        threading.Timer(0.05, self.ads.ready.set).start()
+
+        started = time.monotonic()
+        self.assertEqual(self.scanner.raw_value(1, timeout=1.0), 1234)
+        self.assertGreaterEqual(time.monotonic() - started, 0.04)
+
+    def test_raw_value_times_out(self):
+        self.scanner.add_channel(1)
+        with self.assertRaises(TimeoutError):
+            self.scanner.raw_value(1, timeout=0.05)
+
+    def test_voltage_scales_by_gain(self):
+        self.ads.codes[0] = 32767
+        self.scanner.add_channel(0)
+        self.ads.ready.set()
+        self.assertAlmostEqual(self.scanner.voltage(0), 4.096)
+
+        scanner = ADS1115Scanner(FakeADS(gain=2 / 3))
+        self.assertAlmostEqual(scanner._volts_per_count * 32767, 6.144)
+
+    def test_single_channel_is_paced_to_data_rate(self):
+        scanner = ADS1115Scanner(self.ads, data_rate=100)
+        scanner.add_channel(0)
+        self.ads.ready.set()
+        scanner.raw_value(0)
+        time.sleep(0.1)
+        scanner.stop()
+        # About 10 conversions at 100 SPS; an unpaced loop re-reads thousands of times
+        self.assertLess(len(self.ads.reads), 30)
+
+    def test_sample_pairs_voltage_with_its_time(self):
+        self.ads.codes[0] = 32767
+        self.scanner.add_channel(0)
+        self.ads.ready.set()
+        voltage, converted = self.scanner.sample(0)
+        self.assertAlmostEqual(voltage, 4.096)
+        self.assertLessEqual(converted, time.monotonic())
+
+        self.ads.codes[0] = 0
+        deadline = time.monotonic() + 1.0
+        while voltage != 0.0 and time.monotonic() < deadline:
+            voltage, newer = self.scanner.sample(0)
+        self.assertEqual(voltage, 0.0)
+        self.assertGreater(newer, converted)
+
+    def test_reads_under_bus_transaction(self):
+        bus = I2CBus()
+        scanner = ADS1115Scanner(self.ads, bus=bus)
+        scanner.add_channel(3)
+        self.ads.ready.set()
+        scanner.raw_value(3)
+        scanner.stop()
+        self.assertGreater(bus.stats["ads1115@0x49"].transactions, 0)
+
+    def test_stop_ends_scan_thread(self):
+        self.scanner.add_channel(0)
+        self.ads.ready.set()
+        self.scanner.raw_value(0)
+        self.scanner.stop()
+        self.assertFalse(self.scanner._scan_thread.is_alive())
+        reads = len(self.ads.reads)
+        time.sleep(0.02)
+        self.assertEqual(len(self.ads.reads), reads)
+
+
+class TestADS1115ADC(unittest.TestCase):
+    address = 0x4A
+
+    def setUp(self):
+        self._analog_in = ads1115_analog_sensor.AnalogIn
+        self._ads_module = ads1115_analog_sensor.ADS
+        self._i2c = ADS1115ADC._i2c
+        self.ads = FakeADS()
+        self.ads.ready.set()
+        ads1115_analog_sensor.AnalogIn = FakeAnalogIn
+        ads1115_analog_sensor.ADS = FakeADSModule(self.ads)
+        ADS1115ADC._i2c = object()
+
+    def tearDown(self):
+        scanner = ADS1115ADC._scanners.pop(self.address, None)
+        if scanner is not None:
+            scanner.stop()
+        ADS1115ADC._ads_instances.pop(self.address, None)
+        ADS1115ADC._i2c = self._i2c
+        ads1115_analog_sensor.ADS = self._ads_module
+        ads1115_analog_sensor.AnalogIn = self._analog_in
+
+    def test_continuous_reads_from_scanner(self):
+        self.ads.codes.update({0: 16384, 1: 8192})
+        head = ADS1115ADC(pin=0, i2c_address=self.address, continuous=True)
+        boiler = ADS1115ADC(pin=1, i2c_address=self.address, continuous=True)
+
+        self.assertIs(head.scanner, boiler.scanner)
+        self.assertEqual(self.ads.data_rate, 860)
+        self.assertAlmostEqual(head.read(), 16384 / 32767, places=4)
+        self.assertAlmostEqual(boiler.voltage, 8192 * 4.096 / 32767, places=4)
+        self.assertEqual(boiler.raw_value, 8192)
+        self.assertLessEqual(head.conversion_time, time.monotonic())
+
+    def test_mixed_modes_on_one_chip_rejected(self):
+        ADS1115ADC(pin=0, i2c_address=self.address, continuous=True)
+        with self.assertRaises(ValueError):
+            ADS1115ADC(pin=1, i2c_address=self.address)
+
+    def test_single_shot_then_continuous_rejected(self):
+        ADS1115ADC(pin=0, i2c_address=self.address)
+        with self.assertRaises(ValueError):
+            ADS1115ADC(pin=1, i2c_address=self.address, continuous=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+from smart_espresso.analog_sensor.calibration_curve import CalibrationCurve
+from smart_espresso.analog_sensor.pressure_analog_sensor import PressureAnalogSensor
+from smart_espresso.analog_sensor.sample_buffer import SharedSampleBuffer
+from smart_espresso.simulation import FakeADC, pressure_voltage
+
+
+class CountingCurve(CalibrationCurve):
+    calls = 0
+
+    def __call__(self, voltage: float) -> float:
+        self.calls += 1
+        return super().__call__(voltage)
+
+
+class TestCachedPerSample(unittest.TestCase):
+    def test_each_sample_is_converted_once(self):
+        curve = CountingCurve([(0.5, 0.0), (4.5, 20.0)])
+        sensor = PressureAnalogSensor(
+            FakeADC(lambda t: pressure_voltage(9.0, 2.0)), "Head", 2.0, curve=curve
+        )
+
+        sensor.read()
+        self.assertEqual(sensor.message, "Head: 9.0 Bar")
+        self.assertAlmostEqual(sensor.mpa, 0.9)
+        sensor.ha_states()
+        self.assertEqual(curve.calls, 1)
+
+        sensor.read()
+        self.assertEqual(sensor.message, "Head: 9.0 Bar")
+        self.assertEqual(curve.calls, 2)
+
+    def test_calibration_changes_invalidate(self):
+        sensor = PressureAnalogSensor(
+            FakeADC(lambda t: pressure_voltage(9.0, 2.0)), "Head", 2.0
+        )
+        sensor.read()
+        self.assertAlmostEqual(sensor.bar, 9.0)
+
+        sensor.offset_voltage = 0.2
+        self.assertAlmostEqual(sensor.bar, 8.0)
+        sensor.curve = CalibrationCurve([(0.5, 0.0), (4.5, 10.0)])
+        self.assertEqual(sensor.message, "Head: 4.0 Bar")
+
+
+class TestADCHistory(unittest.TestCase):
+    def test_empty_shared_history_is_used(self):
+        # An empty buffer is falsy; the sensor must still adopt it
+        adc = FakeADC(lambda t: 2.5)
+        adc.history = SharedSampleBuffer(bytearray(SharedSampleBuffer.size(8)), 8)
+        sensor = PressureAnalogSensor(adc, "Head", 2.0)
+        self.assertIs(sensor.history, adc.history)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from smart_espresso.analog_sensor.calibration import CalibrationStore, ZeroCalibrator
+from smart_espresso.analog_sensor.pressure_analog_sensor import PressureAnalogSensor
+from smart_espresso.simulation import FakeADC
+
+
+def sensor_with_history(voltages) -> PressureAnalogSensor:
+    sensor = PressureAnalogSensor(FakeADC(lambda t: 0.0), "Head", 2.0)
+    for i, voltage in enumerate(voltages):
+        sensor.history.append(i * 0.01, voltage)
+    return sensor
+
+
+class TestZeroCalibrator(unittest.TestCase):
+    def test_idle_window_sets_offset_despite_glitches(self):
+        voltages = 0.53 + np.random.default_rng(0).normal(scale=0.002, size=300)
+        voltages[[50, 120, 250]] = [0.1, 4.0, 0.0]  # Single-sample glitches
+        sensor = sensor_with_history(voltages)
+
+        self.assertTrue(ZeroCalibrator(sensor).update(now=3.0))
+        self.assertAlmostEqual(sensor.offset_voltage, 0.03, places=3)
+
+    def test_pressurized_or_unsteady_windows_are_ignored(self):
+        for voltages in (
+            np.full(300, 1.5),  # Boiler under pressure
+            np.linspace(0.5, 1.0, 300),  # Pressure ramping up
+        ):
+            sensor = sensor_with_history(voltages)
+            self.assertFalse(ZeroCalibrator(sensor).update(now=3.0))
+            self.assertEqual(sensor.offset_voltage, 0.0)
+
+    def test_offset_is_persisted(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "calibration.json")
+            sensor = sensor_with_history(np.full(300, 0.48))
+            ZeroCalibrator(sensor, CalibrationStore(path)).update(now=3.0)
+
+            restarted = sensor_with_history([])
+            ZeroCalibrator(restarted, CalibrationStore(path))
+            self.assertAlmostEqual(restarted.offset_voltage, -0.02)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+
+import numpy as np
+
+from smart_espresso.analog_sensor.calibration_curve import CalibrationCurve
+from smart_espresso.analog_sensor.pressure_analog_sensor import PressureAnalogSensor
+from smart_espresso.simulation import FakeADC, pressure_voltage
+
+
+class TestCalibrationCurve(unittest.TestCase):
+    def test_interpolates_clamps_and_extrapolates(self):
+        curve = CalibrationCurve([(4.5, 20.0), (0.5, 0.0), (2.5, 9.0)])
+        self.assertEqual(curve(0.2), 0.0)
+        self.assertAlmostEqual(curve(1.5), 4.5)
+        self.assertAlmostEqual(curve(3.5), 14.5)
+        self.assertAlmostEqual(curve(5.0), 22.75)
+
+        voltages = np.linspace(0.0, 5.0, 101)
+        np.testing.assert_allclose(
+            curve.convert(voltages), [curve(v) for v in voltages]
+        )
+
+    def test_needs_two_distinct_points(self):
+        with self.assertRaises(ValueError):
+            CalibrationCurve([(0.5, 0.0)])
+        with self.assertRaises(ValueError):
+            CalibrationCurve([(0.5, 0.0), (0.5, 1.0)])
+
+
+class TestPressureLookupTable(unittest.TestCase):
+    def test_lookup_table_matches_curve(self):
+        voltage = pressure_voltage(9.0, 2.0)
+        sensor = PressureAnalogSensor(FakeADC(lambda t: voltage, bits=10), "Head", 2.0)
+        sensor.offset_voltage = 0.01
+        sensor.read()
+
+        self.assertEqual(len(sensor.lookup_table), 1024)
+        # The offset is applied in whole codes (2 LSB of 6 mV here)
+        lsb = sensor.adc.lsb
+        self.assertAlmostEqual(
+            sensor.bar, sensor.curve(sensor.adc.voltage - 2 * lsb), places=5
+        )
+        self.assertAlmostEqual(sensor.bar, 8.95, delta=0.05)
+
+        # The table follows offset and curve changes
+        sensor.offset_voltage = 0.0
+        self.assertAlmostEqual(sensor.bar, 9.0, delta=0.05)
+        sensor.curve = CalibrationCurve([(0.5, 0.0), (4.5, 10.0)])
+        self.assertAlmostEqual(sensor.bar, 4.5, delta=0.05)
+
+    def test_table_is_rebuilt_for_curve_changes_only(self):
+        sensor = PressureAnalogSensor(FakeADC(lambda t: 2.5, bits=10), "Head", 2.0)
+        table = sensor.lookup_table
+        sensor.offset_voltage = 0.1
+        # Zero offset updates only shift the code
+        self.assertIs(sensor.lookup_table, table)
+        sensor.read()
+        # Within one 6 mV code (0.03 bar)
+        self.assertAlmostEqual(sensor.bar, sensor.curve(2.5 - 0.1), delta=0.03)
+
+        # Rebuilt by the setter (the calibrator's thread), not by the next read
+        sensor.curve = CalibrationCurve([(0.5, 0.0), (4.5, 10.0)])
+        self.assertIsNot(sensor.lookup_table, table)
+        self.assertAlmostEqual(
+            sensor.lookup_table[512], sensor.curve(512 * sensor.adc.lsb)
+        )
+
+        sensor = PressureAnalogSensor(FakeADC(lambda t: 2.5), "Head", 2.0)
+        self.assertIsNone(sensor.lookup_table)
+
+    def test_bar_block_matches_per_sample_conversion(self):
+        waveform = iter(np.linspace(0.3, 4.8, 200))
+        sensor = PressureAnalogSensor(
+            FakeADC(lambda t: next(waveform), bits=15), "Head", 2.0
+        )
+        bars = []
+        for _ in range(200):
+            sensor.read()
+            bars.append(sensor.bar)
+
+        _, voltages = sensor.history.last(200)
+        np.testing.assert_allclose(sensor.bar_block(voltages), bars)
+
+
+if __name__ == "__main__":
+    unittest.main()
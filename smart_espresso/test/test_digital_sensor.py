@@ -0,0 +1,90 @@
+import time
+import unittest
+
+from smart_espresso.analog_sensor.digital_sensor import (
+    DigitalSensor,
+    DigitalSensorPoller,
+)
+
+
+def wait_until(condition, timeout=5.0):
+    """Poll condition until it holds; False if it doesn't within timeout seconds."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+class ScriptedSensor(DigitalSensor):
+    """Returns the scripted values in turn (None for a failed read)."""
+
+    min_interval = 0.02
+
+    def __init__(self, name, script, poller):
+        super().__init__(name, poller)
+        self.script = list(script)
+        self.read_times = []
+        self.add_to_poller()
+
+    def _read_once(self):
+        self.read_times.append(time.monotonic())
+        return self.script.pop(0) if self.script else (1.0,)
+
+
+class TestDigitalSensorPoller(unittest.TestCase):
+    def setUp(self):
+        self.poller = DigitalSensorPoller(max_backoff=0.08)
+
+    def tearDown(self):
+        self.poller.stop()
+
+    def test_listeners_only_hear_about_changes(self):
+        sensor = ScriptedSensor(
+            "Ambient", [(20.0,), (20.0,), (21.5,), (21.5,)], self.poller
+        )
+        changes = []
+        sensor.add_listener(lambda s, reading: changes.append(reading.values))
+        self.assertTrue(sensor.stale)
+        self.assertIsNone(sensor.age)
+
+        self.assertTrue(wait_until(lambda: sensor.generation >= 6))
+        self.assertEqual(changes, [(20.0,), (21.5,), (1.0,)])
+        self.assertFalse(sensor.stale)
+
+        # Reads never come faster than min_interval
+        gaps = [b - a for a, b in zip(sensor.read_times, sensor.read_times[1:])]
+        self.assertGreaterEqual(min(gaps), 0.019)
+
+    def test_backoff_after_failures(self):
+        failing = ScriptedSensor("Enclosure", [None] * 100, self.poller)
+        healthy = ScriptedSensor("Group head", [], self.poller)
+        self.assertTrue(wait_until(lambda: len(failing.read_times) >= 5))
+        self.poller.stop()
+
+        # 0.02, 0.04, 0.08, 0.08, ... between attempts instead of retrying
+        gaps = [b - a for a, b in zip(failing.read_times, failing.read_times[1:])]
+        self.assertGreaterEqual(gaps[0], 0.019)
+        self.assertGreaterEqual(gaps[1], 0.039)
+        self.assertGreaterEqual(min(gaps[2:]), 0.079)
+        # Uncapped, the fourth gap would be 0.16
+        self.assertLess(gaps[3], 0.15)
+        # Meanwhile the healthy sensor kept its 0.02s rate
+        self.assertGreater(len(healthy.read_times), len(failing.read_times))
+        self.assertIsNone(failing.reading)
+
+        stats = self.poller.snapshot()
+        self.assertEqual(stats["Enclosure"]["errors"], len(failing.read_times))
+        self.assertEqual(stats["Group head"]["errors"], 0)
+
+        healthy.stop()
+        count = len(healthy.read_times)
+        # Restart the poller and let another sensor go round a few times
+        probe = ScriptedSensor("Probe", [], self.poller)
+        self.assertTrue(wait_until(lambda: len(probe.read_times) >= 3))
+        self.assertEqual(len(healthy.read_times), count)
+
+
+if __name__ == "__main__":
+    unittest.main()
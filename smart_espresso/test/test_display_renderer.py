@@ -0,0 +1,51 @@
+import unittest
+
+from luma.core.interface.serial import noop
+from luma.oled.device import sh1106
+from PIL import Image, ImageDraw
+
+from smart_espresso.display_renderer import DisplayRenderer
+from smart_espresso.utils import font
+
+
+class RecordingSH1106(sh1106):
+    def __init__(self):
+        self.pages = []
+        super().__init__(noop())
+        self.pages = []
+
+    def command(self, *cmd):
+        if cmd and 0xB0 <= cmd[0] <= 0xB7:
+            self.pages.append(cmd[0] - 0xB0)
+
+
+class TestDisplayRenderer(unittest.TestCase):
+    def test_flushes_only_changed_pages(self):
+        display = RecordingSH1106()
+        renderer = DisplayRenderer(display, font)
+
+        renderer.render(["Head: 9.0 Bar", "Boiler: 1.2 Bar"])
+        self.assertEqual(display.pages, list(range(8)))
+
+        display.pages = []
+        renderer.render(["Head: 9.0 Bar", "Boiler: 1.2 Bar"])
+        self.assertEqual(display.pages, [])
+
+        renderer.render(["Head: 9.0 Bar", "Boiler: 1.3 Bar"])
+        self.assertTrue(display.pages)
+        self.assertTrue(set(display.pages) <= {3, 4, 5})
+
+    def test_framebuffer_matches_full_redraw(self):
+        renderer = DisplayRenderer(RecordingSH1106(), font)
+        renderer.render(["Head: 10.25 Bar", "Boiler: 1.2 Bar"])
+        renderer.render(["Head: 9.1 Bar", "Boiler: 1.2 Bar"])
+
+        expected = Image.new("1", (128, 64))
+        draw = ImageDraw.Draw(expected)
+        draw.text((5, 15), "Head: 9.1 Bar", fill=1, font=font)
+        draw.text((5, 30), "Boiler: 1.2 Bar", fill=1, font=font)
+        self.assertEqual(renderer.image.tobytes(), expected.tobytes())
+
+
+if __name__ == "__main__":
+    unittest.main()
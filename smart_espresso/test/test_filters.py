@@ -0,0 +1,65 @@
+import unittest
+
+import numpy as np
+
+from smart_espresso.analog_sensor.filters import (
+    EMA,
+    FilterChain,
+    Median,
+    Oversample,
+    SavitzkyGolay,
+)
+from smart_espresso.analog_sensor.pressure_analog_sensor import PressureAnalogSensor
+from smart_espresso.simulation import FakeADC, pressure_voltage
+
+
+class TestFilters(unittest.TestCase):
+    def test_oversample_aligns_with_newest_sample(self):
+        self.assertEqual(list(Oversample(2).apply(np.arange(7.0))), [1.5, 3.5, 5.5])
+
+    def test_median_rejects_spikes(self):
+        values = np.array([1.0, 1.0, 9.0, 1.0, 1.0, 1.0])
+        self.assertEqual(list(Median(3).apply(values)), [1.0, 1.0, 1.0, 1.0])
+
+    def test_ema_matches_recursive_definition(self):
+        values = np.random.default_rng(1).normal(size=500)
+        for alpha in (0.05, 0.5, 1.0):
+            expected, previous = [], values[0]
+            for value in values:
+                previous = alpha * value + (1 - alpha) * previous
+                expected.append(previous)
+            np.testing.assert_allclose(EMA(alpha).apply(values), expected, atol=1e-9)
+
+    def test_savitzky_golay_follows_ramps(self):
+        ramp = np.linspace(0.0, 9.0, 50) ** 2
+        np.testing.assert_allclose(
+            SavitzkyGolay(11, 2).apply(ramp), ramp[10:], atol=1e-9
+        )
+
+    def test_chain_window_and_times(self):
+        chain = FilterChain(Oversample(4), Median(5))
+        self.assertEqual(chain.window, 20)
+        times, values = chain.apply_with_times(np.arange(30.0), np.ones(30))
+        self.assertEqual(list(times), [21.0, 25.0, 29.0])
+        self.assertEqual(len(values), 3)
+
+    def test_sensor_uses_filtered_voltage(self):
+        noise = np.random.default_rng(2).normal(scale=0.05, size=10000)
+        samples = iter(pressure_voltage(9.0, 2.0) + noise)
+        sensor = PressureAnalogSensor(
+            FakeADC(lambda t: next(samples)),
+            "Head",
+            2.0,
+            filters=FilterChain(Oversample(8), Median(5), EMA(0.1)),
+        )
+        for _ in range(sensor.filters.window):
+            sensor.read()
+        self.assertAlmostEqual(sensor.bar, 9.0, delta=0.05)
+
+        times, voltages = sensor.filtered()
+        self.assertEqual(len(times), len(voltages))
+        self.assertEqual(times[-1], sensor.timestamp)
+
+
+if __name__ == "__main__":
+    unittest.main()
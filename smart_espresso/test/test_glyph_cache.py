@@ -0,0 +1,42 @@
+import unittest
+
+from PIL import Image, ImageDraw
+
+from smart_espresso.glyph_cache import GlyphCache
+from smart_espresso.utils import font
+
+
+class TestGlyphCache(unittest.TestCase):
+    def test_matches_image_draw(self):
+        cache = GlyphCache()
+        for text in ("Head: 9.12 Bar", "Boiler: 10.5 Bar", "Env: -1.5°C 45.0%"):
+            cached = Image.new("1", (128, 20))
+            cache.draw_text(cached, (5, 2), text, font)
+            expected = Image.new("1", (128, 20))
+            ImageDraw.Draw(expected).text((5, 2), text, fill=1, font=font)
+            self.assertEqual(cached.tobytes(), expected.tobytes(), text)
+
+    def test_numbers_reuse_digit_bitmaps(self):
+        cache = GlyphCache()
+        image = Image.new("1", (128, 20))
+        cache.draw_text(image, (0, 0), "Head: 9.12 Bar", font)
+        misses = cache.misses
+        cache.draw_text(image, (0, 0), "Head: 2.91 Bar", font)
+        self.assertEqual(cache.misses, misses)
+
+    def test_lru_eviction(self):
+        cache = GlyphCache(max_entries=2)
+        cache.glyph("a", font)
+        cache.glyph("b", font)
+        cache.glyph("a", font)
+        cache.glyph("c", font)  # evicts "b", the least recently used
+        self.assertEqual(len(cache), 2)
+        misses = cache.misses
+        cache.glyph("a", font)
+        self.assertEqual(cache.misses, misses)
+        cache.glyph("b", font)
+        self.assertEqual(cache.misses, misses + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import threading
+import time
+import unittest
+
+from luma.core.interface.serial import noop
+from luma.oled.device import sh1106
+
+from smart_espresso.display_renderer import DisplayRenderer
+from smart_espresso.i2c_bus import I2CBus
+from smart_espresso.utils import font
+
+
+class RAMRecordingSH1106(sh1106):
+    """Keeps a copy of the display RAM written through command()/data()."""
+
+    def __init__(self):
+        self.ram = [[0] * 132 for _ in range(8)]
+        self.writes = 0
+        super().__init__(noop())
+        self.writes = 0
+
+    def command(self, *cmd):
+        if len(cmd) == 3 and 0xB0 <= cmd[0] <= 0xB7:
+            self._page = cmd[0] - 0xB0
+            self._column = (cmd[2] & 0x0F) << 4 | (cmd[1] & 0x0F)
+
+    def data(self, data):
+        self.writes += 1
+        self.ram[self._page][self._column : self._column + len(data)] = data
+        self._column += len(data)
+
+
+class TestI2CBus(unittest.TestCase):
+    def test_adc_goes_first_and_display_is_not_starved(self):
+        bus = I2CBus()
+        order = []
+        release = threading.Event()
+
+        def hold():
+            with bus.transaction("display"):
+                release.wait()
+
+        def use(client, high_priority):
+            with bus.transaction(client, high_priority):
+                order.append(client)
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        time.sleep(0.02)
+        threads = [threading.Thread(target=use, args=("display", False))]
+        threads += [
+            threading.Thread(target=use, args=(f"adc{i}", True)) for i in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.02)
+        release.set()
+        for thread in [holder] + threads:
+            thread.join(timeout=1)
+
+        # The first conversion jumps the queue, then the waiting display
+        # slice gets its turn before the second conversion
+        self.assertEqual([client[:3] for client in order], ["adc", "dis", "adc"])
+        self.assertEqual(bus.stats["display"].transactions, 2)
+        self.assertGreater(bus.stats["adc1"].max_wait, 0.0)
+        self.assertGreater(bus.utilization(), 0.0)
+
+    def test_renderer_writes_changed_slices(self):
+        display = RAMRecordingSH1106()
+        renderer = DisplayRenderer(display, font, bus=I2CBus(), slice_columns=32)
+
+        renderer.render(["Head: 9.0 Bar", "Boiler: 1.2 Bar"])
+        self.assertEqual(display.writes, 8 * 4)
+        display.writes = 0
+        renderer.render(["Head: 9.0 Bar", "Boiler: 1.3 Bar"])
+        self.assertLess(display.writes, 4)
+
+        for page in range(8):
+            self.assertEqual(
+                bytes(display.ram[page][2:130]), renderer._page_bytes(page)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
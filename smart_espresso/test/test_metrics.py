@@ -0,0 +1,53 @@
+import json
+import unittest
+import urllib.request
+
+from smart_espresso.metrics import Metrics, MetricsServer
+
+
+class TestMetrics(unittest.TestCase):
+    def test_counter_series_are_shared_per_labels(self):
+        metrics = Metrics()
+        metrics.counter("reads_total", sensor="a").inc()
+        metrics.counter("reads_total", sensor="a").inc(2)
+        metrics.counter("reads_total", sensor="b").inc()
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot['reads_total{sensor="a"}'], 3)
+        self.assertEqual(snapshot['reads_total{sensor="b"}'], 1)
+        with self.assertRaises(ValueError):
+            metrics.histogram("reads_total", sensor="a")
+
+    def test_histogram_quantiles_and_text(self):
+        metrics = Metrics()
+        histogram = metrics.histogram("read_seconds", buckets=(0.001, 0.01, 0.1))
+        for value in [0.0005] * 90 + [0.05] * 10:
+            histogram.observe(value)
+
+        self.assertEqual(histogram.quantile(0.5), 0.001)
+        self.assertEqual(histogram.quantile(0.99), 0.1)
+        text = metrics.prometheus_text()
+        self.assertIn("# TYPE smart_espresso_read_seconds histogram", text)
+        self.assertIn('smart_espresso_read_seconds_bucket{le="0.01"} 90', text)
+        self.assertIn('smart_espresso_read_seconds_bucket{le="+Inf"} 100', text)
+        self.assertIn("smart_espresso_read_seconds_count 100", text)
+
+    def test_server(self):
+        metrics = Metrics(enabled=True)
+        metrics.counter("ha_failures_total").inc()
+        server = MetricsServer(port=0, host="127.0.0.1", metrics=metrics)
+        server.start()
+        try:
+            base = f"http://127.0.0.1:{server.port}"
+            with urllib.request.urlopen(f"{base}/metrics") as response:
+                self.assertIn(
+                    "smart_espresso_ha_failures_total 1", response.read().decode()
+                )
+            with urllib.request.urlopen(f"{base}/stats") as response:
+                self.assertEqual(json.load(response), {"ha_failures_total": 1})
+        finally:
+            server.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import json
+import socket
+import threading
+import time
+import unittest
+
+from homeassistant_api import State
+
+try:
+    from smart_espresso.mqtt_publisher import MqttPublisher, mqtt
+except ImportError:
+    mqtt = None
+
+
+class BrokerStandIn:
+    """Accepts one MQTT client, acknowledges it and records its PUBLISH packets."""
+
+    def __init__(self):
+        self.server = socket.create_server(("127.0.0.1", 0))
+        self.port = self.server.getsockname()[1]
+        self.published = []  # (topic, payload, qos, retain)
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _read_exact(self, conn, size):
+        data = b""
+        while len(data) < size:
+            chunk = conn.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError
+            data += chunk
+        return data
+
+    def _serve(self):
+        conn, _ = self.server.accept()
+        with conn:
+            try:
+                while True:
+                    header = self._read_exact(conn, 1)[0]
+                    length, multiplier = 0, 1
+                    while True:
+                        byte = self._read_exact(conn, 1)[0]
+                        length += (byte & 0x7F) * multiplier
+                        multiplier *= 128
+                        if not byte & 0x80:
+                            break
+                    body = self._read_exact(conn, length)
+                    packet_type = header >> 4
+                    if packet_type == 1:  # CONNECT
+                        conn.sendall(b"\x20\x02\x00\x00")
+                    elif packet_type == 3:  # PUBLISH
+                        qos, retain = (header >> 1) & 0x03, bool(header & 0x01)
+                        topic_len = int.from_bytes(body[:2], "big")
+                        topic = body[2 : 2 + topic_len].decode()
+                        offset = 2 + topic_len
+                        if qos:
+                            conn.sendall(b"\x40\x02" + body[offset : offset + 2])
+                            offset += 2
+                        self.published.append(
+                            (topic, body[offset:].decode(), qos, retain)
+                        )
+                    elif packet_type == 12:  # PINGREQ
+                        conn.sendall(b"\xd0\x00")
+                    elif packet_type == 14:  # DISCONNECT
+                        return
+            except ConnectionError:
+                return
+
+    def close(self):
+        self.server.close()
+
+
+@unittest.skipIf(mqtt is None, "paho-mqtt not installed")
+class TestMqttPublisher(unittest.TestCase):
+    def setUp(self):
+        self.broker = BrokerStandIn()
+        self.publisher = MqttPublisher("127.0.0.1", port=self.broker.port)
+        self.publisher.start()
+        deadline = time.monotonic() + 5
+        while not self.publisher.client.is_connected() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def tearDown(self):
+        self.publisher.stop()
+        self.broker.close()
+
+    def wait_for(self, count):
+        deadline = time.monotonic() + 5
+        while len(self.broker.published) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return self.broker.published
+
+    def test_discovery_once_then_compact_states(self):
+        for value in ("9.0", "9.1"):
+            self.publisher.submit(
+                [
+                    State(
+                        entity_id="sensor.espresso_machine_head_pressure",
+                        state=value,
+                        attributes={
+                            "unit_of_measurement": "Bar",
+                            "friendly_name": "Head Pressure",
+                        },
+                    )
+                ]
+            )
+        published = self.wait_for(3)
+
+        self.assertEqual(len(published), 3)
+        topic, payload, qos, retain = published[0]
+        self.assertEqual(
+            topic, "homeassistant/sensor/espresso_machine_head_pressure/config"
+        )
+        self.assertTrue(retain)
+        config = json.loads(payload)
+        self.assertEqual(config["name"], "Head Pressure")
+        self.assertEqual(config["unit_of_measurement"], "Bar")
+        self.assertEqual(
+            config["state_topic"], "smart_espresso/espresso_machine_head_pressure/state"
+        )
+        self.assertEqual(
+            published[1:],
+            [
+                (config["state_topic"], "9.0", 0, True),
+                (config["state_topic"], "9.1", 0, True),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import threading
+import unittest
+
+from homeassistant_api import State
+
+from smart_espresso.publisher import HomeAssistantPublisher
+
+
+class RecordingClient:
+    def __init__(self):
+        self.sent = []
+        self.sending = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def set_state(self, state):
+        self.sending.set()
+        self.release.wait(timeout=5)
+        self.sent.append((state.entity_id, state.state))
+        return state
+
+
+def pressure(value):
+    return State(entity_id="sensor.head", state=str(value))
+
+
+class TestHomeAssistantPublisher(unittest.TestCase):
+    def test_skips_unchanged_and_within_deadband(self):
+        client = RecordingClient()
+        publisher = HomeAssistantPublisher(client, deadband=0.05)
+        for value in (9.0, 9.0, 9.03, 9.1, 9.1):
+            publisher.submit([pressure(value)])
+            publisher.flush()
+
+        self.assertEqual(client.sent, [("sensor.head", "9.0"), ("sensor.head", "9.1")])
+        self.assertEqual(publisher.stats.skipped, 3)
+
+    def test_heartbeat_after_max_silence(self):
+        client = RecordingClient()
+        publisher = HomeAssistantPublisher(client, max_silence=0.0)
+        for _ in range(3):
+            publisher.submit([pressure(1.0)])
+            publisher.flush()
+
+        self.assertEqual(len(client.sent), 3)
+
+    def test_worker_coalesces_while_sending(self):
+        client = RecordingClient()
+        client.release.clear()
+        publisher = HomeAssistantPublisher(client)
+        publisher.start()
+
+        publisher.submit([pressure(1.0)])
+        self.assertTrue(client.sending.wait(timeout=5))
+        for value in (2.0, 3.0, 4.0):
+            publisher.submit([pressure(value)])
+        client.release.set()
+        publisher.stop()
+
+        self.assertEqual(client.sent, [("sensor.head", "1.0"), ("sensor.head", "4.0")])
+        self.assertEqual(publisher.stats.coalesced, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import time
+import unittest
+
+from smart_espresso.analog_sensor.pulse_flow_sensor import PulseCounter, PulseFlowSensor
+from smart_espresso.simulation import FakePulseSource, pulse_times
+
+
+class TestPulseCounter(unittest.TestCase):
+    def test_debounce_and_rate_at_max_frequency(self):
+        counter = PulseCounter(debounce=0.0005)
+        times = pulse_times(lambda t: 100.0, 5880, 2.0)  # 588 Hz
+        for t in times:
+            counter.pulse(t)
+            counter.pulse(t + 0.0002)  # Bounce
+
+        self.assertEqual(counter.count, len(times))
+        self.assertEqual(counter.rejected, len(times))
+        self.assertAlmostEqual(counter.rate(window=1.0, now=times[-1]), 588, delta=2)
+
+    def test_rate_falls_when_flow_stops(self):
+        counter = PulseCounter()
+        for i in range(100):
+            counter.pulse(i * 0.01)
+        self.assertAlmostEqual(counter.rate(now=0.995), 100.0)
+        self.assertAlmostEqual(counter.rate(now=1.26), 4.0)
+        self.assertEqual(counter.rate(now=5.0), 0.0)
+
+
+class TestPulseFlowSensor(unittest.TestCase):
+    def test_simulated_source_while_busy(self):
+        sensor = PulseFlowSensor("Brew", pulses_per_liter=5880, rate_window=0.2)
+        source = FakePulseSource(
+            sensor.counter, lambda t: 50.0, duration=0.4, bounce=0.0001
+        )
+        source.start()
+        deadline = time.monotonic() + 0.3
+        while time.monotonic() < deadline:
+            sum(range(1000))  # Keep the main thread busy
+        sensor.read()
+        self.assertAlmostEqual(sensor.flow_ml_per_s, 50.0, delta=5.0)
+
+        source.join(timeout=2)
+        sensor.read()
+        self.assertEqual(sensor.counter.count, len(source.times))
+        self.assertAlmostEqual(sensor.liter, len(source.times) / 5880)
+        self.assertEqual(
+            [state.entity_id for state in sensor.ha_states()],
+            [
+                "sensor.espresso_machine_brew_flow",
+                "sensor.espresso_machine_brew_flow_rate",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
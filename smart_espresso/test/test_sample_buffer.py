@@ -0,0 +1,56 @@
+import unittest
+
+from smart_espresso.analog_sensor.sample_buffer import SampleBuffer, SharedSampleBuffer
+
+
+class TestSampleBuffer(unittest.TestCase):
+    def test_empty(self):
+        buffer = SampleBuffer(4)
+        self.assertEqual(len(buffer), 0)
+        self.assertIsNone(buffer.latest())
+        times, values = buffer.last(10)
+        self.assertEqual(len(times), 0)
+        self.assertEqual(len(values), 0)
+
+    def test_wraps_and_keeps_order(self):
+        buffer = SampleBuffer(4)
+        for i in range(10):
+            buffer.append(float(i), i * 0.5)
+
+        self.assertEqual(len(buffer), 4)
+        self.assertEqual(buffer.total, 10)
+        self.assertEqual(buffer.latest(), (9.0, 4.5))
+
+        times, values = buffer.last(4)
+        self.assertIsInstance(times, memoryview)
+        self.assertEqual(list(times), [6.0, 7.0, 8.0, 9.0])
+        self.assertEqual(list(values), [3.0, 3.5, 4.0, 4.5])
+        self.assertEqual(list(buffer.last(2)[0]), [8.0, 9.0])
+
+    def test_since(self):
+        buffer = SampleBuffer(8)
+        for i in range(12):
+            buffer.append(float(i), float(i))
+
+        times, _ = buffer.since(2.5, now=11.0)
+        self.assertEqual(list(times), [9.0, 10.0, 11.0])
+        times, _ = buffer.since(1.0, now=8.0)
+        self.assertEqual(list(times), [7.0, 8.0])
+
+    def test_shared_buffer_views_external_memory(self):
+        memory = bytearray(SharedSampleBuffer.size(4))
+        writer = SharedSampleBuffer(memory, 4)
+        reader = SharedSampleBuffer(memory, 4)
+        for i in range(6):
+            writer.append(float(i), i * 0.5)
+
+        self.assertEqual(reader.total, 6)
+        self.assertEqual(reader.latest(), (5.0, 2.5))
+        self.assertEqual(list(reader.last(4)[0]), [2.0, 3.0, 4.0, 5.0])
+        self.assertEqual(list(reader.since(1.5, now=5.0)[1]), [2.0, 2.5])
+        reader.release()
+        writer.release()
+
+
+if __name__ == "__main__":
+    unittest.main()
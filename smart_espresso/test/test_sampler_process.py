@@ -0,0 +1,69 @@
+import time
+import unittest
+from functools import partial
+
+from smart_espresso.analog_sensor.pressure_analog_sensor import PressureAnalogSensor
+from smart_espresso.sampler_process import SamplerProcess
+from smart_espresso.simulation import FakeADC
+
+
+def wait_until(condition, timeout=5.0):
+    """Poll condition until it holds; False if it doesn't within timeout seconds."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+class TestSamplerProcess(unittest.TestCase):
+    def test_sensors_read_samples_from_the_sampler_process(self):
+        sampler = SamplerProcess(
+            [
+                partial(FakeADC, lambda t: 2.5, bits=10, chip="mcp"),
+                partial(FakeADC, lambda t: 0.5 + t, bits=10, chip="mcp"),
+            ],
+            interval=0.002,
+            capacity=256,
+        )
+        sampler.start()
+        try:
+            head = PressureAnalogSensor(
+                adc=sampler.adcs[0], name="Head", max_pressure_mpa=2.0
+            )
+            boiler = PressureAnalogSensor(
+                adc=sampler.adcs[1], name="Boiler", max_pressure_mpa=0.5
+            )
+            self.assertTrue(
+                wait_until(
+                    lambda: len(sampler.adcs[0].history) > 20
+                    and len(sampler.adcs[1].history) > 20
+                )
+            )
+            head.read()
+            boiler.read()
+
+            # The sensors use the shared buffers as their history
+            self.assertIs(head.history, sampler.adcs[0].history)
+            self.assertGreater(len(head.history), 20)
+            self.assertEqual(head.timestamp, head.history.latest()[0])
+            self.assertAlmostEqual(head.bar, 10.0, delta=0.1)
+            self.assertAlmostEqual(sampler.adcs[0].lsb, 6.144 / 1023)
+
+            times, values = boiler.history.last(20)
+            self.assertEqual(list(times), sorted(times))
+            self.assertLess(values[0], values[-1])
+            self.assertLess(abs(times[-1] - time.monotonic()), 0.1)
+
+            stats = sampler.snapshot()
+            self.assertGreater(stats["runs"], 20)
+            self.assertEqual(stats["samples"][0], stats["samples"][1])
+            del times, values  # Views into the shared memory
+        finally:
+            sampler.stop()
+        self.assertEqual(sampler.adcs, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
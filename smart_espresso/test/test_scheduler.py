@@ -0,0 +1,83 @@
+import threading
+import time
+import unittest
+
+from smart_espresso.analog_sensor.adc_registry import ADCRegistry
+from smart_espresso.analog_sensor.pressure_analog_sensor import PressureAnalogSensor
+from smart_espresso.scheduler import FixedRateSchedule, MonotonicClock, PeriodicTask
+from smart_espresso.simulation import FakeADC
+
+MS = 1_000_000
+
+
+class FakeClock(MonotonicClock):
+    """A clock that only moves when told to; waiting jumps straight to the deadline."""
+
+    def __init__(self):
+        self.now = 0
+
+    def now_ns(self):
+        return self.now
+
+    def wait(self, event, timeout):
+        self.now += round(timeout * 1e9)
+        return event.is_set()
+
+
+class TestFixedRateSchedule(unittest.TestCase):
+    def test_deadlines_keep_their_phase(self):
+        schedule = FixedRateSchedule(0.01, start_ns=0)
+        self.assertEqual(schedule.advance(now_ns=3 * MS), 0)
+        self.assertEqual(schedule.deadline_ns, 10 * MS)
+        self.assertAlmostEqual(schedule.remaining(now_ns=4 * MS), 0.006)
+
+        # A run finishing exactly on its next deadline isn't late
+        self.assertEqual(schedule.advance(now_ns=20 * MS), 0)
+        # One lasting until 47ms overlaps the 30ms and 40ms deadlines
+        self.assertEqual(schedule.advance(now_ns=47 * MS), 2)
+        self.assertEqual(schedule.deadline_ns, 50 * MS)
+        self.assertEqual(schedule.missed, 2)
+        self.assertAlmostEqual(schedule.lateness(now_ns=51 * MS), 0.001)
+
+    def test_periodic_task_counts_missed_deadlines(self):
+        clock = FakeClock()
+        calls = []
+        done = threading.Event()
+
+        def run():
+            calls.append(clock.now)
+            # Runs take 5ms, except the third which lasts 45ms
+            clock.now += 45 * MS if len(calls) == 3 else 5 * MS
+            if len(calls) == 8:
+                done.set()
+
+        task = PeriodicTask("test", run, 0.02, clock=clock)
+        task.start()
+        self.assertTrue(done.wait(timeout=5))
+        task.stop()
+
+        self.assertEqual(task.stats.overruns, 1)
+        self.assertEqual(task.stats.missed, 2)
+        self.assertEqual(task.stats.max_jitter, 0.0)
+        self.assertAlmostEqual(task.stats.max_duration, 0.045)
+        # The runs due at 60ms and 80ms are skipped; the rest stay on the grid
+        self.assertEqual(
+            calls[:8], [t * MS for t in (0, 20, 40, 100, 120, 140, 160, 180)]
+        )
+
+
+class TestConversionTimestamps(unittest.TestCase):
+    def test_samples_carry_the_conversion_time(self):
+        adc = FakeADC(lambda t: 2.5, latency=0.01, chip="a")
+        sensor = PressureAnalogSensor(adc=adc, name="Head", max_pressure_mpa=2.0)
+        ADCRegistry.from_sensors([sensor]).scan()
+        converted = adc.conversion_time
+
+        time.sleep(0.02)  # The sensor is read later in the tick
+        sensor.read()
+        self.assertEqual(sensor.timestamp, converted)
+        self.assertEqual(sensor.history.latest()[0], converted)
+
+
+if __name__ == "__main__":
+    unittest.main()
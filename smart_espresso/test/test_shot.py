@@ -0,0 +1,65 @@
+import unittest
+
+from smart_espresso.shot import ShotRecorder
+
+
+def shot_profile(duration=25.0, rate=100):
+    """Idle, 4s ramp to 9 bar, plateau, release, idle."""
+    samples = []
+    for i in range(int((duration + 6) * rate)):
+        t = i / rate
+        if t < 1 or t > duration + 1:
+            pressure = 0.2
+        elif t < 5:
+            pressure = 0.2 + (t - 1) / 4 * 8.8
+        else:
+            pressure = 9.0
+        samples.append(
+            (t, pressure, max(0.0, t - 2) * 0.002 if t <= duration + 1 else 0.0)
+        )
+    return samples
+
+
+class TestShotRecorder(unittest.TestCase):
+    def test_records_one_shot(self):
+        recorder = ShotRecorder(pressure_sensor=None)
+        summaries = []
+        recorder.add_listener(
+            lambda summary, rec: summaries.append((summary, rec.series()))
+        )
+
+        last_volume = 0.0
+        for t, pressure, volume in shot_profile():
+            last_volume = max(last_volume, volume)
+            recorder.update(t, pressure, last_volume)
+
+        self.assertEqual(len(summaries), 1)
+        summary, (times, pressures, volumes) = summaries[0]
+        self.assertAlmostEqual(summary.started_at, 1.82, places=2)  # 2 bar reached
+        self.assertAlmostEqual(summary.duration, 24.18, places=2)
+        self.assertAlmostEqual(
+            summary.preinfusion_time, 2.28, places=2
+        )  # 7 bar at t=4.10
+        self.assertAlmostEqual(summary.peak_pressure, 9.0)
+        self.assertGreater(summary.mean_pressure, 8.0)
+        self.assertAlmostEqual(summary.volume, 0.048, places=3)
+        self.assertEqual(len(times), summary.samples)
+        self.assertEqual(max(pressures), 9.0)
+        self.assertFalse(recorder.active)
+
+    def test_hysteresis_and_short_flush(self):
+        recorder = ShotRecorder(pressure_sensor=None, stop_delay=0.5)
+        # Dips to 1.5 bar (between stop_bar and start_bar) don't end the shot
+        for i in range(300):
+            recorder.update(i / 100, 3.0 if i % 20 < 10 else 1.5)
+        self.assertTrue(recorder.active)
+        for i in range(300, 400):
+            recorder.update(i / 100, 0.0)
+        self.assertFalse(recorder.active)
+        # 3 seconds is shorter than min_duration: a flush, not a shot
+        self.assertEqual(recorder.discarded, 1)
+        self.assertIsNone(recorder.last_shot)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import tempfile
+import threading
+import unittest
+from time import monotonic, time
+
+import numpy as np
+
+from smart_espresso.shot import ShotRecorder
+from smart_espresso.shot_log import ShotLogReader, ShotLogWriter
+
+
+def record_shot(recorder, start, seconds=8, rate=50):
+    for i in range(int((seconds + 2) * rate)):
+        t = start + i / rate
+        pressure = 9.0 if i < seconds * rate else 0.0
+        recorder.update(t, pressure, i * 0.0001)
+
+
+class TestShotLog(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "shots.bin")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        recorder = ShotRecorder(pressure_sensor=None)
+        writer = ShotLogWriter(self.path)
+        recorder.add_listener(writer.write_shot)
+        record_shot(recorder, start=100.0)
+        record_shot(recorder, start=200.0, seconds=10)
+        writer.close()
+
+        with ShotLogReader(self.path) as log:
+            self.assertEqual(len(log), 2)
+            shot = log.shot(1)
+            self.assertFalse(shot.flags.owndata)
+            self.assertEqual(len(shot), log.summary(1).samples)
+            self.assertEqual(shot["time"][0], 200.0)
+            self.assertTrue(np.all(shot["pressure"] == 9.0))
+            self.assertAlmostEqual(log.summary(1).duration, 9.98, places=2)
+            del shot
+
+    def test_writes_on_writer_thread(self):
+        recorder = ShotRecorder(pressure_sensor=None)
+        writer = ShotLogWriter(self.path, fsync_interval=0.0)
+        threads = []
+        append = writer._append
+
+        def recording_append(*args):
+            threads.append(threading.current_thread().name)
+            append(*args)
+
+        writer._append = recording_append
+        recorder.add_listener(writer.write_shot)
+        record_shot(recorder, start=0.0)
+        record_shot(recorder, start=50.0)
+        writer.close()
+
+        # The listener only queues; both shots were written by the writer thread
+        self.assertEqual(threads, ["shot-log", "shot-log"])
+        with ShotLogReader(self.path) as log:
+            self.assertEqual(len(log), 2)
+            self.assertEqual(log.shot(0)["time"][0], 0.0)
+            self.assertEqual(log.shot(1)["time"][0], 50.0)
+
+    def test_appends_and_ignores_partial_record(self):
+        recorder = ShotRecorder(pressure_sensor=None)
+        writer = ShotLogWriter(self.path)
+        recorder.add_listener(writer.write_shot)
+        record_shot(recorder, start=0.0)
+        writer.close()
+        with open(self.path, "ab") as f:
+            f.write(b"\x01\x02\x03")  # torn write
+
+        writer = ShotLogWriter(self.path)
+        recorder = ShotRecorder(pressure_sensor=None)
+        recorder.add_listener(writer.write_shot)
+        record_shot(recorder, start=50.0)
+        writer.close()
+
+        with ShotLogReader(self.path) as log:
+            self.assertEqual(len(log), 2)
+            self.assertEqual(log.shot(1)["time"][0], 50.0)
+            self.assertEqual(len(log.records), sum(log.index["count"]))
+
+    def test_reopen_drops_entries_past_data(self):
+        recorder = ShotRecorder(pressure_sensor=None)
+        writer = ShotLogWriter(self.path)
+        recorder.add_listener(writer.write_shot)
+        record_shot(recorder, start=0.0)
+        record_shot(recorder, start=50.0)
+        writer.close()
+        # Power loss: the second shot's index entry made it, its samples didn't
+        os.truncate(self.path, os.path.getsize(self.path) - 16 * 100)
+
+        writer = ShotLogWriter(self.path)
+        self.assertEqual(writer.shots, 1)
+        first_record = writer.records
+        recorder = ShotRecorder(pressure_sensor=None)
+        recorder.add_listener(writer.write_shot)
+        record_shot(recorder, start=100.0)
+        writer.close()
+
+        with ShotLogReader(self.path) as log:
+            self.assertEqual(len(log), 2)
+            self.assertEqual(int(log.index["first_record"][1]), first_record)
+            self.assertEqual(log.shot(1)["time"][0], 100.0)
+
+    def test_started_at_is_wall_clock(self):
+        recorder = ShotRecorder(pressure_sensor=None)
+        writer = ShotLogWriter(self.path)
+        recorder.add_listener(writer.write_shot)
+        record_shot(recorder, start=0.0)
+        writer.close()
+
+        with ShotLogReader(self.path) as log:
+            # The fake shot started at monotonic time 0
+            self.assertAlmostEqual(
+                log.summary(0).started_at, time() - monotonic(), delta=1.0
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import threading
+import time
+import unittest
+
+from smart_espresso.analog_sensor.pressure_analog_sensor import PressureAnalogSensor
+from smart_espresso.simulation import (
+    FakeADC,
+    FakeDisplay,
+    FakeHAClient,
+    boiler_profile,
+    pressure_voltage,
+    replay_profile,
+    shot_profile,
+)
+from smart_espresso.smart_espresso import SmartEspresso
+
+
+def wait_until(condition, timeout=5.0):
+    """Poll condition until it holds; False if it doesn't within timeout seconds."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+class TestSimulation(unittest.TestCase):
+    def test_fake_adc_drives_pressure_sensor(self):
+        sensor = PressureAnalogSensor(
+            FakeADC(lambda t: pressure_voltage(9.0, 2.0)), "Head", 2.0
+        )
+        sensor.read()
+        self.assertAlmostEqual(sensor.bar, 9.0)
+
+    def test_replay_profile_interpolates_and_loops(self):
+        waveform = replay_profile([10.0, 11.0, 12.0], [1.0, 2.0, 4.0])
+        self.assertAlmostEqual(waveform(0.5), 1.5)
+        self.assertAlmostEqual(waveform(1.5), 3.0)
+        self.assertAlmostEqual(waveform(2.5), 1.5)
+
+    def test_full_loop_without_hardware(self):
+        head = PressureAnalogSensor(FakeADC(shot_profile(noise_bar=0)), "Head", 2.0)
+        boiler = PressureAnalogSensor(
+            FakeADC(boiler_profile(noise_bar=0)), "Boiler", 0.5
+        )
+        display, client = FakeDisplay(byte_time=0), FakeHAClient()
+        se = SmartEspresso(
+            analog_devices=[head, boiler],
+            client_ha=client,
+            display=display,
+            sample_interval=0.01,
+            render_interval=0.05,
+            ha_update_interval=0.05,
+        )
+        runner = threading.Thread(target=se.run_scheduled)
+        runner.start()
+        self.assertTrue(
+            wait_until(lambda: len(client.states) == 2 and head.adc.reads > 10)
+        )
+        se.stop()
+        runner.join(timeout=1)
+
+        self.assertEqual(
+            set(client.states),
+            {
+                "sensor.espresso_machine_head_pressure",
+                "sensor.espresso_machine_boiler_pressure",
+            },
+        )
+        self.assertGreater(display.serial.bytes_sent, 0)
+        self.assertGreater(head.adc.reads, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,219 @@
+import asyncio
+import subprocess
+import sys
+import threading
+import time
 import unittest
 
+from aiohttp import web
+from homeassistant_api import Client, State
+
+from smart_espresso.publisher import StatePublisher
 from smart_espresso.smart_espresso import SmartEspresso
 
 
+def wait_until(condition, timeout=5.0):
+    """Poll condition until it holds; False if it doesn't within timeout seconds."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+async def async_wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(0.005)
+    return True
+
+
+class CountingSensor:
+    def __init__(self, name="Counter"):
+        self.name = name
+        self.reads = 0
+
+    def read(self):
+        self.reads += 1
+        return self.reads
+
+    @property
+    def message(self):
+        return f"{self.name}: {self.reads}"
+
+    def ha_states(self):
+        return [State(entity_id=f"sensor.{self.name.lower()}", state=str(self.reads))]
+
+    def update_home_assistant(self, client):
+        pass
+
+
+class BrokenSensor(CountingSensor):
+    def ha_states(self):
+        raise RuntimeError("no state")
+
+
+class ListPublisher(StatePublisher):
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, states):
+        self.submitted.append(list(states))
+
+
 class TestSmartEspresso(unittest.TestCase):
     def test_smart_espresso(self):
         se = SmartEspresso([], None, None)
         self.assertRaises(ValueError, se.run)
 
+    def test_import_leaves_backends_unloaded(self):
+        # Home Assistant, luma and PIL are only imported once they are used
+        code = (
+            "import sys, smart_espresso.smart_espresso, smart_espresso.analog_sensor.pressure_analog_sensor;"
+            "print(sorted(m for m in ('homeassistant_api', 'luma', 'PIL') if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        self.assertEqual(result.stdout.strip(), "[]")
+
+    def test_run_scheduled_without_sensors(self):
+        se = SmartEspresso([], None, None)
+        self.assertRaises(ValueError, se.run_scheduled)
+
+    def test_run_scheduled_samples_at_its_own_rate(self):
+        sensor = CountingSensor()
+        se = SmartEspresso(digital_sensors=[sensor], sample_interval=0.01)
+        runner = threading.Thread(target=se.run_scheduled)
+        runner.start()
+        self.assertTrue(wait_until(lambda: sensor.reads > 5))
+        se.stop()
+        runner.join(timeout=1)
+
+        self.assertFalse(runner.is_alive())
+        self.assertEqual(list(se.tasks), ["sample"])
+        stats = se.tasks["sample"].stats
+        self.assertEqual(sensor.reads, stats.runs)
+        self.assertEqual(stats.failures, 0)
+
+
+class TestSmartEspressoAsync(unittest.IsolatedAsyncioTestCase):
+    """run_async() against a local stub of Home Assistant's REST API."""
+
+    async def asyncSetUp(self):
+        self.received = []
+
+        async def set_state(request):
+            entity_id = request.match_info["entity_id"]
+            if entity_id == "sensor.slow":
+                await asyncio.sleep(1)
+            body = await request.json()
+            self.received.append(entity_id)
+            return web.json_response(body)
+
+        app = web.Application()
+        app.router.add_post("/api/states/{entity_id}", set_state)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = self.runner.addresses[0][1]
+
+        self.client = Client(
+            f"http://127.0.0.1:{port}/api",
+            "token",
+            use_async=True,
+            async_cache_session=False,
+        )
+
+    async def asyncTearDown(self):
+        await self.client.async_cache_session.close()
+        await self.runner.cleanup()
+
+    async def test_publish_async_times_out_per_request(self):
+        se = SmartEspresso(
+            digital_sensors=[CountingSensor("Fast"), CountingSensor("Slow")],
+            client_ha=self.client,
+        )
+        started = time.monotonic()
+        results = await se.publish_async(timeout=0.2)
+
+        self.assertLess(time.monotonic() - started, 0.9)
+        self.assertIsInstance(results[0], State)
+        self.assertEqual(results[0].entity_id, "sensor.fast")
+        self.assertIsInstance(results[1], asyncio.TimeoutError)
+        self.assertEqual(self.received, ["sensor.fast"])
+
+    async def test_run_async_samples_while_publishing(self):
+        fast, slow = CountingSensor("Fast"), CountingSensor("Slow")
+        se = SmartEspresso(
+            digital_sensors=[fast, slow],
+            client_ha=self.client,
+            sample_interval=0.01,
+            ha_update_interval=0.05,
+        )
+        runner = asyncio.create_task(se.run_async(ha_timeout=0.3))
+        # The slow entity holds the publish task for 0.3s; sampling carries on.
+        sampled = await async_wait_until(
+            lambda: fast.reads > 10 and "sensor.fast" in self.received
+        )
+        se.stop()
+        await asyncio.wait_for(runner, timeout=1)
+        self.assertTrue(sampled)
+
+    async def test_run_async_hands_states_to_publisher(self):
+        publisher = ListPublisher()
+        se = SmartEspresso(
+            digital_sensors=[CountingSensor("Fast")],
+            client_ha=self.client,
+            sample_interval=0.01,
+            ha_update_interval=0.05,
+            publisher=publisher,
+        )
+        runner = asyncio.create_task(se.run_async())
+        published = await async_wait_until(lambda: len(publisher.submitted) > 1)
+        se.stop()
+        await asyncio.wait_for(runner, timeout=1)
+
+        # The publisher takes precedence over the REST client
+        self.assertTrue(published)
+        self.assertEqual(publisher.submitted[0][0].entity_id, "sensor.fast")
+        self.assertEqual(self.received, [])
+
+    async def test_run_async_survives_failures(self):
+        fast, broken = CountingSensor("Fast"), BrokenSensor("Broken")
+        se = SmartEspresso(
+            digital_sensors=[fast, broken],
+            client_ha=self.client,
+            sample_interval=0.01,
+            ha_update_interval=0.05,
+        )
+        calls = 0
+
+        def flaky_sample():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise RuntimeError("sensor gone")
+            fast.read()
+
+        se.sample = flaky_sample
+        runner = asyncio.create_task(se.run_async())
+        recovered = await async_wait_until(
+            lambda: fast.reads > 5 and "sensor.fast" in self.received
+        )
+        se.stop()
+        await asyncio.wait_for(runner, timeout=1)
+
+        self.assertTrue(recovered)
+        self.assertEqual(se.async_stats["sample"].failures, 1)
+        # The broken sensor's states are skipped, the others still go out
+        self.assertEqual(se.async_stats["publish"].failures, 0)
+        self.assertIn("sensor.fast", self.received)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,75 @@
+import ctypes
+import unittest
+
+from smart_espresso.analog_sensor.adc_registry import ADCRegistry
+from smart_espresso.analog_sensor.spidev_mcp3008 import (
+    MCP3008SpiDev,
+    MCP3008SpiDevADC,
+    SpiIocTransfer,
+    spi_ioc_message,
+)
+
+
+class FakeSpiDev(MCP3008SpiDev):
+    """Answers every transfer like an MCP3008 with fixed channel codes."""
+
+    def __init__(self, codes):
+        self.codes = codes
+        self.ioctls = 0
+        super().__init__(port=9, device=9)
+
+    def _open(self):
+        return None
+
+    def _transfer(self, message):
+        self.ioctls += 1
+        for transfer in message.transfers:
+            tx = ctypes.string_at(transfer.tx_buf, transfer.len)
+            self.assert_frame(tx, transfer)
+            code = self.codes[(tx[1] >> 4) & 0x07]
+            ctypes.memmove(
+                transfer.rx_buf, bytes([0xFF, 0xFC | code >> 8, code & 0xFF]), 3
+            )
+
+    @staticmethod
+    def assert_frame(tx, transfer):
+        assert tx[0] == 0x01 and tx[1] & 0x80 and tx[2] == 0, tx
+        assert transfer.speed_hz == 1_350_000
+
+
+class TestSpiDevMCP3008(unittest.TestCase):
+    def setUp(self):
+        self.chip = FakeSpiDev([0, 100, 200, 300, 400, 500, 600, 1023])
+        MCP3008SpiDevADC._chips[(9, 9)] = self.chip
+
+    def tearDown(self):
+        del MCP3008SpiDevADC._chips[(9, 9)]
+
+    def test_ioctl_request_number(self):
+        self.assertEqual(spi_ioc_message(1), 0x40206B00)
+        self.assertEqual(ctypes.sizeof(SpiIocTransfer), 32)
+
+    def test_reads_channels_in_one_ioctl(self):
+        self.assertEqual(self.chip.read_channels([7, 1, 3]), [1023, 100, 300])
+        self.assertEqual(self.chip.read_channels([7, 1, 3]), [1023, 100, 300])
+        self.assertEqual(self.chip.ioctls, 2)
+        self.assertEqual(len(self.chip._messages), 1)  # Buffers reused
+
+    def test_adc_and_batched_scan(self):
+        adcs = [MCP3008SpiDevADC(pin, port=9, device=9) for pin in (2, 7)]
+        self.assertAlmostEqual(adcs[0].read(), 200 / 1023)
+        self.assertAlmostEqual(adcs[1].voltage, 3.3)
+
+        registry = ADCRegistry()
+        for adc in adcs:
+            registry.register(adc)
+        self.chip.ioctls = 0
+        self.chip.codes[2] = 512
+        registry.scan()
+        self.assertEqual(self.chip.ioctls, 1)
+        self.assertAlmostEqual(adcs[0].read(), 512 / 1023)
+        self.assertEqual(self.chip.ioctls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
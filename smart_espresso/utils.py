@@ -1,8 +1,8 @@
 import os
-
-from PIL import ImageFont
+from functools import lru_cache
 
 PATH = os.path.dirname(os.path.abspath(__file__))
+FONT_PATH = f"{PATH}/Roboto-Regular.ttf"
 
 STRTOBOOL_DEFAULT_TABLE = {
     "false": False,
@@ -34,4 +34,16 @@ def strtobool(term, table=None):
     return term
 
 
-font = ImageFont.truetype(f"{PATH}/Roboto-Regular.ttf", 12)
+@lru_cache(maxsize=None)
+def load_font(size: int = 12):
+    """Load the display font; PIL and the TTF are only read on first use."""
+    from PIL import ImageFont
+
+    return ImageFont.truetype(FONT_PATH, size)
+
+
+def __getattr__(name: str):
+    # `from smart_espresso.utils import font` still works, loading the font then
+    if name == "font":
+        return load_font()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")